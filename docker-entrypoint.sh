@@ -7,7 +7,8 @@ if [ "$#" -eq 0 ] || [ "$1" = "serve" ]; then
     alembic upgrade head
   fi
 
-  set -- uvicorn main:app --host 0.0.0.0 --port "${PORT:-5003}"
+  set -- uvicorn main:app --host 0.0.0.0 --port "${PORT:-5003}" \
+    --timeout-graceful-shutdown "${SHUTDOWN_DRAIN_SECONDS:-25}"
 fi
 
 exec "$@"
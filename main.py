@@ -2,6 +2,8 @@ import logging
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 from src.middleware.auth import AuthMiddleware
+from src.middleware.perf import PerfMiddleware
+from src.middleware.query_budget import QueryBudgetMiddleware
 from src.routers import health_check
 from src.routers.subscription import subscription_router
 from src.routers.user import user_router
@@ -10,6 +12,7 @@ from src.routers.transaction import transaction_router
 from src.routers.account import account_router
 from src.routers.project import project_router
 from src.routers.import_file import import_router
+from src.util.lifespan import lifespan
 from dotenv import load_dotenv
 import os
 
@@ -20,7 +23,7 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 )
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 
 # Add routers
@@ -55,3 +58,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+# Statement budgets per route, checked with PerfMiddleware's counts
+app.add_middleware(QueryBudgetMiddleware)
+
+# Server-Timing header and per-request cost log, including auth
+app.add_middleware(PerfMiddleware)
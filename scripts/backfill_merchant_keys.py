@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import String, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from src.database.connect import sessionmanager
+from src.model.models import Transaction
+from src.util.merchant import merchant_key
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fill transactions.merchant_key for rows imported before the column existed."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Number of transactions read and updated per batch.",
+    )
+    return parser.parse_args()
+
+
+async def backfill(batch_size: int) -> int:
+    updated = 0
+    last_uuid = None
+    async with sessionmanager.session() as db:
+        while True:
+            stmt = (
+                select(Transaction.uuid, Transaction.title)
+                .where(Transaction.merchant_key.is_(None))
+                .order_by(Transaction.uuid)
+                .limit(batch_size)
+            )
+            if last_uuid is not None:
+                stmt = stmt.where(Transaction.uuid > last_uuid)
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                break
+            last_uuid = rows[-1].uuid
+
+            keyed = [(row.uuid, merchant_key(row.title)) for row in rows]
+            keyed = [(tx_uuid, key) for tx_uuid, key in keyed if key]
+            if keyed:
+                keys = values(
+                    column("uuid", PG_UUID(as_uuid=True)),
+                    column("merchant_key", String),
+                    name="keys",
+                ).data(keyed)
+                result = await db.execute(
+                    update(Transaction)
+                    .where(Transaction.uuid == keys.c.uuid)
+                    .values(merchant_key=keys.c.merchant_key)
+                )
+                updated += result.rowcount
+            await db.commit()
+            print(f"  processed {len(rows)} rows, updated {updated} so far")
+    return updated
+
+
+async def main() -> None:
+    args = parse_args()
+
+    try:
+        updated = await backfill(args.batch_size)
+    finally:
+        await sessionmanager.close()
+
+    print("Backfill completed")
+    print(f"  transactions updated: {updated}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from sqlalchemy import select
+
+from src.database.connect import sessionmanager
+from src.model.models import Organization
+from src.services.recurring_series import rebuild_recurring_series
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Recompute the recurring_series table from stored transactions."
+    )
+    parser.add_argument(
+        "--organization-id",
+        type=UUID,
+        default=None,
+        help="Only rebuild this organization (default: every organization).",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+
+    try:
+        async with sessionmanager.session() as db:
+            if args.organization_id is not None:
+                organization_ids = [args.organization_id]
+            else:
+                organization_ids = (await db.execute(select(Organization.uuid))).scalars().all()
+
+            for organization_id in organization_ids:
+                count = await rebuild_recurring_series(db=db, organization_id=organization_id)
+                await db.commit()
+                print(f"  {organization_id}: {count} series")
+    finally:
+        await sessionmanager.close()
+
+    print("Rebuild completed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""Environment-driven settings for the async SQLAlchemy engine.
+
+Every value has a production-safe default; SQL echo is off unless ``DB_ECHO``
+is set. asyncpg-specific options (statement cache, command timeout, server
+settings) are passed through ``connect_args``.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from src.database.pool import InstrumentedAsyncQueuePool
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    value = environ.get(name)
+    return default if value in (None, "") else value.strip().lower() in TRUE_VALUES
+
+
+def _env_int(environ: Mapping[str, str], name: str, default: int | None) -> int | None:
+    value = environ.get(name)
+    return default if value in (None, "") else int(value)
+
+
+def _env_float(environ: Mapping[str, str], name: str, default: float | None) -> float | None:
+    value = environ.get(name)
+    return default if value in (None, "") else float(value)
+
+
+@dataclass(frozen=True)
+class EngineSettings:
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    # asyncpg prepared statement cache; set 0 behind PgBouncer in transaction mode
+    statement_cache_size: int = 100
+    command_timeout: float | None = None
+    statement_timeout_ms: int | None = None
+    application_name: str = "wealth-wing-data"
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "EngineSettings":
+        defaults = cls()
+        return cls(
+            echo=_env_bool(environ, "DB_ECHO", defaults.echo),
+            pool_size=_env_int(environ, "DB_POOL_SIZE", defaults.pool_size),
+            max_overflow=_env_int(environ, "DB_MAX_OVERFLOW", defaults.max_overflow),
+            pool_timeout=_env_float(environ, "DB_POOL_TIMEOUT", defaults.pool_timeout),
+            pool_pre_ping=_env_bool(environ, "DB_POOL_PRE_PING", defaults.pool_pre_ping),
+            pool_recycle=_env_int(environ, "DB_POOL_RECYCLE", defaults.pool_recycle),
+            statement_cache_size=_env_int(
+                environ, "DB_STATEMENT_CACHE_SIZE", defaults.statement_cache_size
+            ),
+            command_timeout=_env_float(environ, "DB_COMMAND_TIMEOUT", defaults.command_timeout),
+            statement_timeout_ms=_env_int(
+                environ, "DB_STATEMENT_TIMEOUT_MS", defaults.statement_timeout_ms
+            ),
+            application_name=environ.get("DB_APPLICATION_NAME") or defaults.application_name,
+        )
+
+    def connect_args(self) -> dict[str, Any]:
+        server_settings = {"application_name": self.application_name}
+        if self.statement_timeout_ms is not None:
+            server_settings["statement_timeout"] = str(self.statement_timeout_ms)
+        args: dict[str, Any] = {
+            "statement_cache_size": self.statement_cache_size,
+            # SQLAlchemy's own cache of asyncpg prepared statements
+            "prepared_statement_cache_size": self.statement_cache_size,
+            "server_settings": server_settings,
+        }
+        if self.command_timeout is not None:
+            args["command_timeout"] = self.command_timeout
+        return args
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        return {
+            "echo": self.echo,
+            "poolclass": InstrumentedAsyncQueuePool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_recycle": self.pool_recycle,
+            "connect_args": self.connect_args(),
+        }
+
+
+@dataclass(frozen=True)
+class ReplicaSettings:
+    urls: tuple[str, ...] = ()
+    # after a write, the same client reads from the primary for this long
+    read_your_writes_seconds: float = 5.0
+    # a replica that failed to connect is skipped for this long
+    retry_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "ReplicaSettings":
+        defaults = cls()
+        urls = environ.get("DB_REPLICA_URLS") or ""
+        return cls(
+            urls=tuple(url.strip() for url in urls.split(",") if url.strip()),
+            read_your_writes_seconds=_env_float(
+                environ, "DB_READ_YOUR_WRITES_SECONDS", defaults.read_your_writes_seconds
+            ),
+            retry_seconds=_env_float(environ, "DB_REPLICA_RETRY_SECONDS", defaults.retry_seconds),
+        )
@@ -1,6 +1,6 @@
 from collections.abc import AsyncGenerator
 from dotenv import load_dotenv
-from sqlalchemy import NullPool, create_engine
+from sqlalchemy import NullPool, create_engine, event, text
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncSession,
@@ -8,13 +8,18 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 import contextlib
-import boto3
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
 from typing import Annotated, Any, AsyncIterator
-from fastapi import Depends
+from collections import OrderedDict
+from fastapi import Depends, Request
 from logging import getLogger
+from src.database.config import EngineSettings, ReplicaSettings
+from src.middleware.perf import statement_observers
+from src.util.slow_queries import log_slow_query
+import functools
 import os
+import time
 import json
 import urllib
 
@@ -23,24 +28,159 @@ logger = getLogger(__name__)
 
 sql_url = os.getenv("DB_URL")
 
+STICKY_CLIENTS_MAX = 10000
+WROTE_INFO = "wrote"
+CLIENT_KEY_INFO = "client_key"
+
 
 Base = declarative_base()
 
 
+def _async_url(url: str) -> str:
+    if url and url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    return url
+
+
 class DatabaseSessionManager:
-    def __init__(self, url: str, engine_kwargs: dict[str, Any] = {}):
-        if url and url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql+asyncpg://", 1)        
-        self._engine = create_async_engine(url, **engine_kwargs)
+    """Primary engine plus optional read replicas.
+
+    ``read_session`` picks a replica round-robin, skipping replicas whose
+    connections recently failed, and falls back to the primary. A client that
+    just committed a write keeps reading from the primary for
+    ``read_your_writes_seconds`` (tracked per process).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        engine_kwargs: dict[str, Any] = {},
+        replica_settings: ReplicaSettings = ReplicaSettings(),
+    ):
+        self._engine = create_async_engine(_async_url(url), **engine_kwargs)
         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine)
+        self._replica_settings = replica_settings
+        self._replicas = [
+            create_async_engine(_async_url(replica_url), **engine_kwargs)
+            for replica_url in replica_settings.urls
+        ]
+        self._replica_sessionmakers = [
+            async_sessionmaker(autocommit=False, bind=engine) for engine in self._replicas
+        ]
+        self._replica_down_until = [0.0] * len(self._replicas)
+        self._next_replica = 0
+        self._primary_until: "OrderedDict[str, float]" = OrderedDict()
+        for index, engine in enumerate(self._replicas):
+            event.listen(
+                engine.sync_engine, "handle_error", functools.partial(self._on_replica_error, index)
+            )
+
+    def _on_replica_error(self, index: int, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            logger.warning(f"Read replica {index} unavailable: {context.original_exception}")
+            self.mark_replica_down(index)
+
+    def mark_replica_down(self, index: int) -> None:
+        self._replica_down_until[index] = time.monotonic() + self._replica_settings.retry_seconds
+
+    def _pick_replica(self) -> int | None:
+        now = time.monotonic()
+        count = len(self._replicas)
+        for offset in range(count):
+            index = (self._next_replica + offset) % count
+            if self._replica_down_until[index] <= now:
+                self._next_replica = index + 1
+                return index
+        return None
+
+    def mark_write(self, client_key: str | None) -> None:
+        if client_key is None or not self._replicas:
+            return
+        self._primary_until[client_key] = (
+            time.monotonic() + self._replica_settings.read_your_writes_seconds
+        )
+        self._primary_until.move_to_end(client_key)
+        while len(self._primary_until) > STICKY_CLIENTS_MAX:
+            self._primary_until.popitem(last=False)
+
+    def prefers_primary(self, client_key: str | None) -> bool:
+        until = self._primary_until.get(client_key) if client_key is not None else None
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._primary_until[client_key]
+            return False
+        return True
+
+    async def check_replicas(self) -> list[bool]:
+        """Run ``SELECT 1`` on every replica and update its availability."""
+        healthy = []
+        for index, engine in enumerate(self._replicas):
+            try:
+                async with engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            except Exception:
+                self.mark_replica_down(index)
+                healthy.append(False)
+            else:
+                self._replica_down_until[index] = 0.0
+                healthy.append(True)
+        return healthy
+
+    @staticmethod
+    async def _warm_engine(engine, connections: int) -> int:
+        size = engine.pool.size() if hasattr(engine.pool, "size") else connections
+        count = min(connections, size)
+        # held together so the pool ends up with ``count`` distinct connections
+        async with contextlib.AsyncExitStack() as stack:
+            for _ in range(count):
+                connection = await stack.enter_async_context(engine.connect())
+                await connection.execute(text("SELECT 1"))
+        return count
+
+    async def warmup(self, connections: int) -> int:
+        """Open up to ``connections`` pooled connections on the primary and on
+        every available replica, so the first requests skip connection setup.
+
+        Returns the number of connections opened.
+        """
+        if self._engine is None or connections <= 0:
+            return 0
+        opened = await self._warm_engine(self._engine, connections)
+        for index, engine in enumerate(self._replicas):
+            try:
+                opened += await self._warm_engine(engine, connections)
+            except Exception as e:
+                logger.warning(f"Read replica {index} warmup failed: {e}")
+                self.mark_replica_down(index)
+        return opened
+
+    @staticmethod
+    def _pool_status(engine) -> dict[str, Any]:
+        pool = engine.pool
+        if hasattr(pool, "status_dict"):
+            return pool.status_dict()
+        return {"status": pool.status()}
+
+    def pool_status(self) -> dict[str, Any]:
+        if self._engine is None:
+            return {}
+        status = self._pool_status(self._engine)
+        if self._replicas:
+            status["replicas"] = [self._pool_status(engine) for engine in self._replicas]
+        return status
 
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        for engine in self._replicas:
+            await engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._replicas = []
+        self._replica_sessionmakers = []
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -55,11 +195,11 @@ class DatabaseSessionManager:
                 raise
 
     @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
-        if self._sessionmaker is None:
+    async def _session(self, maker: async_sessionmaker | None) -> AsyncIterator[AsyncSession]:
+        if maker is None:
             raise Exception("DatabaseSessionManager is not initialized")
 
-        session = self._sessionmaker()
+        session = maker()
         try:
             yield session
         except Exception:
@@ -68,13 +208,74 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    def session(self):
+        return self._session(self._sessionmaker)
 
-sessionmanager = DatabaseSessionManager(sql_url, {"echo": True})
+    def read_session(self, client_key: str | None = None):
+        maker = self._sessionmaker
+        if self._replicas and not self.prefers_primary(client_key):
+            index = self._pick_replica()
+            if index is not None:
+                maker = self._replica_sessionmakers[index]
+        return self._session(maker)
 
 
-async def get_db():
+@event.listens_for(Session, "after_flush")
+def _flag_flush_write(session: Session, flush_context) -> None:
+    session.info[WROTE_INFO] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[WROTE_INFO] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_client_to_primary(session: Session) -> None:
+    if session.info.pop(WROTE_INFO, False):
+        sessionmanager.mark_write(session.info.get(CLIENT_KEY_INFO))
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_write_flag(session: Session) -> None:
+    session.info.pop(WROTE_INFO, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_daily_rollup(session: Session, flush_context) -> None:
+    # imported here: daily_rollup depends on the models, which depend on this module
+    from src.services.daily_rollup import apply_transaction_changes
+
+    apply_transaction_changes(session, flush_context)
+
+
+# perf's cursor events time every statement on every engine
+statement_observers.append(log_slow_query)
+
+sessionmanager = DatabaseSessionManager(
+    sql_url,
+    EngineSettings.from_env().engine_kwargs(),
+    ReplicaSettings.from_env(),
+)
+
+
+def client_key(request: Request) -> str | None:
+    user = getattr(request.state, "user", None)
+    return user.get("sub") if isinstance(user, dict) else None
+
+
+async def get_db(request: Request):
     async with sessionmanager.session() as session:
+        session.info[CLIENT_KEY_INFO] = client_key(request)
+        yield session
+
+
+async def get_read_db(request: Request):
+    async with sessionmanager.read_session(client_key(request)) as session:
         yield session
 
 
 DBSession = Annotated[AsyncSession, Depends(get_db)]
+# for read-only endpoints; may be served by a replica
+DBReadSession = Annotated[AsyncSession, Depends(get_read_db)]
@@ -1,3 +1,4 @@
+import functools
 import os
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -10,6 +11,23 @@ from jwt import (
 )
 
 
+@functools.lru_cache(maxsize=None)
+def get_jwks_client(url: str) -> PyJWKClient:
+    """One client per JWKS URL; it caches the key set between requests."""
+    return PyJWKClient(url)
+
+
+def preload_jwks() -> int:
+    """Fetch the Cognito signing keys ahead of the first request.
+
+    Blocking; returns the number of keys, 0 when no JWKS URL is configured.
+    """
+    url = os.getenv("COGNITO_JWKS_URL")
+    if not url:
+        return 0
+    return len(get_jwks_client(url).get_signing_keys())
+
+
 class AuthMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
@@ -43,7 +61,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
             token = token[7:]
 
         try:
-            jwks_client = PyJWKClient(self.JWKS_URL)
+            jwks_client = get_jwks_client(self.JWKS_URL)
             signing_key = jwks_client.get_signing_key_from_jwt(token)
             payload = decode(
                 token,
@@ -0,0 +1,236 @@
+"""Per-request cost accounting.
+
+``PerfMiddleware`` opens a ``RequestMetrics`` for every HTTP request and keeps
+it in a context variable. SQLAlchemy cursor events on every engine add the
+statement count, rows returned and database time, and ``TimedRoute`` measures
+how long FastAPI spends turning the endpoint's return value into a response
+(response-model validation and JSON rendering). The totals are sent back as a
+``Server-Timing`` header and logged with the route template, e.g.
+``/transaction/{transaction_id}``, so costs group by endpoint, and feed the
+request histograms of ``/health/metrics``. Statements are also counted by
+shape (bound parameters collapsed) for the N+1 checks in ``query_budget``.
+"""
+
+import functools
+import inspect
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.util.metrics import registry
+
+logger = logging.getLogger(__name__)
+QUERY_STARTED_INFO = "perf_query_started"
+_PARAMETER_RE = re.compile(r"\$\d+(?:::[\w\[\]]+)?|%\(\w+\)s|\?")
+_PARAMETER_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+# label for paths that matched no route, so scanners cannot grow the series
+UNMATCHED_ROUTE = "unmatched"
+
+request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Request latency until the response body was sent.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+request_db_seconds = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per request.",
+    ["route"],
+    registry=registry,
+)
+request_statements = Histogram(
+    "http_request_sql_statements",
+    "SQL statements run per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+    registry=registry,
+)
+
+
+def statement_shape(statement: str) -> str:
+    """``statement`` with bound parameters and parameter lists collapsed to ``?``."""
+    return _PARAMETER_LIST_RE.sub("?", _PARAMETER_RE.sub("?", statement))
+
+
+@dataclass
+class RequestMetrics:
+    started: float = field(default_factory=time.perf_counter)
+    db_seconds: float = 0.0
+    statements: int = 0
+    rows: int = 0
+    serialize_seconds: float = 0.0
+    endpoint_done: float | None = None
+    # executions per statement shape
+    shapes: Counter = field(default_factory=Counter)
+    # an enclosing scope (e.g. a test's query budget) that also counts these statements
+    parent: "RequestMetrics | None" = None
+    # request path, replaced by the route template once a route matched
+    route: str | None = None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: float) -> str:
+        description = f"{self.statements} statements, {self.rows} rows"
+        return (
+            f"total;dur={total * 1000:.1f}, "
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{description}", '
+            f"serialize;dur={self.serialize_seconds * 1000:.1f}"
+        )
+
+    def log_fields(self, total: float) -> dict[str, float | int]:
+        return {
+            "total_ms": round(total * 1000, 1),
+            "db_ms": round(self.db_seconds * 1000, 1),
+            "statements": self.statements,
+            "rows": self.rows,
+            "serialize_ms": round(self.serialize_seconds * 1000, 1),
+        }
+
+
+current_metrics: ContextVar[RequestMetrics | None] = ContextVar("current_metrics", default=None)
+
+
+# called as observer(conn, statement, parameters, executemany, seconds) after
+# every statement, e.g. the slow-query log; registered in src/database/connect.py
+statement_observers: list[Callable[[Any, str, Any, bool, float], None]] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(QUERY_STARTED_INFO, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get(QUERY_STARTED_INFO)
+    if not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    for observer in statement_observers:
+        observer(conn, statement, parameters, executemany, seconds)
+    metrics = current_metrics.get()
+    if metrics is None:
+        return
+    rows = cursor.rowcount if cursor.description is not None and cursor.rowcount > 0 else 0
+    shape = statement_shape(statement)
+    while metrics is not None:
+        metrics.db_seconds += seconds
+        metrics.statements += 1
+        metrics.rows += rows
+        metrics.shapes[shape] += 1
+        metrics = metrics.parent
+
+
+class TimedRoute(APIRoute):
+    """Records when the endpoint returned, so the rest of the handler counts
+    as serialization.
+    """
+
+    def get_route_handler(self):
+        endpoint = self.dependant.call
+
+        def mark_done():
+            if (metrics := current_metrics.get()) is not None:
+                metrics.endpoint_done = time.perf_counter()
+
+        if inspect.iscoroutinefunction(endpoint):
+
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **kwargs):
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    mark_done()
+
+        else:
+
+            @functools.wraps(endpoint)
+            def timed_endpoint(*args, **kwargs):
+                try:
+                    return endpoint(*args, **kwargs)
+                finally:
+                    mark_done()
+
+        # the handler looks the call up on the dependant at request time
+        self.dependant.call = timed_endpoint
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            if (metrics := current_metrics.get()) is not None:
+                metrics.route = self.path
+            response = await handler(request)
+            if metrics is not None and metrics.endpoint_done is not None:
+                metrics.serialize_seconds = time.perf_counter() - metrics.endpoint_done
+            return response
+
+        return timed_handler
+
+
+def route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class PerfMiddleware:
+    """Logs once the response body is sent, so background tasks that run
+    afterwards are not part of the request's numbers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def log(scope: Scope, status: int, metrics: RequestMetrics) -> None:
+        total = metrics.elapsed()
+        route = route_template(scope)
+        label = route if scope.get("route") is not None else UNMATCHED_ROUTE
+        request_seconds.labels(method=scope["method"], route=label, status=status).observe(total)
+        request_db_seconds.labels(route=label).observe(metrics.db_seconds)
+        request_statements.labels(route=label).observe(metrics.statements)
+
+        fields = metrics.log_fields(total)
+        logger.info(
+            f"{scope['method']} {route} {status} "
+            + " ".join(f"{name}={value}" for name, value in fields.items()),
+            extra={"route": route, "method": scope["method"], "status": status, **fields},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(parent=current_metrics.get(), route=scope["path"])
+        token = current_metrics.set(metrics)
+        status = 500
+        logged = False
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status, logged
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", metrics.server_timing(metrics.elapsed()))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                self.log(scope, status, metrics)
+                logged = True
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_metrics.reset(token)
+            if not logged:
+                self.log(scope, status, metrics)
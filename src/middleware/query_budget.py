@@ -0,0 +1,129 @@
+"""Per-route SQL statement budgets and N+1 detection.
+
+``@query_budget(n)`` declares how many statements one request to a route may
+run. ``QueryBudgetMiddleware`` reads the statement count ``PerfMiddleware``
+collected once the response body is sent and logs a warning when the route
+went over. With ``QUERY_DEV_WARNINGS`` on, it also warns about statement
+shapes (SQL with bound parameters collapsed) that ran at least
+``QUERY_REPEAT_THRESHOLD`` times in one request: a lookup per row in a loop.
+
+Tests use ``assert_max_queries`` for a block of code; inside
+``collect_violations`` (autouse in tests/conftest.py) every budget a route
+exceeds is recorded so the test fails.
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.config import TRUE_VALUES
+from src.middleware.perf import RequestMetrics, current_metrics, route_template
+
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+QUERY_DEV_WARNINGS = os.getenv("QUERY_DEV_WARNINGS", "").strip().lower() in TRUE_VALUES
+BUDGET_ATTRIBUTE = "query_budget"
+
+logger = logging.getLogger(__name__)
+F = TypeVar("F", bound=Callable)
+
+# violations of the current test run, None outside collect_violations()
+_violations: list[str] | None = None
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(statements: int) -> Callable[[F], F]:
+    """Declare the most statements one request to the decorated endpoint may run."""
+
+    def decorate(endpoint: F) -> F:
+        setattr(endpoint, BUDGET_ATTRIBUTE, statements)
+        return endpoint
+
+    return decorate
+
+
+def route_budget(scope: Scope) -> int | None:
+    return getattr(getattr(scope.get("route"), "endpoint", None), BUDGET_ATTRIBUTE, None)
+
+
+def repeated_shapes(
+    metrics: RequestMetrics, threshold: int = QUERY_REPEAT_THRESHOLD
+) -> list[tuple[str, int]]:
+    """Statement shapes run at least ``threshold`` times, most frequent first."""
+    if threshold <= 0:
+        return []
+    return [(shape, count) for shape, count in metrics.shapes.most_common() if count >= threshold]
+
+
+def describe(metrics: RequestMetrics, limit: int) -> str:
+    message = f"ran {metrics.statements} SQL statements, budget {limit}"
+    for shape, count in metrics.shapes.most_common(3):
+        message += f"\n  {count}x {shape}"
+    return message
+
+
+@contextmanager
+def collect_violations() -> Iterator[list[str]]:
+    """Record every exceeded route budget in the yielded list."""
+    global _violations
+    previous, _violations = _violations, []
+    try:
+        yield _violations
+    finally:
+        _violations = previous
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[RequestMetrics]:
+    """Raise ``QueryBudgetExceeded`` when the block runs more than ``limit`` statements."""
+    metrics = RequestMetrics(parent=current_metrics.get())
+    token = current_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        current_metrics.reset(token)
+    if metrics.statements > limit:
+        raise QueryBudgetExceeded(describe(metrics, limit))
+
+
+def check_request(scope: Scope, metrics: RequestMetrics) -> None:
+    route = route_template(scope)
+    budget = route_budget(scope)
+    if budget is not None and metrics.statements > budget:
+        message = f"{scope['method']} {route} {describe(metrics, budget)}"
+        logger.warning(message)
+        if _violations is not None:
+            _violations.append(message)
+    if QUERY_DEV_WARNINGS or _violations is not None:
+        for shape, count in repeated_shapes(metrics):
+            logger.warning(
+                f"{scope['method']} {route} ran the same statement {count} times "
+                f"(N+1?): {shape}"
+            )
+
+
+class QueryBudgetMiddleware:
+    """Checks the request's statements against its route once the response
+    body is sent; must sit inside ``PerfMiddleware``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        metrics = current_metrics.get() if scope["type"] == "http" else None
+        if metrics is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_check(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                check_request(scope, metrics)
+
+        await self.app(scope, receive, send_and_check)
@@ -13,27 +13,38 @@ from sqlalchemy import (
     Text,
     select,
     false,
+    Float,
+    UniqueConstraint,
+    Date,
 )
 
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, Mapped, mapped_column, column_property
 import enum
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.dialects.postgresql import ENUM as PgEnum
+from sqlalchemy.dialects.postgresql import ARRAY
+from src.util.merchant import merchant_key
 
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def merchant_key_default(context) -> str | None:
+    return merchant_key(context.get_current_parameters().get("title"))
+
+
 class Organization(Base):
     __tablename__ = "organizations"
 
     uuid = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     name = Column(String(255), nullable=False, unique=True)
     timezone = Column(String(64), nullable=True)
+    # bumped by every write that changes analytics results (see analytics_cache)
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), insert_default=utc_now, nullable=False
     )
@@ -182,6 +193,38 @@ class Category(Base):
     transactions = relationship("Transaction", back_populates="category")
 
 
+class CategorizationRule(Base):
+    """Organization-defined keyword rule applied to imported descriptions."""
+
+    __tablename__ = "categorization_rules"
+
+    uuid: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+    )
+    organization_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organizations.uuid"), nullable=False, index=True
+    )
+    # case-insensitive substring of the transaction title
+    keyword: Mapped[str] = mapped_column(String(100), nullable=False)
+    internal_type: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    category_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("categories.uuid"), nullable=True
+    )
+    # lower runs first
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), insert_default=utc_now, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        insert_default=utc_now,
+        onupdate=utc_now,
+        nullable=False,
+    )
+
+    category: Mapped[Optional["Category"]] = relationship("Category")
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
@@ -217,6 +260,10 @@ class Transaction(Base):
     currency: Mapped[str] = mapped_column(String(10), default="USD")
     date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     title: Mapped[str] = mapped_column(String, nullable=False)
+    # canonical_merchant_key(title), computed once at insert for grouping
+    merchant_key: Mapped[Optional[str]] = mapped_column(
+        String(120), nullable=True, index=True, default=merchant_key_default
+    )
     type: Mapped[str] = mapped_column(
         String(64), nullable=False
     )  # e.g., "expense", "income", "transfer", "refund"
@@ -247,6 +294,93 @@ class Transaction(Base):
     )
 
 
+class RecurringSeries(Base):
+    """Running recurrence statistics per organization and merchant key.
+
+    Maintained incrementally by ``src.services.recurring_series`` as
+    transactions are imported; rebuild with scripts/rebuild_recurring_series.py.
+    """
+
+    __tablename__ = "recurring_series"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "merchant_key", name="uq_recurring_series_org_merchant"),
+    )
+
+    uuid: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True
+    )
+    organization_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organizations.uuid"), nullable=False
+    )
+    merchant_key: Mapped[str] = mapped_column(String(120), nullable=False)
+    first_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    occurrence_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # bounded windows (newest last) the medians and recurrence rules are computed from
+    recent_intervals: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False, default=list)
+    recent_amounts: Mapped[List[int]] = mapped_column(ARRAY(BigInteger), nullable=False, default=list)
+    interval_median: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    amount_median: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # Welford running mean / sum of squared deviations of absolute amounts (cents)
+    amount_mean: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    amount_m2: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    frequency: Mapped[str] = mapped_column(String(16), nullable=False, default="unknown")
+    is_recurring: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        insert_default=utc_now,
+        onupdate=utc_now,
+        nullable=False,
+    )
+
+    @property
+    def amount_variance(self) -> float:
+        if self.occurrence_count < 2:
+            return 0.0
+        return self.amount_m2 / (self.occurrence_count - 1)
+
+
+class DailyRollup(Base):
+    """Per-day transaction sums in the organization's timezone.
+
+    Maintained on every flush by ``src.services.daily_rollup``; rebuild with
+    scripts/rebuild_daily_rollup.py (also after changing an organization's
+    timezone).
+    """
+
+    __tablename__ = "daily_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id",
+            "local_date",
+            "account_id",
+            "category_id",
+            "project_id",
+            "type",
+            name="uq_daily_rollup_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    uuid: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    organization_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organizations.uuid"), nullable=False
+    )
+    local_date: Mapped[date] = mapped_column(Date, nullable=False)
+    account_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    category_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    project_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+    type: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # signed sum and sum of absolute amounts, in cents
+    amount_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    abs_amount_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class Project(Base):
     __tablename__ = "projects"
 
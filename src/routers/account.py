@@ -4,13 +4,17 @@ from sqlalchemy.orm import joinedload
 from src.schemas.user import Perm
 from src.schemas.account import AccountCreate, AccountResponse, AccountUpdate, AccountOptionResponse
 from src.model.models import Account, User
-from src.database.connect import DBSession
+from src.database.connect import DBSession, DBReadSession
 from src.util.user import get_current_user, has_permission
+from src.util.etag import etag_precondition
 from src.util.types import UserPool
 from typing import List
 from src.services.query_service import QueryService, get_query_service
+from src.services.analytics_cache import bump_data_version
+from src.middleware.perf import TimedRoute
+from src.middleware.query_budget import query_budget
 
-account_router = APIRouter()
+account_router = APIRouter(route_class=TimedRoute)
 
 # TODO - it should show the organization level accounts, not just the user level accounts
 
@@ -27,6 +31,7 @@ async def create_account(
         new_account = Account(user_id=current_user.sub, **account)
 
         db.add(new_account)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
         await db.refresh(new_account)
 
@@ -37,9 +42,14 @@ async def create_account(
     
 
 
-@account_router.get("/all", response_model=list[AccountResponse])
+@account_router.get(
+    "/all",
+    response_model=list[AccountResponse],
+    dependencies=[Depends(etag_precondition)],
+)
+@query_budget(5)
 async def get_accounts(
-    db: DBSession, current_user: UserPool = Depends(get_current_user), query_service: QueryService = Depends(get_query_service)
+    db: DBReadSession, current_user: UserPool = Depends(get_current_user), query_service: QueryService = Depends(get_query_service)
 ):
     if not has_permission(current_user, Perm.READ):
         raise HTTPException(403, "User does not have permission to view accounts")
@@ -133,6 +143,7 @@ async def update_account(
                 setattr(account, key, value)
                 
         db.add(account)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
         await db.refresh(account)
 
@@ -158,6 +169,7 @@ async def delete_account(
             raise HTTPException(status_code=404, detail="Account not found")
 
         await db.delete(account)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
     except Exception as e:
         db.rollback()
@@ -1,13 +1,17 @@
 import logging
 from typing import List
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.database.connect import DBSession
-from src.model.models import Category, Transaction
+from src.database.connect import DBSession, DBReadSession
+from src.model.models import CategorizationRule, Category
 from src.schemas.category import (
+    CategorizationRuleRequest,
+    CategorizationRuleResponse,
+    CategorizationRuleUpdateRequest,
     CategoryCreate,
     CategoryResponse,
     CategorySpendingResponse,
@@ -15,12 +19,20 @@ from src.schemas.category import (
 )
 from src.schemas.user import Perm
 from src.model.param_models import CategorySpendingParams
+from src.services.analytics_cache import (
+    analytics_cache,
+    bump_all_data_versions,
+    bump_data_version,
+)
+from src.services.categorization_rules import invalidate_rule_matcher
+from src.services.category_spending import build_category_spending
 from src.services.params import ParamsService
 from src.services.query_service import QueryService, get_query_service
 from src.util.types import UserPool
 from src.util.user import get_current_user, has_permission
+from src.middleware.perf import TimedRoute
 
-category_router = APIRouter()
+category_router = APIRouter(route_class=TimedRoute)
 logger = logging.getLogger(__name__)
 
 # TODO - add permissions and user association to categories
@@ -85,6 +97,11 @@ async def update_category(
                 setattr(category_model, key, value)
 
         db.add(category_model)
+        if category_model.organization_id is None:
+            # global category titles show up in every organization's spending
+            await bump_all_data_versions(db)
+        else:
+            await bump_data_version(db, category_model.organization_id)
         await db.commit()
         await db.refresh(category_model)
     except Exception as e:
@@ -100,7 +117,7 @@ async def update_category(
     response_model=list[CategorySpendingResponse],
 )
 async def get_spending_by_category(
-    db: DBSession,
+    db: DBReadSession,
     params: CategorySpendingParams = Depends(),
     current_user: UserPool = Depends(get_current_user),
     params_service: ParamsService = Depends(ParamsService),
@@ -118,35 +135,21 @@ async def get_spending_by_category(
         )
 
     try:
-        expense_total = func.coalesce(func.sum(Transaction.amount), 0)
-        stmt = query_service.org_filtered_query(
-            model=Transaction,
-            current_user=current_user,
-        ).join(Category, Transaction.category_id == Category.uuid)
-
-        stmt = params_service.apply_date_filter(
-            stmt, Transaction, params.from_date, params.to_date, "date"
-        ).where(Transaction.type == "expense")
-
-        stmt = (
-            stmt.with_only_columns(
-                Category.uuid.label("category_id"),
-                Category.title.label("category"),
-                expense_total.label("expense"),
-            )
-            .group_by(Category.uuid, Category.title)
-            .order_by(func.abs(expense_total).desc(), Category.title.asc())
+        return await analytics_cache.get_or_compute(
+            db,
+            current_user,
+            endpoint="category-spending",
+            params=params,
+            response_type=list[CategorySpendingResponse],
+            compute=lambda: build_category_spending(
+                db=db,
+                current_user=current_user,
+                query_service=query_service,
+                params_service=params_service,
+                from_date=params.from_date,
+                to_date=params.to_date,
+            ),
         )
-
-        result = await db.execute(stmt)
-        return [
-            CategorySpendingResponse(
-                category_id=row.category_id,
-                category=row.category,
-                expense=int(row.expense or 0),
-            )
-            for row in result.all()
-        ]
     except SQLAlchemyError as exc:
         await db.rollback()
         logger.exception("Failed to retrieve spending by category")
@@ -154,3 +157,137 @@ async def get_spending_by_category(
             status_code=500,
             detail="Database error while retrieving spending by category",
         ) from exc
+
+
+def require_rule_org(current_user: UserPool, perm: Perm):
+    if not has_permission(current_user, perm):
+        raise HTTPException(
+            status_code=403,
+            detail="User does not have permission to manage categorization rules",
+        )
+    if current_user.organization_id is None:
+        raise HTTPException(
+            status_code=403,
+            detail="User must belong to an organization to manage categorization rules",
+        )
+    return current_user.organization_id
+
+
+async def validate_rule(rule: CategorizationRule, organization_id, db: DBSession):
+    if not rule.internal_type and rule.category_id is None:
+        raise HTTPException(
+            status_code=422,
+            detail="A rule must set an internal_type, a category_id or both",
+        )
+    if rule.category_id is not None:
+        category = await db.scalar(
+            select(Category.uuid).where(
+                Category.uuid == rule.category_id,
+                (Category.organization_id == organization_id)
+                | Category.organization_id.is_(None),
+            )
+        )
+        if category is None:
+            raise HTTPException(status_code=404, detail="Category not found")
+
+
+async def get_org_rule(rule_id: UUID, organization_id, db: DBSession) -> CategorizationRule:
+    rule = await db.scalar(
+        select(CategorizationRule).where(
+            CategorizationRule.uuid == rule_id,
+            CategorizationRule.organization_id == organization_id,
+        )
+    )
+    if rule is None:
+        raise HTTPException(status_code=404, detail="Categorization rule not found")
+    return rule
+
+
+@category_router.get(
+    "/rules", status_code=200, response_model=list[CategorizationRuleResponse]
+)
+async def get_categorization_rules(
+    db: DBSession,
+    current_user: UserPool = Depends(get_current_user),
+):
+    organization_id = require_rule_org(current_user, Perm.READ)
+    result = await db.execute(
+        select(CategorizationRule)
+        .where(CategorizationRule.organization_id == organization_id)
+        .order_by(CategorizationRule.priority, CategorizationRule.created_at)
+    )
+    return result.scalars().all()
+
+
+@category_router.post(
+    "/rules", status_code=201, response_model=CategorizationRuleResponse
+)
+async def create_categorization_rule(
+    rule_data: CategorizationRuleRequest,
+    db: DBSession,
+    current_user: UserPool = Depends(get_current_user),
+):
+    organization_id = require_rule_org(current_user, Perm.WRITE)
+    rule = CategorizationRule(organization_id=organization_id, **rule_data.model_dump())
+    await validate_rule(rule, organization_id, db)
+    try:
+        db.add(rule)
+        await db.commit()
+        await db.refresh(rule)
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        logger.exception("Failed to create categorization rule")
+        raise HTTPException(
+            status_code=500, detail="Database error while creating categorization rule"
+        ) from exc
+    invalidate_rule_matcher(organization_id)
+    return rule
+
+
+@category_router.put(
+    "/rules/{rule_id}", status_code=200, response_model=CategorizationRuleResponse
+)
+async def update_categorization_rule(
+    rule_id: UUID,
+    rule_data: CategorizationRuleUpdateRequest,
+    db: DBSession,
+    current_user: UserPool = Depends(get_current_user),
+):
+    organization_id = require_rule_org(current_user, Perm.WRITE)
+    rule = await get_org_rule(rule_id, organization_id, db)
+    for key, value in rule_data.model_dump(exclude_unset=True).items():
+        if getattr(rule, key) != value:
+            setattr(rule, key, value)
+    await validate_rule(rule, organization_id, db)
+    try:
+        await db.commit()
+        await db.refresh(rule)
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        logger.exception("Failed to update categorization rule")
+        raise HTTPException(
+            status_code=500, detail="Database error while updating categorization rule"
+        ) from exc
+    invalidate_rule_matcher(organization_id)
+    return rule
+
+
+@category_router.delete("/rules/{rule_id}", status_code=200)
+async def delete_categorization_rule(
+    rule_id: UUID,
+    db: DBSession,
+    current_user: UserPool = Depends(get_current_user),
+):
+    organization_id = require_rule_org(current_user, Perm.DELETE)
+    rule = await get_org_rule(rule_id, organization_id, db)
+    try:
+        await db.delete(rule)
+        await db.commit()
+    except SQLAlchemyError as exc:
+        await db.rollback()
+        logger.exception("Failed to delete categorization rule")
+        raise HTTPException(
+            status_code=500, detail="Database error while deleting categorization rule"
+        ) from exc
+    invalidate_rule_matcher(organization_id)
+    return {"message": "Categorization rule deleted successfully!"}
@@ -1,12 +1,19 @@
 from fastapi import APIRouter
 import logging
+from typing import Iterable
 from fastapi import HTTPException
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
 from sqlalchemy import text
-from src.database.connect import DBSession
+from src.database.connect import DBSession, sessionmanager
+from src.middleware.perf import TimedRoute
+from src.util.metrics import registry
 
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/ping")
@@ -23,3 +30,67 @@ async def test_db_connection(db: DBSession):
         return {"message": "DB connection successful!", "time": row[0]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# pool_status() key -> (metric name, help)
+POOL_GAUGES = {
+    "size": ("db_pool_size", "Connections the pool keeps open."),
+    "checked_out": ("db_pool_checked_out", "Connections currently in use."),
+    "checked_in": ("db_pool_checked_in", "Idle connections in the pool."),
+    "overflow": ("db_pool_overflow", "Connections opened beyond the pool size."),
+    "wait_seconds_max": ("db_pool_wait_seconds_max", "Longest checkout wait since start."),
+}
+POOL_COUNTERS = {
+    "checkouts": ("db_pool_checkouts", "Connections handed out by the pool."),
+    "timeouts": ("db_pool_timeouts", "Checkouts that gave up waiting for a connection."),
+    "wait_seconds_total": ("db_pool_wait_seconds", "Time spent waiting for connections."),
+}
+
+
+class PoolCollector(Collector):
+    """Pool state of the primary and each replica at scrape time."""
+
+    def collect(self) -> Iterable[Metric]:
+        status = sessionmanager.pool_status()
+        if not status:
+            return
+        pools = [("primary", status)]
+        for index, replica in enumerate(status.get("replicas", [])):
+            pools.append((f"replica_{index}", replica))
+        families = {
+            **{
+                key: GaugeMetricFamily(name, doc, labels=["pool"])
+                for key, (name, doc) in POOL_GAUGES.items()
+            },
+            **{
+                key: CounterMetricFamily(name, doc, labels=["pool"])
+                for key, (name, doc) in POOL_COUNTERS.items()
+            },
+        }
+        for pool, values in pools:
+            for key, family in families.items():
+                if key in values:
+                    family.add_metric([pool], values[key])
+        yield from families.values()
+
+
+registry.register(PoolCollector())
+
+
+@router.get("/metrics")
+async def metrics():
+    """This worker's metrics in the Prometheus text format."""
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/pool")
+async def pool_status():
+    """Connection pool usage and checkout wait times for this worker."""
+    return sessionmanager.pool_status()
+
+
+@router.get("/replicas")
+async def replica_status():
+    """Check every read replica and report which ones accept connections."""
+    healthy = await sessionmanager.check_replicas()
+    return {"replicas": [{"index": index, "healthy": ok} for index, ok in enumerate(healthy)]}
@@ -1,8 +1,8 @@
 import os
 from src.model.param_models import ImportParams
 from src.model.models import ImportJob, ImportJobStatus
-from fastapi import APIRouter, Depends, HTTPException
-from src.database.connect import DBSession
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from src.database.connect import DBSession, DBReadSession
 from src.schemas.import_file import (
     ImportFileCreate,
     ImportFileResponse,
@@ -15,15 +15,17 @@ from src.util.s3 import S3Client, get_s3_client
 from src.services.params import ParamsService
 import logging
 from src.util.import_file import fail_import_job, update_import_job_status
-from src.services.import_manager import get_importer
 from src.services.query_service import get_query_service, QueryService
-from src.services.subscription_candidate_service import mark_subscription_candidates
+from src.services.analytics_cache import bump_data_version
+from src.services.recurring_series import refresh_subscription_candidates_task
 from src.schemas.user import Perm
+from src.middleware.perf import TimedRoute
+from src.middleware.query_budget import query_budget
 
 BUCKET_NAME = os.getenv("AWS_BUCKET_NAME")
 
 logger = logging.getLogger(__name__)
-import_router = APIRouter()
+import_router = APIRouter(route_class=TimedRoute)
 
 
 @import_router.post("/start", status_code=201, response_model=ImportFileResponse)
@@ -79,15 +81,22 @@ async def create_import_job(
 
 
 @import_router.post("/complete", status_code=200, response_model=ImportFileResponse)
+@query_budget(30)
 async def import_complete(
     import_data: ImportCompleteRequest,
     db: DBSession,
+    background_tasks: BackgroundTasks,
     current_user: UserPool = Depends(get_current_user),
     s3_client: S3Client = Depends(get_s3_client),
     query_service: QueryService = Depends(get_query_service),
 ):
     if not has_permission(current_user, Perm.WRITE):
         raise HTTPException(403, "User does not have permission to create import jobs")
+    # the importers and their bank specs load on first use, not at startup
+    from src.services.bank_importers.ofx import iter_text_chunks
+    from src.services.bank_importers.pipeline import track_import
+    from src.services.import_manager import select_importer, sniff_header
+
     base_stmt = query_service.org_filtered_query(
         model=ImportJob,
         account_attr="account",
@@ -109,29 +118,48 @@ async def import_complete(
     job_account_type = import_job.account.account_type
 
     try:
-        file_content = s3_client.get_s3_file(key=job_file_key)
-        if not file_content:
+        file_stream = s3_client.get_s3_stream(key=job_file_key)
+        header_line, head = sniff_header(file_stream)
+        if not head:
             logger.error(f"File not found in S3 for key: {job_file_key}")
             raise HTTPException(status_code=404, detail="File not found in S3")
 
-        importer = get_importer(
-            file_content=file_content,
+        # Pick the importer from the header before pulling the rest of the file.
+        importer_cls = select_importer(
             file_name=job_file_name,
             file_type=job_file_type,
             account_type=job_account_type,
+            header_line=header_line,
+        )
+        if importer_cls.streaming:
+            file_content = iter_text_chunks(head, file_stream)
+        else:
+            file_content = (head + file_stream.read()).decode("utf-8")
+        importer = importer_cls(
+            file_content=file_content,
             db=db,
             s3_client=s3_client,
             current_user=current_user,
         )
-        parsed_transactions = await importer.parse_csv_transactions(import_job)
+        with track_import() as run:
+            parsed_transactions = await importer.parse_csv_transactions(import_job)
+        touched_merchant_keys = {
+            tx.merchant_key for tx in parsed_transactions if tx.merchant_key
+        }
         db.add_all(parsed_transactions)
 
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
-        # await mark_subscription_candidates(
-        #     db=db,
-        #     user_id=job_user_id,
-        #     account_id=job_account_id,
-        # )
+        run.mark("insert")
+        run.record(importer_cls.__name__)
+        # Align earlier rows of the merchants this import touched with their
+        # series, after the response.
+        background_tasks.add_task(
+            refresh_subscription_candidates_task,
+            organization_id=current_user.organization_id,
+            user_id=job_user_id,
+            merchant_keys=touched_merchant_keys,
+        )
         updated_import_job = await update_import_job_status(
             import_job_id=job_id,
             new_status=ImportJobStatus.COMPLETED,
@@ -160,7 +188,7 @@ async def import_complete(
 
 @import_router.get("/imports", status_code=200, response_model=list[ImportFileListItem])
 async def get_imports(
-    db: DBSession,
+    db: DBReadSession,
     params: ImportParams = Depends(),
     current_user: UserPool = Depends(get_current_user),
     params_service: ParamsService = Depends(ParamsService),
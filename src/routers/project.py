@@ -5,12 +5,14 @@ from src.util.types import UserPool
 from src.model.models import Project
 from src.database.connect import DBSession
 from src.util.user import get_current_user
+from src.services.analytics_cache import bump_data_version
+from src.middleware.perf import TimedRoute
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy import or_
 
 
-project_router = APIRouter()
+project_router = APIRouter(route_class=TimedRoute)
 
 
 @project_router.post("/create", status_code=201, response_model=ProjectResponse)
@@ -132,6 +134,7 @@ async def delete_project(
             raise HTTPException(status_code=404, detail="Project not found")
 
         await db.delete(result)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
 
         return {"message": "Project deleted successfully!"}
@@ -1,28 +1,35 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
 from src.schemas.subscription import (
     SubscriptionCreate,
     SubscriptionUpdate,
     SubscriptionResponse,
     SubscriptionSummaryResponse,
+    SubscriptionUpcomingResponse,
     SubscriptionsAllResponse,
 )
 from src.schemas.transaction import TransactionsAllResponse, TransactionResponse
 from src.model.models import Subscription, Transaction
 from src.model.param_models import TransactionsParams
 from src.util.user import get_current_user, has_permission
+from src.util.etag import etag_precondition
 from src.util.types import UserPool
 from src.schemas.user import Perm
-from src.database.connect import DBSession
+from src.database.connect import DBSession, DBReadSession
 from src.services.params import ParamsService
 from src.services.query_service import get_query_service, QueryService
 from typing import List
 from sqlalchemy.orm import joinedload
 from sqlalchemy.future import select
 from sqlalchemy import func
-from src.services.subscription_candidate_service import calculate_next_billing_date
+from src.services.analytics_cache import analytics_cache, bump_data_version
+from src.services.billing_calendar import build_upcoming_charges
+from src.services.subscription_summary import build_subscription_summary
+from src.middleware.perf import TimedRoute
 
 
-subscription_router = APIRouter()
+subscription_router = APIRouter(route_class=TimedRoute)
 
 """ Create a new subscription """
 
@@ -40,6 +47,7 @@ async def create_subscription(
     subscription = Subscription(**subscription_dict)
     try:
         db.add(subscription)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
         await db.refresh(subscription)
     except Exception as e:
@@ -75,6 +83,7 @@ async def update_subscription(
             if getattr(subscription_model, key) != value:
                 setattr(subscription_model, key, value)
         db.add(subscription_model)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
         await db.refresh(subscription_model)
         return subscription_model
@@ -86,10 +95,13 @@ async def update_subscription(
 """ Get all subscriptions """
 
 @subscription_router.get(
-    "/all", status_code=200, response_model=List[SubscriptionsAllResponse]
+    "/all",
+    status_code=200,
+    response_model=List[SubscriptionsAllResponse],
+    dependencies=[Depends(etag_precondition)],
 )
 async def get_user_subscriptions(
-    db: DBSession,
+    db: DBReadSession,
     current_user: UserPool = Depends(get_current_user),
 ):
     try:
@@ -250,6 +262,7 @@ async def delete_subscription(
         raise HTTPException(status_code=404, detail="Subscription not found")
     try:
         await db.delete(subscription)
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
     except Exception as e:
         await db.rollback()
@@ -259,47 +272,70 @@ async def delete_subscription(
     return "Subscription deleted successfully"
 
 
-@subscription_router.get("/summary", status_code=200, response_model=SubscriptionSummaryResponse)
+@subscription_router.get(
+    "/summary",
+    status_code=200,
+    response_model=SubscriptionSummaryResponse,
+    dependencies=[Depends(etag_precondition)],
+)
 async def get_subscription_summary(
-    db: DBSession,
+    db: DBReadSession,
     current_user: UserPool = Depends(get_current_user),
     query_service: QueryService = Depends(get_query_service),
 ):
-    base_stmt = query_service.org_filtered_query(
-        model=Subscription, current_user=current_user
+    return await analytics_cache.get_or_compute(
+        db,
+        current_user,
+        endpoint="subscription-summary",
+        params=None,
+        response_type=SubscriptionSummaryResponse,
+        compute=lambda: build_subscription_summary(
+            db=db,
+            current_user=current_user,
+            query_service=query_service,
+        ),
     )
-    result = await db.execute(base_stmt)
-    subscriptions = result.scalars().all()
 
-    monthly_subscriptions = sum(
-        sub.amount for sub in subscriptions if sub.billing_frequency == "monthly"
-    )
-    yearly_subscriptions_to_monthly = (
-        sum(sub.amount for sub in subscriptions if sub.billing_frequency == "yearly") / 12
-    )
-    weakly_subscriptions_to_monthly = (
-        sum(sub.amount for sub in subscriptions if sub.billing_frequency == "weekly") * 4.33
-    )
-    quarterly_subscriptions_to_monthly = (
-        sum(sub.amount for sub in subscriptions if sub.billing_frequency == "quarterly") / 3
-    )
 
-    total_monthly_cost_cents = (
-        monthly_subscriptions
-        + yearly_subscriptions_to_monthly
-        + weakly_subscriptions_to_monthly
-        + quarterly_subscriptions_to_monthly
+UPCOMING_MAX_DAYS = 366
+
+
+@subscription_router.get("/upcoming", status_code=200, response_model=SubscriptionUpcomingResponse)
+async def get_upcoming_charges(
+    db: DBReadSession,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    current_user: UserPool = Depends(get_current_user),
+    query_service: QueryService = Depends(get_query_service),
+):
+    """Projected subscription charges between ``from_date`` and ``to_date``
+    (default: the next 30 days), ordered by billing date."""
+    if not has_permission(current_user, Perm.READ):
+        raise HTTPException(403, "User does not have permission to view subscriptions")
+
+    from_date = from_date or datetime.now(timezone.utc).date()
+    to_date = to_date or from_date + timedelta(days=30)
+    if to_date < from_date:
+        raise HTTPException(422, "to_date must not be before from_date")
+    if (to_date - from_date).days > UPCOMING_MAX_DAYS:
+        raise HTTPException(422, f"The window may span at most {UPCOMING_MAX_DAYS} days")
+
+    return await analytics_cache.get_or_compute(
+        db,
+        current_user,
+        endpoint="subscription-upcoming",
+        # projections start from the current UTC day
+        params={
+            "from_date": from_date,
+            "to_date": to_date,
+            "today": datetime.now(timezone.utc).date(),
+        },
+        response_type=SubscriptionUpcomingResponse,
+        compute=lambda: build_upcoming_charges(
+            db=db,
+            current_user=current_user,
+            query_service=query_service,
+            from_date=from_date,
+            to_date=to_date,
+        ),
     )
-    subscription_count = len(subscriptions)
-    total_active_subscriptions = sum(1 for sub in subscriptions if sub.status == "active")
-    total_inactive_subscriptions = sum(1 for sub in subscriptions if sub.status == "inactive")
-    total_paused_subscriptions = sum(1 for sub in subscriptions if sub.status == "paused")
-    
-
-    return {
-        "total_monthly_cost_cents": round(total_monthly_cost_cents),
-        "total_subscriptions_count": subscription_count,
-        "total_active_subscriptions_count": total_active_subscriptions,
-        "total_inactive_subscriptions_count": total_inactive_subscriptions,
-        "total_paused_subscriptions_count": total_paused_subscriptions,
-    }
@@ -7,7 +7,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from src.schemas.user import Perm
 from src.model.param_models import TransactionsParams, TransactionByNameParams
 from src.services.params import ParamsService
-from src.model.models import Transaction, Account, AccountTypeEnum, Subscription, Category
+from src.model.models import Transaction, Account, AccountTypeEnum, Subscription, Category, RecurringSeries
 from src.schemas.transaction import (
     TransactionCreate,
     TransactionResponse,
@@ -18,6 +18,8 @@ from src.schemas.transaction import (
     TransactionsAllResponse,
     TransactionsAllRequest,
     TransactionUpdateSubscriptionResponse,
+    TransactionBulkUpdateSubscriptionRequest,
+    TransactionBulkUpdateSubscriptionResponse,
     TransactionsByNameResponse,
     TransactionByNameMetaResponse,
     TransactionByNamePeriodResponse,
@@ -26,25 +28,31 @@ from src.schemas.transaction import (
     CashFlowHistoryRequest,
     CashFlowHistoryResponse,
 )
-from collections import defaultdict
 from typing import Optional
-from src.database.connect import DBSession
+from src.database.connect import DBSession, DBReadSession
 from src.util.types import UserPool
 from src.util.user import get_current_user, has_permission
-from src.util.transaction import create_transaction_in_db
+from src.util.etag import etag_precondition
+from src.util.transaction import create_transaction_in_db, link_transactions_to_subscriptions
 from src.services.query_service import get_query_service, QueryService
-from src.services.subscription_candidate_service import infer_frequency
 from src.services.cash_flow_history import get_cash_flow_history
 from src.services.transaction_summary import build_transaction_summary
+from src.services.analytics_cache import analytics_cache, bump_data_version
+from src.middleware.perf import TimedRoute
+from src.middleware.query_budget import query_budget
 
-transaction_router = APIRouter()
+transaction_router = APIRouter(route_class=TimedRoute)
 
 
 @transaction_router.get(
-    "/cash-flow-history", status_code=200, response_model=CashFlowHistoryResponse
+    "/cash-flow-history",
+    status_code=200,
+    response_model=CashFlowHistoryResponse,
+    dependencies=[Depends(etag_precondition)],
 )
+@query_budget(6)
 async def cash_flow_history(
-    db: DBSession,
+    db: DBReadSession,
     request: Annotated[CashFlowHistoryRequest, Query()],
     current_user: UserPool = Depends(get_current_user),
     query_service: QueryService = Depends(get_query_service),
@@ -55,12 +63,14 @@ async def cash_flow_history(
     user or organization timezone before returning the periods. The frontend
     should use the response ``timezone`` and timezone-aware period boundaries
     for labels; it should not re-bucket the returned data in browser UTC.
+    Passing several ``granularities`` returns one series per granularity from
+    a single ``GROUPING SETS`` query; ``periods`` mirrors the first series.
 
     Args:
         db: Async database session used to load timezone settings and query
             organization-scoped transactions.
-        request: Date range, granularity, and optional account, category, or
-            project filters.
+        request: Date range, granularity or granularities, and optional
+            account, category, or project filters.
         current_user: Authenticated user and organization context.
         query_service: Query builder that enforces organization isolation.
 
@@ -75,10 +85,18 @@ async def cash_flow_history(
 
     if not has_permission(current_user, Perm.READ):
         raise HTTPException(403, "User does not have permission to view transactions")
-    return await get_cash_flow_history(db, current_user, query_service, request)
+    return await analytics_cache.get_or_compute(
+        db,
+        current_user,
+        endpoint="cash-flow-history",
+        params=request,
+        response_type=CashFlowHistoryResponse,
+        compute=lambda: get_cash_flow_history(db, current_user, query_service, request),
+    )
 
 
 @transaction_router.post("/create", status_code=200, response_model=TransactionResponse)
+@query_budget(20)
 async def create_transaction(
     transaction_data: TransactionCreate,
     db: DBSession,
@@ -109,9 +127,15 @@ async def create_transaction(
     return await create_transaction_in_db(transaction_data, db, current_user.sub)
 
 
-@transaction_router.get("/all", status_code=200, response_model=TransactionsAllResponse)
+@transaction_router.get(
+    "/all",
+    status_code=200,
+    response_model=TransactionsAllResponse,
+    dependencies=[Depends(etag_precondition)],
+)
+@query_budget(6)
 async def get_transactions(
-    db: DBSession,
+    db: DBReadSession,
     transaction_filters: Annotated[TransactionsAllRequest, Query()],
     current_user: UserPool = Depends(get_current_user),
     params: TransactionsParams = Depends(),
@@ -291,10 +315,14 @@ async def get_transactions(
 
 
 @transaction_router.get(
-    "/summary", status_code=200, response_model=TransactionSummaryResponse
+    "/summary",
+    status_code=200,
+    response_model=TransactionSummaryResponse,
+    dependencies=[Depends(etag_precondition)],
 )
+@query_budget(6)
 async def get_transaction_summary(
-    db: DBSession,
+    db: DBReadSession,
     request: Annotated[TransactionSummaryRequest, Query()],
     current_user: UserPool = Depends(get_current_user),
     query_service: QueryService = Depends(get_query_service),
@@ -302,11 +330,18 @@ async def get_transaction_summary(
     """Return an organization-scoped transaction summary for a date range."""
     if not has_permission(current_user, Perm.READ):
         raise HTTPException(403, "User does not have permission to view transactions")
-    return await build_transaction_summary(
-        db=db,
-        current_user=current_user,
-        query_service=query_service,
-        request=request,
+    return await analytics_cache.get_or_compute(
+        db,
+        current_user,
+        endpoint="transaction-summary",
+        params=request,
+        response_type=TransactionSummaryResponse,
+        compute=lambda: build_transaction_summary(
+            db=db,
+            current_user=current_user,
+            query_service=query_service,
+            request=request,
+        ),
     )
 
 
@@ -327,37 +362,51 @@ async def get_subscription_candidates(
 
     try:
         safe_limit = min(max(limit, 1), 500)
-        stmt = query_service.org_filtered_query(
+        # Latest candidate per title, so the limit counts merchants, not rows.
+        latest_stmt = query_service.org_filtered_query(
             model=Transaction,
-            account_attr="account",
-            category_attr="category",
             current_user=current_user,
         ).where(Transaction.subscription_candidate.is_(True))
 
         if account_type:
-            stmt = stmt.join(Account, Transaction.account_id == Account.uuid).where(
-                Account.account_type == account_type
-            )
+            latest_stmt = latest_stmt.join(
+                Account, Transaction.account_id == Account.uuid
+            ).where(Account.account_type == account_type)
 
-        stmt = stmt.order_by(Transaction.date.desc()).limit(safe_limit)
-        result = (await db.execute(stmt)).scalars().all()
-        
-        transactions_by_title = defaultdict(list)
-        for t in result:
-            transactions_by_title[t.title].append(t.date)
-        
-        seen_titles = set()
-        unique_transactions = []
-        for t in result:
-            if t.title not in seen_titles:
-                seen_titles.add(t.title)
-                unique_transactions.append(t)
+        latest = (
+            latest_stmt.with_only_columns(Transaction.uuid)
+            .distinct(Transaction.title)
+            .order_by(Transaction.title, Transaction.date.desc())
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                Transaction,
+                Account.account_name,
+                Category.title.label("category_title"),
+                RecurringSeries.frequency,
+            )
+            .join(latest, Transaction.uuid == latest.c.uuid)
+            .outerjoin(Account, Transaction.account_id == Account.uuid)
+            .outerjoin(Category, Transaction.category_id == Category.uuid)
+            .outerjoin(
+                RecurringSeries,
+                and_(
+                    RecurringSeries.organization_id == current_user.organization_id,
+                    RecurringSeries.merchant_key == Transaction.merchant_key,
+                ),
+            )
+            .order_by(Transaction.date.desc())
+            .limit(safe_limit)
+        )
+        rows = (await db.execute(stmt)).all()
 
         return [
             SubscriptionCandidateResponse(
-                account_name=(t.account.account_name if t.account else None),
+                account_name=account_name,
                 account_id=t.account_id,
-                category=(t.category.title if t.category else None),
+                category=category_title,
                 project_id=t.project_id,
                 uuid=t.uuid,
                 title=t.title,
@@ -367,12 +416,12 @@ async def get_subscription_candidates(
                 currency=t.currency,
                 type=t.type,
                 category_id=t.category_id,
-                frequency=infer_frequency(transactions_by_title[t.title]) if t.title in transactions_by_title else "unknown",
+                frequency=frequency or "unknown",
                 user_id=t.user_id,
                 subscription_candidate=t.subscription_candidate,
                 subscription_id=t.subscription_id,
             )
-            for t in unique_transactions
+            for t, account_name, category_title, frequency in rows
         ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve subscription candidates: {str(e)}")
@@ -652,6 +701,7 @@ async def update_transaction_subscription(
             transaction.subscription_id = transaction_data.subscription_id
             transaction.subscription_candidate = False
 
+        await bump_data_version(db, current_user.organization_id)
         await db.commit()
         return {
             "updated_count": len(transactions),
@@ -666,3 +716,52 @@ async def update_transaction_subscription(
     except Exception:
         await db.rollback()
         raise HTTPException(500, "Failed to update transaction subscription")
+
+
+@transaction_router.post(
+    "/update-subscriptions",
+    status_code=200,
+    response_model=TransactionBulkUpdateSubscriptionResponse,
+)
+async def update_transaction_subscriptions(
+    request: TransactionBulkUpdateSubscriptionRequest,
+    db: DBSession,
+    current_user: UserPool = Depends(get_current_user),
+):
+    """Link many transaction names to subscriptions in one round trip.
+
+    Pairs whose subscription is not in the caller's organization, or whose
+    name matches no transactions, are reported with ``updated_count`` 0.
+    """
+    if not has_permission(current_user, Perm.WRITE):
+        raise HTTPException(403, "User does not have permission to update transactions")
+    if current_user.organization_id is None:
+        raise HTTPException(403, "User must belong to an organization to update transactions")
+
+    links = [
+        (link.transaction_name.strip(), link.subscription_id) for link in request.links
+    ]
+    try:
+        counts = await link_transactions_to_subscriptions(
+            db=db,
+            organization_id=current_user.organization_id,
+            links=links,
+        )
+        await bump_data_version(db, current_user.organization_id)
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        raise HTTPException(500, "Database error while updating subscriptions")
+
+    results = [
+        TransactionUpdateSubscriptionResponse(
+            updated_count=counts.get((name, subscription_id), 0),
+            subscription_id=subscription_id,
+            transaction_name=name,
+        )
+        for name, subscription_id in links
+    ]
+    return TransactionBulkUpdateSubscriptionResponse(
+        updated_count=sum(result.updated_count for result in results),
+        results=results,
+    )
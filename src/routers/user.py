@@ -6,9 +6,10 @@ from src.database.connect import DBSession
 from typing import List
 from src.util.user import get_current_user, has_permission
 from src.util.types import UserPool
+from src.middleware.perf import TimedRoute
 from sqlalchemy import select
 
-user_router = APIRouter()
+user_router = APIRouter(route_class=TimedRoute)
 
 
 @user_router.get("/users", response_model=List[UserResponse])
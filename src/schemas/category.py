@@ -1,7 +1,7 @@
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CategoryBase(BaseModel):
@@ -30,3 +30,28 @@ class CategorySpendingResponse(BaseModel):
     category_id: UUID
     category: str
     expense: int
+
+
+class CategorizationRuleRequest(BaseModel):
+    keyword: str = Field(..., min_length=1, max_length=100)
+    internal_type: Optional[str] = Field(None, max_length=64)
+    category_id: Optional[UUID] = None
+    priority: int = 0
+
+
+class CategorizationRuleUpdateRequest(BaseModel):
+    keyword: Optional[str] = Field(None, min_length=1, max_length=100)
+    internal_type: Optional[str] = Field(None, max_length=64)
+    category_id: Optional[UUID] = None
+    priority: Optional[int] = None
+
+
+class CategorizationRuleResponse(BaseModel):
+    uuid: UUID
+    keyword: str
+    internal_type: Optional[str] = None
+    category_id: Optional[UUID] = None
+    priority: int
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from decimal import Decimal
 from uuid import UUID
 
@@ -92,6 +92,19 @@ class SubscriptionSummaryResponse(BaseModel):
     
     class Config:
         from_attributes = True
-    
-    
- 
\ No newline at end of file
+
+
+class SubscriptionUpcomingChargeResponse(BaseModel):
+    subscription_id: UUID
+    name: str
+    amount: int
+    currency: Optional[str] = None
+    billing_frequency: str
+    billing_date: date
+
+
+class SubscriptionUpcomingResponse(BaseModel):
+    from_date: date
+    to_date: date
+    total_amount_cents: int
+    charges: list[SubscriptionUpcomingChargeResponse]
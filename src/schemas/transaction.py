@@ -144,6 +144,7 @@ class CashFlowHistoryRequest(BaseModel):
     account_ids: list[UUID] | None = None
     project_ids: list[UUID] | None = None
     granularity: Literal["day", "week", "month"] = "month"
+    granularities: list[Literal["day", "week", "month"]] | None = None
 
     @model_validator(mode="after")
     def validate_date_range(self) -> "CashFlowHistoryRequest":
@@ -151,6 +152,11 @@ class CashFlowHistoryRequest(BaseModel):
             raise ValueError("from_date cannot be after to_date")
         return self
 
+    @property
+    def requested_granularities(self) -> list[str]:
+        """``granularities`` without repeats, else just ``granularity``."""
+        return list(dict.fromkeys(self.granularities or [self.granularity]))
+
 
 class CashFlowPeriodResponse(BaseModel):
     period_start: datetime
@@ -162,12 +168,18 @@ class CashFlowPeriodResponse(BaseModel):
     transaction_count: int
 
 
+class CashFlowSeriesResponse(BaseModel):
+    granularity: Literal["day", "week", "month"]
+    periods: list[CashFlowPeriodResponse]
+
+
 class CashFlowHistoryResponse(BaseModel):
     timezone: str
     from_date: date
     to_date: date
     granularity: Literal["day", "week", "month"]
     periods: list[CashFlowPeriodResponse]
+    series: list[CashFlowSeriesResponse]
 
 
 class SubscriptionCandidateCountResponse(BaseModel):
@@ -197,6 +209,25 @@ class TransactionUpdateSubscriptionResponse(BaseModel):
     transaction_name: str
 
 
+class TransactionBulkUpdateSubscriptionRequest(BaseModel):
+    links: list[TransactionUpdateSubscriptionRequest] = Field(..., min_length=1, max_length=1000)
+
+    @field_validator("links")
+    @classmethod
+    def validate_unique_names(cls, links: list[TransactionUpdateSubscriptionRequest]):
+        names = [link.transaction_name.strip() for link in links]
+        if any(not name for name in names):
+            raise ValueError("transaction_name must not be empty")
+        if len(set(names)) != len(names):
+            raise ValueError("each transaction_name may only be linked once per request")
+        return links
+
+
+class TransactionBulkUpdateSubscriptionResponse(BaseModel):
+    updated_count: int
+    results: list[TransactionUpdateSubscriptionResponse]
+
+
 class TransactionByNamePeriodResponse(BaseModel):
     from_date: Optional[datetime] = None
     to_date: Optional[datetime] = None
@@ -0,0 +1,262 @@
+"""Versioned result cache for the analytics endpoints.
+
+Entries are keyed by organization, endpoint, normalized request parameters,
+the timezones that shape the buckets and ``organizations.data_version``.
+Write paths call ``bump_data_version`` in the same database transaction as
+their change, so a committed write moves every reader to a new key and stale
+entries simply age out of the LRU; nothing is invalidated explicitly.
+
+The in-process tier is a bounded LRU. Setting ``ANALYTICS_CACHE_REDIS_URL``
+adds a shared Redis tier (requires the ``redis`` package) so workers reuse
+each other's results.
+
+Version keys are kept per user for ``DATA_VERSION_CACHE_TTL_SECONDS``; a commit
+that bumps a version in this process drops the affected keys at once, the TTL
+bounds how long writes made elsewhere (scripts, other workers) go unseen. A
+cache hit or ETag ``304`` within the TTL therefore runs no statement and never
+checks a connection out of the pool.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from src.database.connect import DBSession
+from src.model.models import Organization, User
+from src.util.metrics import CacheStats
+from src.util.types import UserPool
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # optional shared tier
+    redis_asyncio = None
+
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "1024"))
+ANALYTICS_CACHE_TTL_SECONDS = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "3600"))
+ANALYTICS_CACHE_REDIS_URL = os.getenv("ANALYTICS_CACHE_REDIS_URL")
+DATA_VERSION_CACHE_TTL_SECONDS = float(os.getenv("DATA_VERSION_CACHE_TTL_SECONDS", "5"))
+VERSION_KEYS_MAX = 10000
+
+analytics_stats = CacheStats("analytics")
+version_key_stats = CacheStats("data_version")
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+# memoizes the version key on the request's session (ETag check, then cache)
+VERSION_KEY_INFO = "analytics_version_key"
+# organizations bumped by the session's transaction, forgotten on commit
+BUMPED_INFO = "analytics_bumped_organizations"
+ALL_ORGANIZATIONS = "*"
+
+
+class VersionKeyCache:
+    """Version keys by user id, each kept for ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DATA_VERSION_CACHE_TTL_SECONDS,
+        max_size: int = VERSION_KEYS_MAX,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, UUID, str]]" = OrderedDict()
+
+    def get(self, user_id: Any) -> str | None:
+        entry = self._entries.get(str(user_id))
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[str(user_id)]
+            return None
+        return entry[2]
+
+    def set(self, user_id: Any, organization_id: UUID, key: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[str(user_id)] = (time.monotonic() + self.ttl_seconds, organization_id, key)
+        self._entries.move_to_end(str(user_id))
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def forget_organization(self, organization_id: UUID | str) -> None:
+        if organization_id == ALL_ORGANIZATIONS:
+            self._entries.clear()
+            return
+        for user_id in [
+            user_id for user_id, entry in self._entries.items() if entry[1] == organization_id
+        ]:
+            del self._entries[user_id]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+version_keys = VersionKeyCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_bumped_versions(session: Session) -> None:
+    for organization_id in session.info.pop(BUMPED_INFO, ()):
+        version_keys.forget_organization(organization_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_bumped_versions(session: Session) -> None:
+    session.info.pop(BUMPED_INFO, None)
+
+
+def _mark_bumped(db: DBSession, organization_id: UUID | str) -> None:
+    db.info.pop(VERSION_KEY_INFO, None)
+    db.info.setdefault(BUMPED_INFO, set()).add(organization_id)
+
+
+def _bump_statement():
+    return update(Organization).values(
+        data_version=Organization.data_version + 1
+    ).execution_options(synchronize_session=False)
+
+
+async def bump_data_version(db: DBSession, organization_id: UUID | None) -> None:
+    """Mark an organization's analytics as changed when the transaction commits.
+
+    Call it right before committing: the row stays locked until then.
+    """
+    if organization_id is not None:
+        _mark_bumped(db, organization_id)
+        await db.execute(_bump_statement().where(Organization.uuid == organization_id))
+
+
+async def bump_all_data_versions(db: DBSession) -> None:
+    """For shared data such as global categories."""
+    _mark_bumped(db, ALL_ORGANIZATIONS)
+    await db.execute(_bump_statement())
+
+
+async def bump_user_data_version(db: DBSession, user_id: UUID) -> None:
+    await bump_data_version(
+        db, await db.scalar(select(User.organization_id).where(User.uuid == user_id))
+    )
+
+
+async def data_version_key(db: DBSession, current_user: UserPool) -> str | None:
+    """Organization, data version and timezones of ``current_user``.
+
+    ``None`` when the user has no organization. Looked up once per session
+    and then served from ``version_keys`` until it expires or is bumped.
+    """
+    memo = db.info.get(VERSION_KEY_INFO)
+    if memo is not None and memo[0] == current_user.sub:
+        return memo[1]
+    key = version_keys.get(current_user.sub)
+    if key is not None:
+        version_key_stats.hit()
+        db.info[VERSION_KEY_INFO] = (current_user.sub, key)
+        return key
+    version_key_stats.miss()
+    row = (
+        await db.execute(
+            select(Organization.uuid, Organization.data_version, Organization.timezone, User.timezone)
+            .join(User, User.organization_id == Organization.uuid)
+            .where(User.uuid == current_user.sub)
+        )
+    ).first()
+    key = None
+    if row is not None:
+        organization_id, version, organization_timezone, user_timezone = row
+        key = f"{organization_id}:{version}:{organization_timezone or ''}:{user_timezone or ''}"
+        version_keys.set(current_user.sub, organization_id, key)
+    db.info[VERSION_KEY_INFO] = (current_user.sub, key)
+    return key
+
+
+def normalize_params(params: Any) -> str:
+    """Stable JSON for request parameters; id lists are order-insensitive."""
+    if isinstance(params, BaseModel):
+        params = params.model_dump(mode="json")
+    normalized = {
+        key: sorted(value) if key.endswith("_ids") and isinstance(value, list) else value
+        for key, value in (params or {}).items()
+    }
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+class AnalyticsCache:
+    def __init__(self, max_size: int = ANALYTICS_CACHE_SIZE, redis_url: str | None = None):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            if redis_asyncio is None:
+                logger.warning("ANALYTICS_CACHE_REDIS_URL is set but redis is not installed")
+            else:
+                self._redis = redis_asyncio.from_url(redis_url)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        db: DBSession,
+        current_user: UserPool,
+        endpoint: str,
+        params: Any,
+        response_type: Any,
+        compute: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Cached result of ``compute()``; ``response_type`` (de)serializes the shared tier."""
+        version_key = await data_version_key(db, current_user)
+        if version_key is None:
+            return await compute()
+        digest = hashlib.sha256(normalize_params(params).encode()).hexdigest()
+        key = f"analytics:{endpoint}:{version_key}:{digest}"
+
+        if key in self._entries:
+            analytics_stats.hit()
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        adapter = TypeAdapter(response_type)
+        if self._redis is not None:
+            try:
+                payload = await self._redis.get(key)
+            except Exception:
+                logger.warning("Analytics cache read failed", exc_info=True)
+                payload = None
+            if payload is not None:
+                analytics_stats.hit()
+                value = adapter.validate_json(payload)
+                self._remember(key, value)
+                return value
+
+        analytics_stats.miss()
+        value = await compute()
+        self._remember(key, value)
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, adapter.dump_json(value), ex=ANALYTICS_CACHE_TTL_SECONDS)
+            except Exception:
+                logger.warning("Analytics cache write failed", exc_info=True)
+        return value
+
+
+analytics_cache = AnalyticsCache(redis_url=ANALYTICS_CACHE_REDIS_URL)
@@ -1,10 +1,53 @@
-from src.model.models import ImportJob, ImportJobStatus
+import csv
+from typing import Iterable
+
+from src.model.models import AccountTypeEnum, ImportJob, ImportJobStatus
 from src.database.connect import DBSession
 from src.util.s3 import S3Client
 from src.util.types import UserPool
 
 
+def normalize_header(header: str | None) -> str:
+    """One CSV column name stripped, lower-cased and de-BOMed."""
+    return (header or "").replace("\ufeff", "").strip().lower()
+
+
+def normalize_headers(headers: Iterable[str]) -> frozenset[str]:
+    """Normalize CSV column names into a hashable header signature.
+
+    Column names are stripped, lower-cased and de-BOMed; empty names produced
+    by trailing delimiters are dropped so ``"A,B,"`` and ``"a, b"`` share a
+    signature.
+    """
+    return frozenset(name for name in map(normalize_header, headers) if name)
+
+
+def header_key_from_line(header_line: str) -> str:
+    """Text before the first ':' of a header line, e.g. ``OFXHEADER``."""
+    return (header_line or "").replace("\ufeff", "").split(":", 1)[0].strip().upper()
+
+
+def header_signature_from_line(header_line: str) -> frozenset[str]:
+    """Parse the first line of a CSV file into its header signature."""
+    if not header_line:
+        return frozenset()
+    row = next(csv.reader([header_line], skipinitialspace=True), [])
+    return normalize_headers(row)
+
+
 class BaseBankImporter:
+    # Normalized set of CSV column names this importer recognises. Importers
+    # that declare a signature are selected by content in ``import_manager``.
+    header_signature: frozenset[str] = frozenset()
+    # Non-CSV formats: upper-cased text before the first ':' of the first
+    # line (e.g. ``OFXHEADER`` for OFX 1.x), also matched in O(1).
+    header_keys: frozenset[str] = frozenset()
+    # Streaming importers receive an iterator of decoded text chunks as
+    # ``file_content`` instead of the whole file as one string.
+    streaming: bool = False
+    # Account types a header match is accepted for; empty accepts any.
+    account_types: frozenset[AccountTypeEnum] = frozenset()
+
     def __init__(self, file_content, db: DBSession, s3_client: S3Client, current_user: UserPool ):
         self.file_content = file_content
         self.db = db
@@ -14,7 +57,11 @@ class BaseBankImporter:
     def parse_csv_transactions(self, import_job: ImportJob):
         raise NotImplementedError
 
+    @classmethod
+    def accepts_account_type(cls, account_type: AccountTypeEnum) -> bool:
+        return not cls.account_types or account_type in cls.account_types
+
     @staticmethod
     def can_handle_file(file_name: str, file_type: str, account_type: ImportJobStatus, metadata=None) -> bool:
         """Optional: Used for format detection/auto-selection."""
-        return False
\ No newline at end of file
+        return False
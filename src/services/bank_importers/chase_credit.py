@@ -1,110 +1,58 @@
 import csv
 import io
 
-from sqlalchemy import select
 from src.model.models import ImportJob
-from src.services.bank_importers.base import BaseBankImporter
-from src.model.models import Transaction, AccountTypeEnum
-from src.util.category import get_category_id_from_row
+from src.services.bank_importers.base import BaseBankImporter, normalize_headers
+from src.services.bank_importers.pipeline import NormalizedRow, build_transactions
+from src.model.models import AccountTypeEnum
 from src.util.transaction import (
     clean_description,
-    generate_fingerprint,
     get_amount_cents,
     get_date_from_row,
     get_credit_card_internal_type
 )
-from src.services.subscription_candidate_service import transaction_is_subscription_candidate
 
 class ChaseCreditImporter(BaseBankImporter):
+    header_signature = normalize_headers(
+        (
+            "Transaction Date",
+            "Post Date",
+            "Description",
+            "Category",
+            "Type",
+            "Amount",
+            "Memo",
+        )
+    )
+
     async def parse_csv_transactions(self, import_job: ImportJob):
-        current_user = self.current_user
-        db = self.db
         # Capture scalar IDs once; later awaits/commits can expire ORM instances.
         import_job_id = import_job.uuid
         account_id = import_job.account_id
 
         csv_reader = csv.DictReader(io.StringIO(self.file_content))
-        transactions_and_fps = []
-        fingerprints = []
+        rows = []
 
         for row in csv_reader:
-            transaction_type = row.get("Type", "")
-            internal_type = get_credit_card_internal_type(transaction_type)
-            transaction_category = row.get("Category", "")
-            transaction_description = row.get("Description", "")
-            title = clean_description(transaction_description)
             amount_str = row.get("Amount", "0").strip()
-            amount_cents = get_amount_cents(amount_str)
-            date = get_date_from_row(row)
-            fingerprint = generate_fingerprint(
-                date=date, title=title, amount_cents=amount_cents
-            )
-            transaction_memo = row.get("Memo", "")
-            category_id = await get_category_id_from_row(
-                title=title,
-                category=transaction_category,
-                organization_id=current_user.organization_id,
-                db=db,
-                type=internal_type,
-            )
-            # TODO - lets find a better way to handle this
-            sub_res = await db.execute(
-                select(Transaction.subscription_id)
-                .where(
-                    Transaction.user_id == current_user.sub,
-                    Transaction.title == title,
-                    Transaction.subscription_id.is_not(None),
+            rows.append(
+                NormalizedRow(
+                    date=get_date_from_row(row),
+                    title=clean_description(row.get("Description", "")),
+                    amount_cents=get_amount_cents(amount_str),
+                    internal_type=get_credit_card_internal_type(row.get("Type", "")),
+                    category=row.get("Category", ""),
+                    memo=row.get("Memo", ""),
                 )
-                .order_by(Transaction.date.desc())
-                .limit(1)
             )
-            existing_subscription_id = sub_res.scalar_one_or_none()            
-                    
-            transaction = Transaction(
-                user_id=current_user.sub,
-                account_id=account_id,
-                import_job_id=import_job_id,
-                project_id=None,
-                amount=amount_cents,
-                title=title,
-                date=date,
-                type=internal_type,
-                fingerprint=fingerprint,
-                category_id=category_id,
-                description=transaction_memo,
-                subscription_id= existing_subscription_id
-            )
-            fingerprints.append(fingerprint)
-            transactions_and_fps.append((transaction, fingerprint))
-            
-        existing_fp_result = await db.execute(
-            select(Transaction.fingerprint).where(
-                Transaction.fingerprint.in_(fingerprints),
-                Transaction.account_id == account_id,
-            )
-        )
-        existing_fingerprints = set(existing_fp_result.scalars().all())
-        # Filter only new transactions (deduplicate)
-        unique_transactions: list[Transaction] = [
-            txn for txn, fp in transactions_and_fps if fp not in existing_fingerprints
-        ]
-        seen_transactions: list[Transaction] = []
-        for transaction in unique_transactions:
-            if transaction.subscription_id:
-                subscription_candidate = False
-            else:
-                subscription_candidate = await transaction_is_subscription_candidate(
-                    user_id=current_user.sub,
-                    title=transaction.title,
-                    amount=transaction.amount,
-                    date=transaction.date,
-                    db=db,
-                    extra_transactions=seen_transactions,
-                )        
-                transaction.subscription_candidate = subscription_candidate
-            seen_transactions.append(transaction)
 
-        return unique_transactions
+        return await build_transactions(
+            db=self.db,
+            current_user=self.current_user,
+            import_job_id=import_job_id,
+            account_id=account_id,
+            rows=rows,
+        )
         
     @staticmethod
     def can_handle_file(
@@ -1,25 +1,31 @@
-from src.services.bank_importers.base import BaseBankImporter
+from src.services.bank_importers.base import BaseBankImporter, normalize_headers
+from src.services.bank_importers.pipeline import NormalizedRow, build_transactions
 import csv
 import io
 from src.model.models import ImportJob
-from sqlalchemy import select
-from src.model.models import Transaction, AccountTypeEnum
-from src.util.category import get_category_id_from_row
+from src.model.models import AccountTypeEnum
 from src.util.transaction import (
     get_amount_cents,
     get_internal_type,
     get_date_from_row,
-    generate_fingerprint,
     clean_description,
 )
-from src.services.subscription_candidate_service import transaction_is_subscription_candidate
-from src.util.project import get_project_id_from_row
 
 
 class ChaseDebitImporter(BaseBankImporter):
+    header_signature = normalize_headers(
+        (
+            "Details",
+            "Posting Date",
+            "Description",
+            "Amount",
+            "Type",
+            "Balance",
+            "Check or Slip #",
+        )
+    )
+
     async def parse_csv_transactions(self, import_job: ImportJob):
-        current_user = self.current_user
-        db = self.db
         import_job_id = import_job.uuid
         account_id = import_job.account_id
         # Parse the CSV content
@@ -29,86 +35,28 @@ class ChaseDebitImporter(BaseBankImporter):
         if not csv_reader.fieldnames or not required_headers.issubset(set(csv_reader.fieldnames)):
             raise ValueError(f"Missing required columns. Expected: {required_headers}, Got: {set(csv_reader.fieldnames or [])}")
         
-        transactions_and_fps = []
-        fingerprints = []
+        rows = []
         for row in csv_reader:
-            type_ = row.get("Type")
-            internal_type = get_internal_type(type_, row.get("Description"))
             amount_str = row.get("Amount", "0").strip()
-            amount_cents = get_amount_cents(amount_str)
-            date = get_date_from_row(row)
-            title = clean_description(row.get("Description"))
-            fingerprint = generate_fingerprint(
-                date=date, title=title, amount_cents=amount_cents
-            )
-
-            category_id = await get_category_id_from_row(
-                title, row.get("Category"), current_user.organization_id, db
-            )
-            project_id = await get_project_id_from_row(
-                title=title, organization_id=current_user.organization_id, db=db
-            )
-            
-            # TODO - lets find a better way to handle this
-            sub_res = await db.execute(
-                select(Transaction.subscription_id)
-                .where(
-                    Transaction.user_id == current_user.sub,
-                    Transaction.title == title,
-                    Transaction.subscription_id.is_not(None),
+            rows.append(
+                NormalizedRow(
+                    date=get_date_from_row(row),
+                    title=clean_description(row.get("Description")),
+                    amount_cents=get_amount_cents(amount_str),
+                    internal_type=get_internal_type(row.get("Type"), row.get("Description")),
+                    category=row.get("Category"),
                 )
-                .order_by(Transaction.date.desc())
-                .limit(1)
             )
-            existing_subscription_id = sub_res.scalar_one_or_none()
-        
-            transaction = Transaction(
-                user_id=current_user.sub,
-                account_id=account_id,
-                import_job_id=import_job_id,
-                project_id=project_id,
-                amount=amount_cents,
-                title=title,
-                date=date,
-                type=internal_type,
-                fingerprint=fingerprint,
-                category_id=category_id,
-                subscription_id= existing_subscription_id
-            )
-            fingerprints.append(fingerprint)
-            transactions_and_fps.append((transaction, fingerprint))
 
-            # Query for all fingerprints at once
-        existing_fp_result = await db.execute(
-            select(Transaction.fingerprint).where(
-                Transaction.fingerprint.in_(fingerprints),
-                Transaction.account_id == account_id,
-            )
+        return await build_transactions(
+            db=self.db,
+            current_user=self.current_user,
+            import_job_id=import_job_id,
+            account_id=account_id,
+            rows=rows,
+            resolve_projects=True,
+            typed_categories=False,
         )
-        existing_fingerprints = set(existing_fp_result.scalars().all())
-
-        # Filter only new transactions (deduplicate)
-        unique_transactions: list[Transaction] = [
-            txn for txn, fp in transactions_and_fps if fp not in existing_fingerprints
-        ]
-        
-        seen_transactions: list[Transaction] = []
-        for transaction in unique_transactions:
-            if transaction.subscription_id:
-                subscription_candidate = False
-            else:
-                subscription_candidate = await transaction_is_subscription_candidate(
-                    user_id=current_user.sub,
-                    title=transaction.title,
-                    amount=transaction.amount,
-                    date=transaction.date,
-                    db=db,
-                    extra_transactions=seen_transactions,
-                )        
-                transaction.subscription_candidate = subscription_candidate
-            seen_transactions.append(transaction)
-
-        return unique_transactions
 
     @staticmethod
     def can_handle_file(
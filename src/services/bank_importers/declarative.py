@@ -0,0 +1,269 @@
+"""Spec-driven CSV importers.
+
+A bank spec is a JSON (or YAML, when PyYAML is installed) document describing
+the CSV columns, date formats, sign convention and type mapping of one export
+format. Each spec is compiled once into a ``CompiledBankSpec`` and wrapped in a
+``DeclarativeCsvImporter`` subclass registered by ``import_manager``, so adding
+a bank is a matter of dropping a file into ``specs/``.
+
+Example::
+
+    {
+        "name": "capital_one_credit",
+        "account_types": ["CREDIT_CARD"],
+        "header": ["Transaction Date", "Posted Date", "Card No.",
+                   "Description", "Category", "Debit", "Credit"],
+        "columns": {
+            "date": ["Transaction Date"],
+            "description": ["Description"],
+            "category": ["Category"],
+            "debit": ["Debit"],
+            "credit": ["Credit"]
+        },
+        "date_formats": ["%Y-%m-%d"],
+        "sign_convention": "split",
+        "type_fallback": "sign",
+        "sign_types": {"negative": "expense", "positive": "payment"}
+    }
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from src.model.models import AccountTypeEnum, ImportJob
+from src.services.bank_importers.base import (
+    BaseBankImporter,
+    normalize_header,
+    normalize_headers,
+)
+from src.services.bank_importers.pipeline import NormalizedRow, build_transactions
+from src.util.transaction import (
+    clean_description,
+    get_amount_cents,
+    get_internal_type,
+    parse_date,
+)
+
+SPEC_DIR = Path(__file__).parent / "specs"
+
+SIGN_CONVENTIONS = {"signed", "inverted", "split"}
+TYPE_FALLBACKS = {"keywords", "sign", "unknown"}
+COLUMN_FIELDS = {"date", "description", "amount", "debit", "credit", "type", "category", "memo"}
+
+
+@dataclass(frozen=True)
+class BankSpec:
+    name: str
+    header: tuple[str, ...]
+    columns: dict[str, tuple[str, ...]]
+    date_formats: tuple[str, ...]
+    account_types: frozenset[AccountTypeEnum] = frozenset()
+    sign_convention: str = "signed"
+    type_mapping: dict[str, str] = field(default_factory=dict)
+    type_fallback: str = "unknown"
+    sign_types: dict[str, str] = field(default_factory=dict)
+    resolve_projects: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BankSpec":
+        name = data.get("name")
+        if not name:
+            raise ValueError("Bank spec is missing 'name'")
+
+        columns = {
+            key: tuple(aliases) if isinstance(aliases, list) else (aliases,)
+            for key, aliases in (data.get("columns") or {}).items()
+        }
+        unknown = set(columns) - COLUMN_FIELDS
+        if unknown:
+            raise ValueError(f"Bank spec {name}: unknown columns {sorted(unknown)}")
+        sign_convention = data.get("sign_convention", "signed")
+        if sign_convention not in SIGN_CONVENTIONS:
+            raise ValueError(f"Bank spec {name}: unknown sign_convention {sign_convention}")
+        required = {"date", "description"} | (
+            {"debit", "credit"} if sign_convention == "split" else {"amount"}
+        )
+        missing = required - set(columns)
+        if missing:
+            raise ValueError(f"Bank spec {name}: missing columns {sorted(missing)}")
+        type_fallback = data.get("type_fallback", "unknown")
+        if type_fallback not in TYPE_FALLBACKS:
+            raise ValueError(f"Bank spec {name}: unknown type_fallback {type_fallback}")
+        if not data.get("header"):
+            raise ValueError(f"Bank spec {name}: 'header' is required for detection")
+        if not data.get("date_formats"):
+            raise ValueError(f"Bank spec {name}: 'date_formats' is required")
+
+        return cls(
+            name=name,
+            header=tuple(data["header"]),
+            columns=columns,
+            date_formats=tuple(data["date_formats"]),
+            account_types=frozenset(
+                AccountTypeEnum(value) for value in data.get("account_types", [])
+            ),
+            sign_convention=sign_convention,
+            type_mapping=dict(data.get("type_mapping") or {}),
+            type_fallback=type_fallback,
+            sign_types=dict(data.get("sign_types") or {}),
+            resolve_projects=bool(data.get("resolve_projects", False)),
+        )
+
+
+RowNormalizer = Callable[[list[str]], NormalizedRow]
+
+
+class CompiledBankSpec:
+    """A bank spec turned into plain callables for the per-row hot path."""
+
+    def __init__(self, spec: BankSpec):
+        self.spec = spec
+        self.header_signature = normalize_headers(spec.header)
+        self._parse_date = self._compile_date_parser(spec.date_formats)
+        self._amount = self._compile_amount(spec.sign_convention)
+        self._type = self._compile_type(spec)
+
+    @staticmethod
+    def _compile_date_parser(formats: tuple[str, ...]) -> Callable[[str], datetime]:
+        def parse(value: str) -> datetime:
+            return parse_date(value.strip(), formats).replace(tzinfo=timezone.utc)
+
+        return parse
+
+    @staticmethod
+    def _compile_amount(sign_convention: str) -> Callable[[str, str, str], int]:
+        def cents(value: str) -> int:
+            value = (value or "").strip()
+            return get_amount_cents(value) if value else 0
+
+        if sign_convention == "inverted":
+            return lambda amount, debit, credit: -cents(amount)
+        if sign_convention == "split":
+            return lambda amount, debit, credit: cents(credit) - abs(cents(debit))
+        return lambda amount, debit, credit: cents(amount)
+
+    @staticmethod
+    def _compile_type(spec: BankSpec) -> Callable[[str, str, int], str]:
+        mapping = spec.type_mapping
+        fallback = spec.type_fallback
+        negative = spec.sign_types.get("negative", "expense")
+        positive = spec.sign_types.get("positive", "income")
+
+        def internal_type(raw_type: str, description: str, amount_cents: int) -> str:
+            mapped = mapping.get(raw_type)
+            if mapped:
+                return mapped
+            if fallback == "keywords":
+                return get_internal_type(raw_type, description)
+            if fallback == "sign" and amount_cents:
+                return negative if amount_cents < 0 else positive
+            return "unknown"
+
+        return internal_type
+
+    def bind(self, fieldnames: list[str]) -> RowNormalizer:
+        """Resolve column aliases against a file's header into a row normalizer.
+
+        Names are matched like the header signature used for detection, so a
+        BOM or a change of case does not hide a column.
+        """
+        positions = {normalize_header(name): index for index, name in enumerate(fieldnames or [])}
+
+        def position(column: str) -> int | None:
+            for alias in map(normalize_header, self.spec.columns.get(column, ())):
+                if alias in positions:
+                    return positions[alias]
+            return None
+
+        indexes = {column: position(column) for column in COLUMN_FIELDS}
+        for column in ("date", "description"):
+            if indexes[column] is None:
+                raise ValueError(
+                    f"Missing required column for {self.spec.name}: "
+                    f"{' / '.join(self.spec.columns[column])}"
+                )
+
+        def getter(column: str) -> Callable[[list[str]], str]:
+            index = indexes[column]
+            if index is None:
+                return lambda row: ""
+            return lambda row: row[index] if index < len(row) else ""
+
+        date_of, description_of = getter("date"), getter("description")
+        amount_of, debit_of, credit_of = getter("amount"), getter("debit"), getter("credit")
+        type_of, category_of, memo_of = getter("type"), getter("category"), getter("memo")
+        parse_date_value, amount, internal_type = self._parse_date, self._amount, self._type
+
+        def normalize(row: list[str]) -> NormalizedRow:
+            description = description_of(row)
+            amount_cents = amount(amount_of(row), debit_of(row), credit_of(row))
+            return NormalizedRow(
+                date=parse_date_value(date_of(row)),
+                title=clean_description(description),
+                amount_cents=amount_cents,
+                internal_type=internal_type(type_of(row).strip(), description, amount_cents),
+                category=category_of(row).strip() or None,
+                memo=memo_of(row).strip() or None,
+            )
+
+        return normalize
+
+
+class DeclarativeCsvImporter(BaseBankImporter):
+    spec: CompiledBankSpec
+
+    async def parse_csv_transactions(self, import_job: ImportJob):
+        import_job_id = import_job.uuid
+        account_id = import_job.account_id
+
+        csv_reader = csv.reader(io.StringIO(self.file_content))
+        normalize = self.spec.bind(next(csv_reader, []))
+        rows = [normalize(row) for row in csv_reader if any(cell.strip() for cell in row)]
+
+        return await build_transactions(
+            db=self.db,
+            current_user=self.current_user,
+            import_job_id=import_job_id,
+            account_id=account_id,
+            rows=rows,
+            resolve_projects=self.spec.spec.resolve_projects,
+        )
+
+
+def importer_for_spec(spec: BankSpec) -> type[DeclarativeCsvImporter]:
+    compiled = CompiledBankSpec(spec)
+    class_name = "".join(part.title() for part in spec.name.split("_")) + "Importer"
+    return type(
+        class_name,
+        (DeclarativeCsvImporter,),
+        {
+            "spec": compiled,
+            "header_signature": compiled.header_signature,
+            "account_types": spec.account_types,
+        },
+    )
+
+
+def _read_spec_file(path: Path) -> dict:
+    if path.suffix in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError as e:
+            raise ValueError(f"PyYAML is required to load bank spec {path.name}") from e
+        return yaml.safe_load(path.read_text())
+    return json.loads(path.read_text())
+
+
+def load_spec_importers(directory: Path = SPEC_DIR) -> list[type[DeclarativeCsvImporter]]:
+    """Compile every bank spec in ``directory`` into an importer class."""
+    if not directory.is_dir():
+        return []
+    paths = sorted(
+        path for path in directory.iterdir() if path.suffix in {".json", ".yaml", ".yml"}
+    )
+    return [importer_for_spec(BankSpec.from_dict(_read_spec_file(path))) for path in paths]
@@ -0,0 +1,293 @@
+"""Streaming OFX/QFX importer.
+
+OFX 2.x files are XML and are parsed with an incremental SAX parser; OFX 1.x
+files are SGML with unclosed leaf tags and go through a small tokenizer. Both
+paths consume the upload chunk by chunk and only keep the current
+``<STMTTRN>`` aggregate in memory, yielding one ``dict`` of leaf values per
+transaction. The bank's ``FITID`` becomes the dedup fingerprint.
+
+Rows reach ``build_transactions`` in batches of ``OFX_BATCH_SIZE`` and each
+batch is flushed before the next is parsed, so parsing and the dedup and
+lookup queries work on one batch at a time. The import still commits as one
+database transaction: the new ``Transaction`` objects and the set of FITIDs
+seen so far grow with the file until then.
+"""
+
+import codecs
+import hashlib
+import itertools
+import re
+import xml.sax
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+from src.model.models import AccountTypeEnum, ImportJob, Transaction
+from src.services.bank_importers.base import BaseBankImporter
+from src.services.bank_importers.pipeline import NormalizedRow, build_transactions
+from src.util.transaction import clean_description, get_amount_cents
+
+OFX_FILE_TYPES = {
+    "ofx",
+    "qfx",
+    "application/ofx",
+    "application/x-ofx",
+    "application/vnd.intu.qfx",
+    "application/x-qfx",
+}
+OFX_EXTENSIONS = (".ofx", ".qfx")
+CHUNK_SIZE = 64 * 1024
+OFX_BATCH_SIZE = 1000
+FINGERPRINT_PREFIX = "fitid:"
+# Transaction.fingerprint is String(64)
+MAX_FITID_LENGTH = 64 - len(FINGERPRINT_PREFIX)
+
+OFX_TRANSACTION_TYPES = {
+    "CREDIT": "income",
+    "DEP": "income",
+    "DIRECTDEP": "income",
+    "INT": "income",
+    "DIV": "income",
+    "DEBIT": "expense",
+    "POS": "expense",
+    "ATM": "expense",
+    "CHECK": "expense",
+    "CASH": "expense",
+    "FEE": "expense",
+    "SRVCHG": "expense",
+    "DIRECTDEBIT": "expense",
+    "REPEATPMT": "expense",
+    "PAYMENT": "expense",
+    "XFER": "transfer",
+}
+
+_SGML_TOKEN_RE = re.compile(r"<(/?)([A-Za-z0-9._]+)>([^<]*)")
+
+
+class _StatementTransactionHandler(xml.sax.ContentHandler):
+    """Collects the leaf values of each ``STMTTRN`` element."""
+
+    def __init__(self):
+        super().__init__()
+        self.ready: list[dict[str, str]] = []
+        self.credit_card = False
+        self._current: dict[str, str] | None = None
+        self._text: list[str] = []
+
+    def startElement(self, name, attrs):
+        name = name.upper()
+        if name == "CCSTMTRS":
+            self.credit_card = True
+        elif name == "STMTTRN":
+            self._current = {}
+        self._text = []
+
+    def characters(self, content):
+        if self._current is not None:
+            self._text.append(content)
+
+    def endElement(self, name):
+        name = name.upper()
+        if self._current is None:
+            return
+        if name == "STMTTRN":
+            self.ready.append(self._current)
+            self._current = None
+        else:
+            value = "".join(self._text).strip()
+            if value:
+                self._current.setdefault(name, value)
+        self._text = []
+
+
+def _iter_xml_transactions(chunks: Iterable[str], state: dict) -> Iterator[dict[str, str]]:
+    handler = _StatementTransactionHandler()
+    parser = xml.sax.make_parser()
+    parser.setFeature(xml.sax.handler.feature_external_ges, False)
+    parser.setContentHandler(handler)
+    for chunk in chunks:
+        parser.feed(chunk)
+        state["credit_card"] = handler.credit_card
+        yield from handler.ready
+        handler.ready.clear()
+    parser.close()
+    state["credit_card"] = handler.credit_card
+    yield from handler.ready
+
+
+def _iter_sgml_tokens(chunks: Iterable[str]) -> Iterator[tuple[str, str, str]]:
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        # Text runs until the next tag, so only tokens followed by a '<' are complete.
+        complete = buffer.rfind("<")
+        if complete <= 0:
+            continue
+        yield from _SGML_TOKEN_RE.findall(buffer, 0, complete)
+        buffer = buffer[complete:]
+    yield from _SGML_TOKEN_RE.findall(buffer)
+
+
+def _iter_sgml_transactions(chunks: Iterable[str], state: dict) -> Iterator[dict[str, str]]:
+    current: dict[str, str] | None = None
+    for closing, name, text in _iter_sgml_tokens(chunks):
+        name = name.upper()
+        if name == "CCSTMTRS":
+            state["credit_card"] = True
+        elif name == "STMTTRN":
+            if closing and current is not None:
+                yield current
+            current = None if closing else {}
+        elif current is not None and not closing:
+            value = text.strip()
+            if value:
+                current.setdefault(name, value)
+
+
+def iter_ofx_transactions(
+    chunks: Iterable[str], state: dict | None = None
+) -> Iterator[dict[str, str]]:
+    """Yield the leaf values of every ``STMTTRN`` in an OFX/QFX document.
+
+    ``state["credit_card"]`` is set once a credit card statement is seen.
+    """
+    state = state if state is not None else {}
+    chunks = iter(chunks)
+    head = ""
+    for chunk in chunks:
+        head += chunk
+        if "<" in head:
+            break
+
+    start = head.find("<")
+    if start < 0:
+        return
+    body = _chain(head[start:], chunks)
+    if head[start:].startswith("<?"):
+        yield from _iter_xml_transactions(body, state)
+    else:
+        yield from _iter_sgml_transactions(body, state)
+
+
+def _chain(first: str, rest: Iterator[str]) -> Iterator[str]:
+    yield first
+    yield from rest
+
+
+def iter_text_chunks(head: bytes, stream, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Decode ``head`` followed by the rest of ``stream`` without buffering it all."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    if head:
+        yield decoder.decode(head)
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield decoder.decode(chunk)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def parse_ofx_date(value: str) -> datetime:
+    """``YYYYMMDD[HHMMSS[.XXX]][[-5:EST]]`` -> midnight UTC of the posting day."""
+    return datetime.strptime(value.strip()[:8], "%Y%m%d").replace(tzinfo=timezone.utc)
+
+
+def parse_ofx_amount(value: str) -> int:
+    value = value.strip()
+    if "," in value and "." not in value:
+        value = value.replace(",", ".")
+    return get_amount_cents(value)
+
+
+def fitid_fingerprint(fitid: str) -> str:
+    fitid = fitid.strip()
+    if len(fitid) > MAX_FITID_LENGTH:
+        fitid = hashlib.sha256(fitid.encode()).hexdigest()[:MAX_FITID_LENGTH]
+    return f"{FINGERPRINT_PREFIX}{fitid}"
+
+
+def ofx_internal_type(trntype: str, name: str, amount_cents: int, credit_card: bool) -> str:
+    trntype = (trntype or "").upper()
+    if credit_card:
+        if amount_cents < 0:
+            return "expense"
+        if trntype == "PAYMENT" or "payment" in (name or "").lower():
+            return "payment"
+        return "refund"
+    internal_type = OFX_TRANSACTION_TYPES.get(trntype)
+    if internal_type:
+        return internal_type
+    if amount_cents:
+        return "expense" if amount_cents < 0 else "income"
+    return "unknown"
+
+
+def normalize_ofx_transactions(
+    transactions: Iterable[dict[str, str]], state: dict
+) -> Iterator[NormalizedRow]:
+    seen_fitids: set[str] = set()
+    for values in transactions:
+        fitid = values.get("FITID")
+        if fitid:
+            if fitid in seen_fitids:
+                continue
+            seen_fitids.add(fitid)
+
+        name = values.get("NAME") or values.get("PAYEE") or values.get("MEMO") or ""
+        amount_cents = parse_ofx_amount(values.get("TRNAMT", "0"))
+        yield NormalizedRow(
+            date=parse_ofx_date(values.get("DTPOSTED") or values["DTUSER"]),
+            title=clean_description(name),
+            amount_cents=amount_cents,
+            internal_type=ofx_internal_type(
+                values.get("TRNTYPE"), name, amount_cents, state.get("credit_card", False)
+            ),
+            memo=values.get("MEMO"),
+            fingerprint=fitid_fingerprint(fitid) if fitid else None,
+        )
+
+
+def batched(rows: Iterable[NormalizedRow], size: int) -> Iterator[list[NormalizedRow]]:
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, size)):
+        yield batch
+
+
+class OfxImporter(BaseBankImporter):
+    # Reads ``file_content`` as an iterable of text chunks (a plain string works too).
+    streaming = True
+    header_keys = frozenset({"OFXHEADER"})
+
+    async def parse_csv_transactions(self, import_job: ImportJob):
+        import_job_id = import_job.uuid
+        account_id = import_job.account_id
+
+        chunks = (
+            [self.file_content] if isinstance(self.file_content, str) else self.file_content
+        )
+        state: dict = {}
+        rows = normalize_ofx_transactions(iter_ofx_transactions(chunks, state), state)
+
+        transactions: list[Transaction] = []
+        for batch in batched(rows, OFX_BATCH_SIZE):
+            new_transactions = await build_transactions(
+                db=self.db,
+                current_user=self.current_user,
+                import_job_id=import_job_id,
+                account_id=account_id,
+                rows=batch,
+            )
+            # later batches dedupe against these rows in the database
+            self.db.add_all(new_transactions)
+            await self.db.flush()
+            transactions.extend(new_transactions)
+        return transactions
+
+    @staticmethod
+    def can_handle_file(
+        file_name: str, file_type: str, account_type: AccountTypeEnum
+    ) -> bool:
+        if (file_type or "").strip().lower() in OFX_FILE_TYPES:
+            return True
+        return (file_name or "").strip().lower().endswith(OFX_EXTENSIONS)
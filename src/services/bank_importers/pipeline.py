@@ -0,0 +1,245 @@
+"""Shared batched path from normalized bank rows to new ``Transaction`` objects.
+
+Every importer parses its own file format into ``NormalizedRow`` values and
+hands them to ``build_transactions``, which deduplicates against the account,
+applies the organization's categorization rules and resolves categories,
+projects, linked subscriptions and subscription candidates with a fixed number
+of queries per import rather than per row.
+
+Inside ``track_import`` the stages of an import (parse, dedupe, resolve and,
+marked by the caller, insert) are timed for ``/health/metrics``.
+"""
+
+import contextlib
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from uuid import UUID
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import select
+
+from src.database.connect import DBSession
+from src.model.models import Transaction
+from src.services.categorization_rules import get_rule_matcher
+from src.services.recurring_series import flag_subscription_candidates
+from src.util.category import resolve_category_ids
+from src.util.merchant import merchant_key
+from src.util.metrics import registry
+from src.util.project import resolve_project_ids
+from src.util.transaction import generate_fingerprint
+from src.util.types import UserPool
+
+
+import_stage_seconds = Histogram(
+    "import_stage_seconds",
+    "Time per import job stage.",
+    ["importer", "stage"],
+    registry=registry,
+)
+import_rows = Counter(
+    "import_rows", "Rows read from imported files.", ["importer"], registry=registry
+)
+import_duration_seconds = Histogram(
+    "import_duration_seconds",
+    "Time from the start of parsing to the committed insert.",
+    ["importer"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+    registry=registry,
+)
+import_rows_per_second = Gauge(
+    "import_rows_per_second",
+    "Throughput of the latest completed import job.",
+    ["importer"],
+    registry=registry,
+)
+
+
+@dataclass
+class ImportRun:
+    """Stage timings of one import job."""
+
+    started: float = field(default_factory=time.perf_counter)
+    rows: int = 0
+    stages: dict[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._last_mark = self.started
+
+    def mark(self, stage: str) -> None:
+        """Charge the time since the previous mark to ``stage``."""
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last_mark
+        self._last_mark = now
+
+    def record(self, importer: str) -> None:
+        """Export a completed run."""
+        elapsed = self._last_mark - self.started
+        for stage, seconds in self.stages.items():
+            import_stage_seconds.labels(importer=importer, stage=stage).observe(seconds)
+        import_rows.labels(importer=importer).inc(self.rows)
+        import_duration_seconds.labels(importer=importer).observe(elapsed)
+        if elapsed > 0:
+            import_rows_per_second.labels(importer=importer).set(self.rows / elapsed)
+
+
+current_import: ContextVar[ImportRun | None] = ContextVar("current_import", default=None)
+
+
+@contextlib.contextmanager
+def track_import():
+    run = ImportRun()
+    token = current_import.set(run)
+    try:
+        yield run
+    finally:
+        current_import.reset(token)
+
+
+@dataclass(frozen=True)
+class NormalizedRow:
+    date: datetime
+    title: str
+    amount_cents: int
+    internal_type: str
+    category: str | None = None
+    memo: str | None = None
+    # Overrides the hashed (date, title, amount) fingerprint when the bank
+    # provides its own stable transaction id.
+    fingerprint: str | None = None
+
+
+async def get_existing_subscription_ids(
+    db: DBSession, user_id: UUID, titles: set[str]
+) -> dict[str, UUID]:
+    """Most recent linked subscription for each title, in one query."""
+    if not titles:
+        return {}
+    rows = await db.execute(
+        select(Transaction.title, Transaction.subscription_id)
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.title.in_(titles),
+            Transaction.subscription_id.is_not(None),
+        )
+        .distinct(Transaction.title)
+        .order_by(Transaction.title, Transaction.date.desc())
+    )
+    return dict(rows.all())
+
+
+async def build_transactions(
+    db: DBSession,
+    current_user: UserPool,
+    import_job_id: UUID,
+    account_id: UUID,
+    rows: list[NormalizedRow],
+    resolve_projects: bool = False,
+    typed_categories: bool = True,
+) -> list[Transaction]:
+    """Turn normalized rows into new, deduplicated ``Transaction`` objects.
+
+    Args:
+        db: The database session.
+        current_user: The importing user.
+        import_job_id: Import job the transactions belong to.
+        account_id: Account the file was imported into; fingerprints are
+            deduplicated per account.
+        rows: Parsed rows in file order.
+        resolve_projects: Match projects by title (checking accounts only).
+        typed_categories: Give categories created for a row the row's type;
+            otherwise they are created as ``CUSTOM``.
+
+    Returns:
+        The transactions that are not already stored for the account.
+    """
+    # importers parse the whole file before calling in
+    run = current_import.get() or ImportRun()
+    run.mark("parse")
+    run.rows += len(rows)
+    if not rows:
+        return []
+    fingerprints = [
+        row.fingerprint
+        or generate_fingerprint(
+            date=row.date, title=row.title, amount_cents=row.amount_cents
+        )
+        for row in rows
+    ]
+
+    existing_fp_result = await db.execute(
+        select(Transaction.fingerprint).where(
+            Transaction.fingerprint.in_(set(fingerprints)),
+            Transaction.account_id == account_id,
+        )
+    )
+    existing_fingerprints = set(existing_fp_result.scalars().all())
+    new_rows = [
+        (row, fp) for row, fp in zip(rows, fingerprints) if fp not in existing_fingerprints
+    ]
+    run.mark("dedupe")
+    if not new_rows:
+        return []
+
+    organization_id = current_user.organization_id
+    # Organization rules override the bank's type and category.
+    rules = await get_rule_matcher(db=db, organization_id=organization_id)
+    rule_category_ids: list[UUID | None] = [None] * len(new_rows)
+    if rules:
+        for index, (row, fingerprint) in enumerate(new_rows):
+            outcome = rules.match(row.title)
+            if outcome is None:
+                continue
+            if outcome.internal_type:
+                new_rows[index] = (replace(row, internal_type=outcome.internal_type), fingerprint)
+            rule_category_ids[index] = outcome.category_id
+
+    def category_key(row: NormalizedRow) -> tuple[str, str | None, str | None]:
+        return row.title, row.category, row.internal_type if typed_categories else None
+
+    titles = {row.title for row, _ in new_rows}
+    category_ids = await resolve_category_ids(
+        keys=(
+            category_key(row)
+            for (row, _), rule_category_id in zip(new_rows, rule_category_ids)
+            if rule_category_id is None
+        ),
+        organization_id=organization_id,
+        db=db,
+    )
+    project_ids = (
+        await resolve_project_ids(titles=titles, organization_id=organization_id, db=db)
+        if resolve_projects
+        else {}
+    )
+    subscription_ids = await get_existing_subscription_ids(
+        db=db, user_id=current_user.sub, titles=titles
+    )
+
+    transactions = [
+        Transaction(
+            user_id=current_user.sub,
+            account_id=account_id,
+            import_job_id=import_job_id,
+            project_id=project_ids.get(row.title),
+            amount=row.amount_cents,
+            title=row.title,
+            merchant_key=merchant_key(row.title),
+            date=row.date,
+            type=row.internal_type,
+            fingerprint=fingerprint,
+            category_id=rule_category_id or category_ids[category_key(row)],
+            description=row.memo,
+            subscription_id=subscription_ids.get(row.title),
+        )
+        for (row, fingerprint), rule_category_id in zip(new_rows, rule_category_ids)
+    ]
+    await flag_subscription_candidates(
+        db=db,
+        organization_id=organization_id,
+        user_id=current_user.sub,
+        transactions=transactions,
+    )
+    run.mark("resolve")
+    return transactions
@@ -0,0 +1,186 @@
+"""Projected subscription charges for a date window.
+
+Billing dates are computed in closed form from the anchor date (next billing
+date, else start date) and the number of elapsed periods, for all
+subscriptions at once with NumPy ``datetime64`` arithmetic: monthly cycles
+are ``anchor month + k * step`` with the anchor's day clamped to the month
+length, weekly cycles are ``anchor + 7k`` days. The router caches results in
+the shared analytics cache, keyed on the organization's data version and the
+UTC day. NumPy is imported on first use to keep it out of application
+startup.
+"""
+
+from __future__ import annotations
+
+import functools
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Sequence
+
+from sqlalchemy import or_
+
+from src.database.connect import DBSession
+from src.model.models import Subscription
+from src.schemas.subscription import (
+    SubscriptionUpcomingChargeResponse,
+    SubscriptionUpcomingResponse,
+)
+from src.services.query_service import QueryService
+from src.util.types import UserPool
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# billing_frequency -> (months per cycle, days per cycle)
+BILLING_CYCLES = {
+    "weekly": (0, 7),
+    "monthly": (1, 0),
+    "quarterly": (3, 0),
+    "yearly": (12, 0),
+}
+
+
+@functools.cache
+def _numpy():
+    import numpy
+
+    return numpy
+
+
+def _month_dates(months: np.ndarray, day_offsets: np.ndarray) -> np.ndarray:
+    """``day_offsets`` days into each month, clamped to its last day."""
+    np = _numpy()
+    first = months.astype("datetime64[D]")
+    last = (months + 1).astype("datetime64[D]") - 1
+    return np.minimum(first + day_offsets, last)
+
+
+def project_billing_dates(
+    anchors: Sequence[date],
+    frequencies: Sequence[str],
+    window_start: date,
+    window_end: date,
+    ends: Sequence[date | None] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Every billing date inside ``[window_start, window_end]``.
+
+    Args:
+        anchors: First known billing date per subscription.
+        frequencies: ``billing_frequency`` per subscription (see ``BILLING_CYCLES``).
+        window_start: First day of the window (inclusive).
+        window_end: Last day of the window (inclusive).
+        ends: Optional last billable day per subscription.
+
+    Returns:
+        ``(subscription_index, billing_date)`` arrays ordered by subscription
+        and date; indexes refer to positions in ``anchors``.
+    """
+    np = _numpy()
+    count = len(anchors)
+    if not count:
+        return np.array([], dtype=np.int64), np.array([], dtype="datetime64[D]")
+    anchor = np.array(anchors, dtype="datetime64[D]")
+    steps = np.array([BILLING_CYCLES[frequency] for frequency in frequencies], dtype=np.int64)
+    step_months, step_days = steps[:, 0], steps[:, 1]
+    start = np.full(count, np.datetime64(window_start, "D"))
+    end = np.full(count, np.datetime64(window_end, "D"))
+    if ends is not None:
+        sub_end = np.array(
+            [value if value is not None else window_end for value in ends],
+            dtype="datetime64[D]",
+        )
+        end = np.minimum(end, sub_end)
+    start = np.maximum(start, anchor)
+
+    weekly = step_days > 0
+    monthly = ~weekly
+    first = np.zeros(count, dtype=np.int64)
+    last = np.full(count, -1, dtype=np.int64)
+
+    # weekly: k-th charge is anchor + k * step_days
+    if weekly.any():
+        offset_start = (start[weekly] - anchor[weekly]).astype(np.int64)
+        offset_end = (end[weekly] - anchor[weekly]).astype(np.int64)
+        step = step_days[weekly]
+        first[weekly] = -(-offset_start // step)
+        last[weekly] = np.where(offset_end >= 0, offset_end // step, -1)
+
+    # monthly: k-th charge is the anchor's day in month anchor_month + k * step_months
+    anchor_month = anchor.astype("datetime64[M]")
+    day_offset = (anchor - anchor_month.astype("datetime64[D]")).astype(np.int64)
+    if monthly.any():
+        a_month = anchor_month[monthly]
+        offset = day_offset[monthly]
+        step = step_months[monthly]
+        k_start = (start[monthly].astype("datetime64[M]") - a_month).astype(np.int64) // step
+        k_start += _month_dates(a_month + k_start * step, offset) < start[monthly]
+        k_end = (end[monthly].astype("datetime64[M]") - a_month).astype(np.int64) // step
+        k_end -= _month_dates(a_month + k_end * step, offset) > end[monthly]
+        first[monthly] = k_start
+        last[monthly] = k_end
+
+    counts = np.maximum(last - first + 1, 0)
+    index = np.repeat(np.arange(count), counts)
+    starts = np.cumsum(counts) - counts
+    k = first[index] + np.arange(index.size) - starts[index]
+
+    dates = np.where(
+        weekly[index],
+        anchor[index] + k * step_days[index],
+        _month_dates(anchor_month[index] + k * step_months[index], day_offset[index]),
+    )
+    return index, dates
+
+
+async def build_upcoming_charges(
+    db: DBSession,
+    current_user: UserPool,
+    query_service: QueryService,
+    from_date: date,
+    to_date: date,
+) -> SubscriptionUpcomingResponse:
+    """Projected charges of the organization's active subscriptions."""
+    np = _numpy()
+    stmt = query_service.org_filtered_query(
+        model=Subscription, current_user=current_user
+    ).where(
+        Subscription.billing_frequency.in_(BILLING_CYCLES),
+        or_(Subscription.status.is_(None), Subscription.status == "active"),
+        or_(Subscription.next_billing_date.is_not(None), Subscription.start_date.is_not(None)),
+    )
+    subscriptions = (await db.execute(stmt)).scalars().all()
+
+    def utc_day(value: datetime | None) -> date | None:
+        return value.astimezone(timezone.utc).date() if value is not None else None
+
+    ends = [
+        min(
+            (d for d in (utc_day(sub.end_date), utc_day(sub.cancellation_date)) if d),
+            default=None,
+        )
+        for sub in subscriptions
+    ]
+    index, dates = project_billing_dates(
+        anchors=[utc_day(sub.next_billing_date or sub.start_date) for sub in subscriptions],
+        frequencies=[sub.billing_frequency for sub in subscriptions],
+        window_start=from_date,
+        window_end=to_date,
+        ends=ends,
+    )
+    order = np.lexsort((index, dates))
+    charges = [
+        SubscriptionUpcomingChargeResponse(
+            subscription_id=subscriptions[i].uuid,
+            name=subscriptions[i].name,
+            amount=subscriptions[i].amount,
+            currency=subscriptions[i].currency,
+            billing_frequency=subscriptions[i].billing_frequency,
+            billing_date=billing_date,
+        )
+        for i, billing_date in zip(index[order].tolist(), dates[order].tolist())
+    ]
+    return SubscriptionUpcomingResponse(
+        from_date=from_date,
+        to_date=to_date,
+        total_amount_cents=sum(charge.amount for charge in charges),
+        charges=charges,
+    )
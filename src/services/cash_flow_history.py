@@ -2,16 +2,17 @@ from datetime import date, datetime, time, timedelta, timezone
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import HTTPException
-from sqlalchemy import case, cast, func, literal, select
-from sqlalchemy.dialects.postgresql import INTERVAL
+from sqlalchemy import DateTime, case, cast, func, select
 
 from src.database.connect import DBSession
-from src.model.models import Organization, Transaction, User
+from src.model.models import DailyRollup, Organization, Transaction, User
 from src.schemas.transaction import (
     CashFlowHistoryRequest,
     CashFlowHistoryResponse,
     CashFlowPeriodResponse,
+    CashFlowSeriesResponse,
 )
+from src.services.daily_rollup import rollup_timezone_name
 from src.services.query_service import QueryService
 from src.util.types import UserPool
 
@@ -26,22 +27,32 @@ def _valid_zone(name: str | None) -> tuple[ZoneInfo, str] | None:
     return zone, name
 
 
-async def get_effective_timezone(
+async def get_timezones(
     db: DBSession, current_user: UserPool
-) -> tuple[ZoneInfo, str]:
+) -> tuple[ZoneInfo, str, str]:
+    """Effective zone and name, plus the zone name the daily rollup uses."""
     user = await db.scalar(select(User).where(User.uuid == current_user.sub))
     organization = None
     if user and user.organization_id:
         organization = await db.scalar(
             select(Organization).where(Organization.uuid == user.organization_id)
         )
+    organization_timezone = getattr(organization, "timezone", None)
+    rollup_timezone = rollup_timezone_name(organization_timezone)
     for candidate in (
         _valid_zone(getattr(user, "timezone", None)),
-        _valid_zone(getattr(organization, "timezone", None)),
+        _valid_zone(organization_timezone),
     ):
         if candidate:
-            return candidate
-    return ZoneInfo("UTC"), "UTC"
+            return *candidate, rollup_timezone
+    return ZoneInfo("UTC"), "UTC", rollup_timezone
+
+
+async def get_effective_timezone(
+    db: DBSession, current_user: UserPool
+) -> tuple[ZoneInfo, str]:
+    zone, timezone_name, _ = await get_timezones(db, current_user)
+    return zone, timezone_name
 
 
 def _bucket_end(start: datetime, granularity: str) -> datetime:
@@ -59,6 +70,47 @@ def _bucket_end(start: datetime, granularity: str) -> datetime:
     return datetime.combine(next_date, time.min, tzinfo=start.tzinfo)
 
 
+def _bucket_starts(from_date: date, to_date: date, granularity: str) -> list[date]:
+    """Local start day of every bucket overlapping ``[from_date, to_date]``."""
+    if granularity == "day":
+        first, last = from_date, to_date
+    elif granularity == "week":
+        first = from_date - timedelta(days=from_date.weekday())
+        last = to_date - timedelta(days=to_date.weekday())
+    else:
+        first, last = from_date.replace(day=1), to_date.replace(day=1)
+    starts = []
+    current = first
+    while current <= last:
+        starts.append(current)
+        if granularity == "day":
+            current += timedelta(days=1)
+        elif granularity == "week":
+            current += timedelta(days=7)
+        else:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return starts
+
+
+def _period(
+    bucket: date,
+    zone: ZoneInfo,
+    granularity: str,
+    values: tuple[int, int, int, int] | None,
+) -> CashFlowPeriodResponse:
+    start = datetime.combine(bucket, time.min, tzinfo=zone)
+    income, expense, refunds, transaction_count = values or (0, 0, 0, 0)
+    return CashFlowPeriodResponse(
+        period_start=start,
+        period_end=_bucket_end(start, granularity),
+        income=income,
+        expense=expense,
+        refunds=refunds,
+        net=income + refunds - expense,
+        transaction_count=transaction_count,
+    )
+
+
 async def get_cash_flow_history(
     db: DBSession,
     current_user: UserPool,
@@ -68,93 +120,84 @@ async def get_cash_flow_history(
     if not current_user.organization_id:
         raise HTTPException(403, "User does not belong to an organization")
 
-    zone, timezone_name = await get_effective_timezone(db, current_user)
-    local_start = datetime.combine(request.from_date, time.min, tzinfo=zone)
-    local_end = datetime.combine(
-        request.to_date + timedelta(days=1), time.min, tzinfo=zone
-    )
-    start_utc = local_start.astimezone(timezone.utc)
-    end_utc = local_end.astimezone(timezone.utc)
-
-    base = query_service.org_filtered_query(
-        model=Transaction, current_user=current_user
-    ).where(
-        Transaction.date >= start_utc,
-        Transaction.date < end_utc,
-        Transaction.type.in_(("income", "expense", "refund")),
-    )
+    zone, timezone_name, rollup_timezone = await get_timezones(db, current_user)
+    if timezone_name == rollup_timezone:
+        # local days match the rollup's, so aggregate per-day rows instead
+        base = select(DailyRollup).where(
+            DailyRollup.organization_id == current_user.organization_id,
+            DailyRollup.local_date.between(request.from_date, request.to_date),
+            DailyRollup.type.in_(("income", "expense", "refund")),
+        )
+        source = DailyRollup
+        local_date = cast(DailyRollup.local_date, DateTime)
+        amount = DailyRollup.abs_amount_sum
+        transaction_count = func.sum(DailyRollup.transaction_count)
+    else:
+        local_start = datetime.combine(request.from_date, time.min, tzinfo=zone)
+        local_end = datetime.combine(
+            request.to_date + timedelta(days=1), time.min, tzinfo=zone
+        )
+        base = query_service.org_filtered_query(
+            model=Transaction, current_user=current_user
+        ).where(
+            Transaction.date >= local_start.astimezone(timezone.utc),
+            Transaction.date < local_end.astimezone(timezone.utc),
+            Transaction.type.in_(("income", "expense", "refund")),
+        )
+        source = Transaction
+        local_date = func.timezone(timezone_name, Transaction.date)
+        amount = func.abs(Transaction.amount)
+        transaction_count = func.count(Transaction.uuid)
     if request.category_ids:
-        base = base.where(Transaction.category_id.in_(request.category_ids))
+        base = base.where(source.category_id.in_(request.category_ids))
     if request.account_ids:
-        base = base.where(Transaction.account_id.in_(request.account_ids))
+        base = base.where(source.account_id.in_(request.account_ids))
     if request.project_ids:
-        base = base.where(Transaction.project_id.in_(request.project_ids))
-
-    local_date = func.timezone(timezone_name, Transaction.date)
-    bucket_start = func.date_trunc(request.granularity, local_date).label("bucket_start")
-    amount = func.abs(Transaction.amount)
-    aggregates = (
-        base.with_only_columns(
-            bucket_start,
-            func.coalesce(func.sum(case((Transaction.type == "income", amount), else_=0)), 0).label("income"),
-            func.coalesce(func.sum(case((Transaction.type == "expense", amount), else_=0)), 0).label("expense"),
-            func.coalesce(func.sum(case((Transaction.type == "refund", amount), else_=0)), 0).label("refunds"),
-            func.count(Transaction.uuid).label("transaction_count"),
-        )
-        .group_by(bucket_start)
-        .subquery()
-    )
+        base = base.where(source.project_id.in_(request.project_ids))
 
-    local_from = datetime.combine(request.from_date, time.min)
-    local_to = datetime.combine(request.to_date, time.min)
-    if request.granularity == "day":
-        step = cast(literal("1 day"), INTERVAL)
-    elif request.granularity == "week":
-        local_from -= timedelta(days=local_from.weekday())
-        local_to -= timedelta(days=local_to.weekday())
-        step = cast(literal("1 week"), INTERVAL)
-    else:
-        local_from = local_from.replace(day=1)
-        local_to = local_to.replace(day=1)
-        step = cast(literal("1 month"), INTERVAL)
-
-    series = (
-        func.generate_series(local_from, local_to, step)
-        .table_valued("bucket_start")
-        .render_derived(name="series")
-    )
-    statement = (
-        select(
-            series.c.bucket_start,
-            func.coalesce(aggregates.c.income, 0).label("income"),
-            func.coalesce(aggregates.c.expense, 0).label("expense"),
-            func.coalesce(aggregates.c.refunds, 0).label("refunds"),
-            func.coalesce(aggregates.c.transaction_count, 0).label("transaction_count"),
-        )
-        .select_from(series.outerjoin(aggregates, aggregates.c.bucket_start == series.c.bucket_start))
-        .order_by(series.c.bucket_start)
-    )
+    granularities = request.requested_granularities
+    buckets = [func.date_trunc(granularity, local_date) for granularity in granularities]
+    statement = base.with_only_columns(
+        *(bucket.label(f"{granularity}_start") for granularity, bucket in zip(granularities, buckets)),
+        func.coalesce(func.sum(case((source.type == "income", amount), else_=0)), 0).label("income"),
+        func.coalesce(func.sum(case((source.type == "expense", amount), else_=0)), 0).label("expense"),
+        func.coalesce(func.sum(case((source.type == "refund", amount), else_=0)), 0).label("refunds"),
+        transaction_count.label("transaction_count"),
+    ).group_by(func.grouping_sets(*buckets))
     rows = (await db.execute(statement)).all()
-    periods = []
+
+    # one GROUPING SETS scan; each row belongs to the granularity whose bucket is set
+    totals: dict[str, dict[date, tuple[int, int, int, int]]] = {
+        granularity: {} for granularity in granularities
+    }
     for row in rows:
-        start = row.bucket_start.replace(tzinfo=zone)
-        end = _bucket_end(start, request.granularity)
-        income, expense, refunds = map(int, (row.income, row.expense, row.refunds))
-        periods.append(
-            CashFlowPeriodResponse(
-                period_start=start,
-                period_end=end,
-                income=income,
-                expense=expense,
-                refunds=refunds,
-                net=income + refunds - expense,
-                transaction_count=int(row.transaction_count),
-            )
+        values = (
+            int(row.income),
+            int(row.expense),
+            int(row.refunds),
+            int(row.transaction_count),
+        )
+        for granularity in granularities:
+            bucket = getattr(row, f"{granularity}_start")
+            if bucket is not None:
+                totals[granularity][bucket.date()] = values
+                break
+
+    series = [
+        CashFlowSeriesResponse(
+            granularity=granularity,
+            periods=[
+                _period(bucket, zone, granularity, totals[granularity].get(bucket))
+                for bucket in _bucket_starts(request.from_date, request.to_date, granularity)
+            ],
         )
+        for granularity in granularities
+    ]
     return CashFlowHistoryResponse(
         timezone=timezone_name,
         from_date=request.from_date,
         to_date=request.to_date,
-        granularity=request.granularity,
-        periods=periods,
+        granularity=series[0].granularity,
+        periods=series[0].periods,
+        series=series,
     )
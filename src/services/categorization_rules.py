@@ -0,0 +1,80 @@
+"""Per-organization keyword rules applied while importing transactions.
+
+Rules are loaded with one query per import and compiled into a
+``KeywordMatcher``. Compiled matchers are cached per organization and reused
+for as long as the organization's rules are unchanged, so rules are compiled
+once rather than per import. Matching a row still tries every keyword at each
+position of its description, inside the regex engine, so per-row cost grows
+with the number of rules, only more slowly than a Python loop over them.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+
+from src.database.connect import DBSession
+from src.model.models import CategorizationRule
+from src.util.keyword_matcher import KeywordMatcher
+
+MATCHER_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    internal_type: str | None
+    category_id: UUID | None
+
+
+RuleKey = tuple[str, str | None, UUID | None]
+
+_matcher_cache: "OrderedDict[UUID, tuple[tuple[RuleKey, ...], KeywordMatcher[RuleOutcome]]]" = OrderedDict()
+
+
+def compile_rules(rules: tuple[RuleKey, ...]) -> KeywordMatcher[RuleOutcome]:
+    return KeywordMatcher(
+        (keyword, RuleOutcome(internal_type=internal_type, category_id=category_id))
+        for keyword, internal_type, category_id in rules
+    )
+
+
+def invalidate_rule_matcher(organization_id: UUID) -> None:
+    _matcher_cache.pop(organization_id, None)
+
+
+async def get_rule_matcher(
+    db: DBSession, organization_id: UUID | None
+) -> KeywordMatcher[RuleOutcome] | None:
+    """Compiled rules of an organization, or ``None`` when it has none.
+
+    The cached matcher is keyed on the rules themselves, so edits made by
+    another worker process are picked up on the next import as well.
+    """
+    if organization_id is None:
+        return None
+    result = await db.execute(
+        select(
+            CategorizationRule.keyword,
+            CategorizationRule.internal_type,
+            CategorizationRule.category_id,
+        )
+        .where(CategorizationRule.organization_id == organization_id)
+        .order_by(CategorizationRule.priority, CategorizationRule.created_at)
+    )
+    rules = tuple(tuple(row) for row in result.all())
+    if not rules:
+        invalidate_rule_matcher(organization_id)
+        return None
+
+    cached = _matcher_cache.get(organization_id)
+    if cached is not None and cached[0] == rules:
+        _matcher_cache.move_to_end(organization_id)
+        return cached[1]
+
+    matcher = compile_rules(rules)
+    _matcher_cache[organization_id] = (rules, matcher)
+    _matcher_cache.move_to_end(organization_id)
+    while len(_matcher_cache) > MATCHER_CACHE_SIZE:
+        _matcher_cache.popitem(last=False)
+    return matcher
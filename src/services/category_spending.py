@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, literal, or_, select, union_all
+
+from src.database.connect import DBSession
+from src.model.models import Category, DailyRollup, Organization, Transaction
+from src.schemas.category import CategorySpendingResponse
+from src.services.daily_rollup import day_start, rollup_zone, whole_local_days
+from src.services.params import ParamsService
+from src.services.query_service import QueryService
+from src.util.types import UserPool
+
+
+async def build_category_spending(
+    db: DBSession,
+    current_user: UserPool,
+    query_service: QueryService,
+    params_service: ParamsService,
+    from_date: datetime | None,
+    to_date: datetime | None,
+) -> list[CategorySpendingResponse]:
+    """Expense totals per category, largest first.
+
+    Whole local days come from ``daily_rollup``; only the partial days at the
+    edges of the range are summed from ``transactions``.
+    """
+    zone = rollup_zone(
+        await db.scalar(
+            select(Organization.timezone).where(
+                Organization.uuid == current_user.organization_id
+            )
+        )
+    )
+    first_day, last_day = whole_local_days(from_date, to_date, zone)
+    parts = []
+
+    if first_day is None or last_day is None or first_day <= last_day:
+        rollup = select(
+            DailyRollup.category_id.label("category_id"),
+            DailyRollup.amount_sum.label("amount"),
+        ).where(
+            DailyRollup.organization_id == current_user.organization_id,
+            DailyRollup.type == "expense",
+        )
+        if first_day is not None:
+            rollup = rollup.where(DailyRollup.local_date >= first_day)
+        if last_day is not None:
+            rollup = rollup.where(DailyRollup.local_date <= last_day)
+        parts.append(rollup)
+        edges = []
+        if first_day is not None:
+            edges.append(Transaction.date < day_start(first_day, zone))
+        if last_day is not None:
+            edges.append(
+                Transaction.date >= day_start(last_day + timedelta(days=1), zone)
+            )
+    else:
+        # the range lies within a single local day
+        edges = [literal(True)]
+
+    if edges:
+        raw = query_service.org_filtered_query(
+            model=Transaction,
+            current_user=current_user,
+        ).where(Transaction.type == "expense", or_(*edges))
+        raw = params_service.apply_date_filter(
+            raw, Transaction, from_date, to_date, "date"
+        ).with_only_columns(
+            Transaction.category_id.label("category_id"),
+            Transaction.amount.label("amount"),
+        )
+        parts.append(raw)
+
+    amounts = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+    expense_total = func.coalesce(func.sum(amounts.c.amount), 0)
+    stmt = (
+        select(
+            Category.uuid.label("category_id"),
+            Category.title.label("category"),
+            expense_total.label("expense"),
+        )
+        .join(amounts, amounts.c.category_id == Category.uuid)
+        .group_by(Category.uuid, Category.title)
+        .order_by(func.abs(expense_total).desc(), Category.title.asc())
+    )
+
+    result = await db.execute(stmt)
+    return [
+        CategorySpendingResponse(
+            category_id=row.category_id,
+            category=row.category,
+            expense=int(row.expense or 0),
+        )
+        for row in result.all()
+    ]
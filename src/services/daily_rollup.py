@@ -0,0 +1,276 @@
+"""Per-day transaction sums backing the cash-flow and summary analytics.
+
+``daily_rollup`` holds one row per organization, local day (organization
+timezone, UTC when unset), account, category, project and type with the signed
+and absolute amount sums and the transaction count. An ``after_flush`` hook,
+registered in src/database/connect.py, folds every inserted, updated and
+deleted ``Transaction`` into it as signed deltas, so reads aggregate a few rows
+per day instead of every transaction.
+
+Writes that bypass the ORM unit of work (bulk ``UPDATE``/``DELETE`` statements
+on the columns above) and organization timezone changes are not tracked; run
+scripts/rebuild_daily_rollup.py afterwards.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+from uuid import UUID, uuid4
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import delete, func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.database.connect import DBSession
+from src.model.models import DailyRollup, Organization, Project, Transaction, User
+from src.services.analytics_cache import bump_data_version
+
+ROLLUP_KEY = ("organization_id", "local_date", "account_id", "category_id", "project_id", "type")
+TRACKED_FIELDS = ("user_id", "date", "amount", "account_id", "category_id", "project_id", "type")
+
+
+@dataclass(frozen=True)
+class RollupEntry:
+    """One transaction as seen by the rollup, before the organization is resolved."""
+
+    user_id: UUID
+    date: datetime
+    amount: int
+    account_id: UUID | None
+    category_id: UUID | None
+    project_id: UUID | None
+    type: str | None
+
+
+def rollup_zone(name: str | None) -> ZoneInfo:
+    """Zone the rollup buckets an organization's days in."""
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return ZoneInfo("UTC")
+
+
+def rollup_timezone_name(name: str | None) -> str:
+    return rollup_zone(name).key
+
+
+def local_day(value: datetime, zone: ZoneInfo) -> date:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(zone).date()
+
+
+def day_start(day: date, zone: ZoneInfo) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=zone)
+
+
+def whole_local_days(
+    from_date: datetime | None, to_date: datetime | None, zone: ZoneInfo
+) -> tuple[date | None, date | None]:
+    """First and last local day lying entirely inside ``[from_date, to_date]``.
+
+    ``None`` bounds stay open. Callers read those days from the rollup and the
+    partial days at either edge from ``transactions``.
+    """
+    first = last = None
+    if from_date is not None:
+        local = from_date.astimezone(zone)
+        first = local.date()
+        if from_date > day_start(first, zone):
+            first += timedelta(days=1)
+    if to_date is not None:
+        local = to_date.astimezone(zone)
+        last = local.date()
+        if to_date + timedelta(microseconds=1) < day_start(last + timedelta(days=1), zone):
+            last -= timedelta(days=1)
+    return first, last
+
+
+def _entry(values: dict) -> RollupEntry | None:
+    if values["user_id"] is None or values["date"] is None or values["amount"] is None:
+        return None
+    return RollupEntry(**{field: values[field] for field in TRACKED_FIELDS})
+
+
+def _current_entry(tx: Transaction) -> RollupEntry | None:
+    return _entry({field: getattr(tx, field) for field in TRACKED_FIELDS})
+
+
+def _previous_entry(tx: Transaction) -> RollupEntry | None:
+    """The transaction as it was before this flush."""
+    state = inspect(tx)
+    values = {}
+    for field in TRACKED_FIELDS:
+        history = state.attrs[field].history
+        if history.deleted:
+            values[field] = history.deleted[0]
+        elif history.added:
+            # changed from an unloaded value; the previous state is unknown
+            return None
+        else:
+            values[field] = getattr(tx, field)
+    return _entry(values)
+
+
+def transaction_changes(session: Session) -> list[tuple[RollupEntry, int]]:
+    """``(entry, sign)`` pairs for the transactions flushed in ``session``."""
+    changes: list[tuple[RollupEntry, int]] = []
+    for tx in session.new:
+        if isinstance(tx, Transaction) and (entry := _current_entry(tx)):
+            changes.append((entry, 1))
+    for tx in session.deleted:
+        if isinstance(tx, Transaction) and (entry := _previous_entry(tx)):
+            changes.append((entry, -1))
+    for tx in session.dirty:
+        if not isinstance(tx, Transaction) or not session.is_modified(tx):
+            continue
+        state = inspect(tx)
+        if not any(state.attrs[field].history.has_changes() for field in TRACKED_FIELDS):
+            continue
+        if previous := _previous_entry(tx):
+            changes.append((previous, -1))
+        if current := _current_entry(tx):
+            changes.append((current, 1))
+    return changes
+
+
+def aggregate_deltas(
+    changes: Iterable[tuple[RollupEntry, int]],
+    organizations: dict[UUID, tuple[UUID, ZoneInfo]],
+) -> dict[tuple, list[int]]:
+    """Net ``[amount_sum, abs_amount_sum, transaction_count]`` per rollup key.
+
+    ``organizations`` maps a user to its organization and rollup zone; entries
+    of users without an organization are skipped.
+    """
+    deltas: dict[tuple, list[int]] = defaultdict(lambda: [0, 0, 0])
+    for entry, sign in changes:
+        organization = organizations.get(entry.user_id)
+        if organization is None:
+            continue
+        organization_id, zone = organization
+        key = (
+            organization_id,
+            local_day(entry.date, zone),
+            entry.account_id,
+            entry.category_id,
+            entry.project_id,
+            entry.type,
+        )
+        delta = deltas[key]
+        delta[0] += sign * entry.amount
+        delta[1] += sign * abs(entry.amount)
+        delta[2] += sign
+    return {key: delta for key, delta in deltas.items() if any(delta)}
+
+
+def upsert_rollup_statement(deltas: dict[tuple, list[int]]):
+    rows = [
+        {
+            "uuid": uuid4(),
+            **dict(zip(ROLLUP_KEY, key)),
+            "amount_sum": amount_sum,
+            "abs_amount_sum": abs_amount_sum,
+            "transaction_count": transaction_count,
+        }
+        for key, (amount_sum, abs_amount_sum, transaction_count) in deltas.items()
+    ]
+    stmt = pg_insert(DailyRollup).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            column: getattr(DailyRollup, column) + getattr(stmt.excluded, column)
+            for column in ("amount_sum", "abs_amount_sum", "transaction_count")
+        },
+    )
+
+
+def apply_transaction_changes(session: Session, flush_context) -> None:
+    connection = session.connection()
+
+    deleted_projects = [
+        project.uuid for project in session.deleted if isinstance(project, Project)
+    ]
+    if deleted_projects:
+        # transactions.project_id cascades in the database, outside the ORM
+        connection.execute(
+            delete(DailyRollup).where(DailyRollup.project_id.in_(deleted_projects))
+        )
+
+    changes = [
+        (entry, sign)
+        for entry, sign in transaction_changes(session)
+        if entry.project_id is None or entry.project_id not in deleted_projects
+    ]
+    if not changes:
+        return
+    user_ids = {entry.user_id for entry, _ in changes}
+    rows = connection.execute(
+        select(User.uuid, User.organization_id, Organization.timezone)
+        .join(Organization, User.organization_id == Organization.uuid)
+        .where(User.uuid.in_(user_ids))
+    ).all()
+    organizations = {
+        user_id: (organization_id, rollup_zone(timezone_name))
+        for user_id, organization_id, timezone_name in rows
+    }
+    deltas = aggregate_deltas(changes, organizations)
+    if not deltas:
+        return
+    result = connection.execute(
+        upsert_rollup_statement(deltas).returning(
+            DailyRollup.uuid, DailyRollup.transaction_count
+        )
+    )
+    emptied = [uuid for uuid, transaction_count in result.all() if transaction_count <= 0]
+    if emptied:
+        connection.execute(delete(DailyRollup).where(DailyRollup.uuid.in_(emptied)))
+
+
+async def rebuild_daily_rollup(db: DBSession, organization_id: UUID) -> int:
+    """Recompute an organization's rollup from its transactions in one statement."""
+    timezone_name = rollup_timezone_name(
+        await db.scalar(
+            select(Organization.timezone).where(Organization.uuid == organization_id)
+        )
+    )
+    await db.execute(delete(DailyRollup).where(DailyRollup.organization_id == organization_id))
+
+    local_date = func.date(func.timezone(timezone_name, Transaction.date))
+    source = (
+        select(
+            func.gen_random_uuid().label("uuid"),
+            literal(organization_id).label("organization_id"),
+            local_date.label("local_date"),
+            Transaction.account_id,
+            Transaction.category_id,
+            Transaction.project_id,
+            Transaction.type,
+            func.sum(Transaction.amount).label("amount_sum"),
+            func.sum(func.abs(Transaction.amount)).label("abs_amount_sum"),
+            func.count().label("transaction_count"),
+        )
+        .join(User, Transaction.user_id == User.uuid)
+        .where(User.organization_id == organization_id, Transaction.date.is_not(None))
+        .group_by(
+            local_date,
+            Transaction.account_id,
+            Transaction.category_id,
+            Transaction.project_id,
+            Transaction.type,
+        )
+    )
+    result = await db.execute(
+        pg_insert(DailyRollup)
+        .from_select(
+            ["uuid", *ROLLUP_KEY, "amount_sum", "abs_amount_sum", "transaction_count"], source
+        )
+        .returning(DailyRollup.uuid)
+    )
+    count = len(result.all())
+    await bump_data_version(db, organization_id)
+    return count
@@ -5,12 +5,112 @@ from src.database.connect import DBSession
 from src.util.s3 import S3Client, get_s3_client
 from src.util.types import UserPool
 from src.util.user import get_current_user
+from .bank_importers.base import (
+    BaseBankImporter,
+    header_key_from_line,
+    header_signature_from_line,
+)
 from .bank_importers.chase_debit import ChaseDebitImporter
 from .bank_importers.chase_credit import ChaseCreditImporter
+from .bank_importers.declarative import load_spec_importers
+from .bank_importers.ofx import OfxImporter
 from enum import Enum
 
 
-IMPORTERS = [ChaseDebitImporter, ChaseCreditImporter]
+# Spec-driven importers are selected by header only (see bank_importers/specs),
+# for the account types their spec lists.
+IMPORTERS = [
+    ChaseDebitImporter,
+    ChaseCreditImporter,
+    OfxImporter,
+    *load_spec_importers(),
+]
+
+# Bytes read from the head of an upload while looking for the header line.
+HEADER_SNIFF_BYTES = 4096
+
+
+def build_signature_index(
+    importers: list[type[BaseBankImporter]],
+) -> dict[frozenset[str], type[BaseBankImporter]]:
+    """Map each declared header signature to the importer that owns it."""
+    index: dict[frozenset[str], type[BaseBankImporter]] = {}
+    for importer_cls in importers:
+        signature = importer_cls.header_signature
+        if not signature:
+            continue
+        if signature in index:
+            raise ValueError(
+                f"{importer_cls.__name__} and {index[signature].__name__} "
+                "declare the same header signature"
+            )
+        index[signature] = importer_cls
+    return index
+
+
+def build_header_key_index(
+    importers: list[type[BaseBankImporter]],
+) -> dict[str, type[BaseBankImporter]]:
+    """Map first-line keys of non-CSV formats to their importer."""
+    return {
+        key: importer_cls for importer_cls in importers for key in importer_cls.header_keys
+    }
+
+
+SIGNATURE_INDEX = build_signature_index(IMPORTERS)
+HEADER_KEY_INDEX = build_header_key_index(IMPORTERS)
+
+
+def sniff_header(stream, chunk_size: int = HEADER_SNIFF_BYTES) -> tuple[str, bytes]:
+    """Read ``stream`` up to the end of its first line.
+
+    Returns the decoded header line together with every byte consumed so the
+    caller can prepend them to the rest of the stream instead of downloading
+    the file a second time.
+    """
+    head = b""
+    while b"\n" not in head:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        head += chunk
+    header_line = head.split(b"\n", 1)[0].rstrip(b"\r")
+    return header_line.decode("utf-8", errors="replace"), head
+
+
+def select_importer(
+    file_name: str,
+    file_type: str,
+    account_type: ImportJobStatus,
+    header_line: str | None = None,
+) -> type[BaseBankImporter]:
+    """Pick the importer class for an upload.
+
+    The header line is matched against ``SIGNATURE_INDEX`` (CSV columns) and
+    ``HEADER_KEY_INDEX`` (e.g. ``OFXHEADER``) first, so the file content
+    decides the format whenever an importer declares it.
+    A header match is rejected when the importer restricts ``account_types``
+    and the upload's account is not one of them.
+    Importers without a signature (or unknown headers) fall back to the
+    ``can_handle_file`` checks on file and account type.
+    """
+    if header_line:
+        importer_cls = SIGNATURE_INDEX.get(
+            header_signature_from_line(header_line)
+        ) or HEADER_KEY_INDEX.get(header_key_from_line(header_line))
+        if importer_cls is not None:
+            if not importer_cls.accepts_account_type(account_type):
+                raise ValueError(
+                    f"{importer_cls.__name__} files can only be imported into "
+                    f"{', '.join(sorted(t.value for t in importer_cls.account_types))} accounts"
+                )
+            return importer_cls
+
+    for importer_cls in IMPORTERS:
+        if importer_cls.can_handle_file(file_name=file_name, file_type=file_type, account_type=account_type):
+            return importer_cls
+    raise ValueError("No suitable importer found for this file.")
+
 
 def get_importer(
     file_content,
@@ -21,8 +121,14 @@ def get_importer(
     current_user: UserPool = Depends(get_current_user),
     s3_client: S3Client = Depends(get_s3_client),
     metadata=None,
+    header_line: str | None = None,
 ):
-    for importer_cls in IMPORTERS:
-        if importer_cls.can_handle_file(file_name=file_name, file_type=file_type, account_type=account_type):
-            return importer_cls(file_content=file_content, db=db, s3_client=s3_client, current_user=current_user)
-    raise ValueError("No suitable importer found for this file.")
+    if header_line is None and isinstance(file_content, str):
+        header_line = file_content.split("\n", 1)[0].rstrip("\r")
+    importer_cls = select_importer(
+        file_name=file_name,
+        file_type=file_type,
+        account_type=account_type,
+        header_line=header_line,
+    )
+    return importer_cls(file_content=file_content, db=db, s3_client=s3_client, current_user=current_user)
@@ -0,0 +1,140 @@
+"""Vectorized recurrence analysis for full candidate rescans.
+
+Evaluates the same rules as ``group_looks_recurring`` and ``infer_frequency``
+for every merchant group at once: rows are sorted a single time by
+``(group, day)``, intervals come from one ``np.diff`` masked at group
+boundaries, and per-group counts, medians and hit ratios are computed with
+``np.bincount`` and index arithmetic over group offsets instead of Python loops.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from src.services.subscription_candidate_service import (
+    AMOUNT_STABILITY_RATIO,
+    INTERVAL_MATCH_RATIO,
+    MAX_AMOUNT_VARIANCE_RATIO,
+    MAX_INTERVAL_DAYS,
+    MIN_INTERVAL_DAYS,
+    MIN_OCCURRENCES,
+)
+
+# Upper bounds (inclusive) of the ``infer_frequency`` buckets.
+FREQUENCY_BOUNDS = np.array([10, 20, 45, 120, 400])
+FREQUENCY_LABELS = np.array(
+    ["weekly", "biweekly", "monthly", "quarterly", "yearly", "irregular", "unknown"]
+)
+_UNKNOWN = len(FREQUENCY_LABELS) - 1
+EPOCH_DATE = date(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class RecurrenceScan:
+    """Per-group results; ``codes`` maps each input row to its group."""
+
+    keys: np.ndarray
+    codes: np.ndarray
+    counts: np.ndarray
+    recurring: np.ndarray
+    frequencies: np.ndarray
+
+    def recurring_rows(self) -> np.ndarray:
+        return self.recurring[self.codes]
+
+    def as_dict(self) -> dict[str, tuple[bool, str]]:
+        return {
+            key: (bool(recurring), str(frequency))
+            for key, recurring, frequency in zip(self.keys, self.recurring, self.frequencies)
+        }
+
+
+def _group_medians(values: np.ndarray, codes: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Median of ``values`` per group (``statistics.median`` semantics) and group sizes."""
+    counts = np.bincount(codes, minlength=n_groups)
+    medians = np.full(n_groups, np.nan)
+    if not len(values):
+        return medians, counts
+    ordered = values[np.lexsort((values, codes))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    low = starts[present] + (counts[present] - 1) // 2
+    high = starts[present] + counts[present] // 2
+    medians[present] = (ordered[low] + ordered[high]) / 2
+    return medians, counts
+
+
+def analyze_recurrence(
+    keys: Sequence[str] | np.ndarray,
+    days: Sequence[int] | np.ndarray,
+    amounts: Sequence[int] | np.ndarray,
+) -> RecurrenceScan:
+    """Evaluate every merchant group in one pass.
+
+    Args:
+        keys: Merchant key per row.
+        days: Transaction date per row as an integer day number.
+        amounts: Signed amount in cents per row.
+    """
+    days = np.asarray(days, dtype=np.int64)
+    amounts = np.abs(np.asarray(amounts, dtype=np.int64))
+
+    # Hash-based factorization; np.unique would sort the strings.
+    index: dict[str, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(key, len(index)) for key in keys), dtype=np.int64, count=len(days)
+    )
+    group_keys = np.array(list(index), dtype=object)
+    n_groups = len(group_keys)
+
+    order = np.lexsort((days, codes))
+    sorted_codes = codes[order]
+    intervals = np.diff(days[order])
+    same_group = sorted_codes[1:] == sorted_codes[:-1]
+    interval_codes = sorted_codes[1:][same_group]
+    intervals = intervals[same_group]
+
+    interval_medians, interval_counts = _group_medians(intervals, interval_codes, n_groups)
+    interval_hits = np.bincount(
+        interval_codes,
+        weights=(intervals >= MIN_INTERVAL_DAYS) & (intervals <= MAX_INTERVAL_DAYS),
+        minlength=n_groups,
+    )
+    baselines, counts = _group_medians(amounts, codes, n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        interval_ratio = interval_hits / interval_counts
+        deviation = np.abs(amounts - baselines[codes]) / baselines[codes]
+        stable = np.bincount(
+            codes, weights=deviation <= MAX_AMOUNT_VARIANCE_RATIO, minlength=n_groups
+        )
+        recurring = (
+            (counts >= MIN_OCCURRENCES)
+            & (interval_counts > 0)
+            & (interval_ratio >= INTERVAL_MATCH_RATIO)
+            & (baselines > 0)
+            & (stable / counts >= AMOUNT_STABILITY_RATIO)
+        )
+
+    frequency_index = np.full(n_groups, _UNKNOWN)
+    has_intervals = interval_counts > 0
+    frequency_index[has_intervals] = np.searchsorted(
+        FREQUENCY_BOUNDS, interval_medians[has_intervals], side="left"
+    )
+
+    return RecurrenceScan(
+        keys=group_keys,
+        codes=codes,
+        counts=counts,
+        recurring=recurring,
+        frequencies=FREQUENCY_LABELS[frequency_index],
+    )
+
+
+def day_numbers(dates: Iterable[datetime]) -> np.ndarray:
+    """Calendar day of each datetime (``dt.date()``) as days since 1970-01-01."""
+    epoch = EPOCH_DATE.toordinal()
+    return np.fromiter((value.toordinal() - epoch for value in dates), dtype=np.int64)
+
@@ -0,0 +1,376 @@
+"""Incrementally maintained recurrence statistics per merchant.
+
+Every eligible transaction (known merchant key, not income/transfer/etc.)
+updates the ``recurring_series`` row of its organization and merchant key as it
+is imported or created: occurrence count, first/last date, a bounded window of recent
+intervals and amounts, Welford running amount mean/variance, and the derived
+medians, frequency and ``is_recurring`` flag. Candidate checks and frequency
+lookups then read one row per merchant instead of scanning history.
+
+Rows that arrive out of date order fall back to replaying that merchant's
+history; ``rebuild_recurring_series`` does the same for a whole organization
+(e.g. after edits or deletes).
+
+The series are the only source of ``subscription_candidate`` flags: an import
+flags its new rows from them, and ``refresh_subscription_candidates`` brings
+the stored rows of the merchants it touched in line afterwards (a merchant
+that just became recurring flags its earlier charges too). Merchants the
+user already tracks as a ``Subscription`` (by name) are never flagged.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from statistics import median
+from typing import Collection, Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.database.connect import DBSession, sessionmanager
+from src.model.models import RecurringSeries, Transaction, User
+from src.services.analytics_cache import bump_data_version
+from src.services.subscription_candidate_service import (
+    EXCLUDED_TYPES,
+    MIN_OCCURRENCES,
+    frequency_for_interval,
+    get_subscription_name_keys,
+    intervals_look_recurring,
+)
+
+SERIES_WINDOW = 24
+
+logger = logging.getLogger(__name__)
+
+
+def is_series_transaction(
+    merchant_key: str | None, date: datetime | None, type_: str | None
+) -> bool:
+    return (
+        bool(merchant_key)
+        and date is not None
+        and type_ is not None
+        and type_.lower() not in EXCLUDED_TYPES
+    )
+
+
+def new_series(organization_id: UUID, merchant_key: str, date: datetime) -> RecurringSeries:
+    return RecurringSeries(
+        organization_id=organization_id,
+        merchant_key=merchant_key,
+        first_date=date,
+        last_date=date,
+        occurrence_count=0,
+        recent_intervals=[],
+        recent_amounts=[],
+        amount_mean=0.0,
+        amount_m2=0.0,
+        frequency="unknown",
+        is_recurring=False,
+    )
+
+
+def add_occurrence(series: RecurringSeries, date: datetime, amount: int | None) -> None:
+    """Fold one transaction (not older than ``series.last_date``) into the series."""
+    amount = abs(amount or 0)
+    if series.occurrence_count:
+        interval = (date.date() - series.last_date.date()).days
+        # lists are replaced, not mutated, so the ORM sees the change
+        series.recent_intervals = [*series.recent_intervals, interval][-(SERIES_WINDOW - 1):]
+    else:
+        series.first_date = date
+    series.recent_amounts = [*series.recent_amounts, amount][-SERIES_WINDOW:]
+
+    series.occurrence_count += 1
+    delta = amount - series.amount_mean
+    series.amount_mean += delta / series.occurrence_count
+    series.amount_m2 += delta * (amount - series.amount_mean)
+    series.last_date = date
+
+    intervals = series.recent_intervals
+    amounts = series.recent_amounts
+    series.interval_median = float(median(intervals)) if intervals else None
+    series.amount_median = float(median(amounts)) if amounts else None
+    series.frequency = frequency_for_interval(series.interval_median)
+    series.is_recurring = series.occurrence_count >= MIN_OCCURRENCES and intervals_look_recurring(
+        intervals, amounts
+    )
+
+
+def replay_series(
+    series: RecurringSeries, occurrences: Iterable[tuple[datetime, int | None]]
+) -> RecurringSeries:
+    """Reset ``series`` and rebuild it from ``(date, amount)`` pairs in any order."""
+    series.occurrence_count = 0
+    series.recent_intervals = []
+    series.recent_amounts = []
+    series.amount_mean = 0.0
+    series.amount_m2 = 0.0
+    for date, amount in sorted(occurrences, key=lambda item: item[0]):
+        add_occurrence(series, date, amount)
+    return series
+
+
+def org_series_history_query(organization_id: UUID):
+    return (
+        select(Transaction.merchant_key, Transaction.date, Transaction.amount)
+        .join(User, Transaction.user_id == User.uuid)
+        .where(
+            User.organization_id == organization_id,
+            Transaction.merchant_key.is_not(None),
+            Transaction.date.is_not(None),
+            func.lower(Transaction.type).not_in(EXCLUDED_TYPES),
+        )
+    )
+
+
+async def update_recurring_series(
+    db: DBSession,
+    organization_id: UUID | None,
+    transactions: list[Transaction],
+) -> dict[str, RecurringSeries]:
+    """Fold new, not yet flushed transactions into their series.
+
+    Returns the updated series by merchant key. Missing rows are inserted
+    empty first (concurrent writers skip the conflict) so every row can be
+    locked for the rest of the transaction; a merchant whose new rows predate
+    its ``last_date`` is replayed from stored history plus the new rows.
+    """
+    if organization_id is None:
+        return {}
+    new_by_key: dict[str, list[tuple[datetime, int | None]]] = defaultdict(list)
+    for tx in transactions:
+        if is_series_transaction(tx.merchant_key, tx.date, tx.type):
+            new_by_key[tx.merchant_key].append((tx.date, tx.amount))
+    if not new_by_key:
+        return {}
+
+    await db.execute(
+        pg_insert(RecurringSeries)
+        .values(
+            [
+                {
+                    "organization_id": organization_id,
+                    "merchant_key": key,
+                    "first_date": min(date for date, _ in occurrences),
+                    "last_date": min(date for date, _ in occurrences),
+                    "occurrence_count": 0,
+                    "recent_intervals": [],
+                    "recent_amounts": [],
+                    "amount_mean": 0.0,
+                    "amount_m2": 0.0,
+                    "frequency": "unknown",
+                    "is_recurring": False,
+                }
+                for key, occurrences in new_by_key.items()
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["organization_id", "merchant_key"])
+    )
+    result = await db.execute(
+        select(RecurringSeries)
+        .where(
+            RecurringSeries.organization_id == organization_id,
+            RecurringSeries.merchant_key.in_(new_by_key),
+        )
+        .with_for_update()
+    )
+    series_by_key = {series.merchant_key: series for series in result.scalars().all()}
+
+    out_of_order: list[str] = []
+    for key, occurrences in new_by_key.items():
+        occurrences.sort(key=lambda item: item[0])
+        series = series_by_key[key]
+        if series.occurrence_count and occurrences[0][0] < series.last_date:
+            out_of_order.append(key)
+            continue
+        for date, amount in occurrences:
+            add_occurrence(series, date, amount)
+
+    if out_of_order:
+        history: dict[str, list[tuple[datetime, int | None]]] = defaultdict(list)
+        rows = await db.execute(
+            org_series_history_query(organization_id).where(
+                Transaction.merchant_key.in_(out_of_order)
+            )
+        )
+        for key, date, amount in rows.all():
+            history[key].append((date, amount))
+        for key in out_of_order:
+            replay_series(series_by_key[key], history[key] + new_by_key[key])
+
+    return series_by_key
+
+
+def is_candidate(
+    series_is_recurring: bool,
+    merchant_key: str | None,
+    date: datetime | None,
+    type_: str | None,
+    subscription_id: UUID | None,
+    excluded_keys: Collection[str] = (),
+) -> bool:
+    """``subscription_candidate`` of one transaction, given its merchant's series.
+
+    ``excluded_keys`` are merchants the user already tracks as a subscription
+    (see ``get_subscription_name_keys``); their rows are never candidates.
+    """
+    return (
+        series_is_recurring
+        and not subscription_id
+        and merchant_key not in excluded_keys
+        and is_series_transaction(merchant_key, date, type_)
+    )
+
+
+async def flag_subscription_candidates(
+    db: DBSession,
+    organization_id: UUID | None,
+    user_id: UUID,
+    transactions: list[Transaction],
+) -> None:
+    """Update the series for new transactions and set ``subscription_candidate``
+    from them: one lookup per merchant instead of a history scan per row.
+    """
+    series_by_key = await update_recurring_series(db, organization_id, transactions)
+    excluded_keys = await get_subscription_name_keys(db=db, user_id=user_id)
+    for tx in transactions:
+        series = series_by_key.get(tx.merchant_key)
+        tx.subscription_candidate = is_candidate(
+            series is not None and series.is_recurring,
+            tx.merchant_key,
+            tx.date,
+            tx.type,
+            tx.subscription_id,
+            excluded_keys,
+        )
+
+
+@dataclass(frozen=True)
+class CandidateFlagRow:
+    uuid: UUID
+    merchant_key: str
+    date: datetime | None
+    type: str | None
+    subscription_id: UUID | None
+    subscription_candidate: bool
+
+
+def changed_candidate_flags(
+    rows: list[CandidateFlagRow],
+    recurring_keys: set[str],
+    excluded_keys: Collection[str] = (),
+) -> tuple[list[UUID], list[UUID]]:
+    """``(to_set, to_clear)``: rows whose stored flag disagrees with the series."""
+    to_set: list[UUID] = []
+    to_clear: list[UUID] = []
+    for row in rows:
+        flag = is_candidate(
+            row.merchant_key in recurring_keys,
+            row.merchant_key,
+            row.date,
+            row.type,
+            row.subscription_id,
+            excluded_keys,
+        )
+        if flag and not row.subscription_candidate:
+            to_set.append(row.uuid)
+        elif not flag and row.subscription_candidate:
+            to_clear.append(row.uuid)
+    return to_set, to_clear
+
+
+async def refresh_subscription_candidates(
+    db: DBSession,
+    organization_id: UUID,
+    user_id: UUID,
+    merchant_keys: set[str],
+) -> int:
+    """Align the user's stored flags for ``merchant_keys`` with their series.
+
+    Returns:
+        The number of rows updated.
+    """
+    if not merchant_keys:
+        return 0
+    recurring_keys = set(
+        (
+            await db.execute(
+                select(RecurringSeries.merchant_key).where(
+                    RecurringSeries.organization_id == organization_id,
+                    RecurringSeries.merchant_key.in_(merchant_keys),
+                    RecurringSeries.is_recurring.is_(True),
+                )
+            )
+        ).scalars()
+    )
+    result = await db.execute(
+        select(
+            Transaction.uuid,
+            Transaction.merchant_key,
+            Transaction.date,
+            Transaction.type,
+            Transaction.subscription_id,
+            Transaction.subscription_candidate,
+        ).where(
+            Transaction.user_id == user_id,
+            Transaction.merchant_key.in_(merchant_keys),
+        )
+    )
+    to_set, to_clear = changed_candidate_flags(
+        [CandidateFlagRow(*row) for row in result.all()],
+        recurring_keys,
+        await get_subscription_name_keys(db=db, user_id=user_id),
+    )
+    for uuids, flag in ((to_set, True), (to_clear, False)):
+        if uuids:
+            await db.execute(
+                update(Transaction)
+                .where(Transaction.uuid.in_(uuids))
+                .values(subscription_candidate=flag)
+            )
+    return len(to_set) + len(to_clear)
+
+
+async def refresh_subscription_candidates_task(
+    organization_id: UUID | None, user_id: UUID, merchant_keys: set[str]
+) -> None:
+    """Background job run after an import commits; uses its own session."""
+    if organization_id is None:
+        return
+    try:
+        async with sessionmanager.session() as db:
+            updated = await refresh_subscription_candidates(
+                db=db,
+                organization_id=organization_id,
+                user_id=user_id,
+                merchant_keys=merchant_keys,
+            )
+            if updated:
+                await bump_data_version(db, organization_id)
+            await db.commit()
+        logger.info(
+            f"Refreshed subscription candidates for {len(merchant_keys)} merchants, "
+            f"{updated} rows changed"
+        )
+    except Exception:
+        logger.error("Error refreshing subscription candidates", exc_info=True)
+
+
+async def rebuild_recurring_series(db: DBSession, organization_id: UUID) -> int:
+    """Recompute every series of an organization from its transactions."""
+    await db.execute(
+        delete(RecurringSeries).where(RecurringSeries.organization_id == organization_id)
+    )
+    history: dict[str, list[tuple[datetime, int | None]]] = defaultdict(list)
+    rows = await db.stream(org_series_history_query(organization_id))
+    async for key, date, amount in rows:
+        history[key].append((date, amount))
+
+    db.add_all(
+        replay_series(new_series(organization_id, key, occurrences[0][0]), occurrences)
+        for key, occurrences in history.items()
+    )
+    return len(history)
@@ -19,7 +19,10 @@ from src.model.models import (
     Transaction,
     User,
 )
-from src.services.subscription_candidate_service import mark_subscription_candidates
+from src.services.recurring_series import (
+    rebuild_recurring_series,
+    refresh_subscription_candidates,
+)
 from src.util.category import get_category_id_from_row
 from src.util.transaction import clean_description, generate_fingerprint
 
@@ -152,10 +155,14 @@ async def seed_demo_data(
     )
     created["categories"] = max(categories_after - categories_before, 0)
 
-    await mark_subscription_candidates(
+    # seeded rows bypass the import pipeline, so derive their series here and
+    # flag candidates from them like an import does
+    await rebuild_recurring_series(db, organization_id_value)
+    await refresh_subscription_candidates(
         db=db,
+        organization_id=organization_id_value,
         user_id=user_id_value,
-        account_id=checking_account_id,
+        merchant_keys={tx.merchant_key for tx in transactions if tx.merchant_key},
     )
     await db.commit()
 
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
-import re
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from statistics import median
 from uuid import UUID
-from sqlalchemy import select, update
-from statistics import median
+from sqlalchemy import select
 from src.database.connect import DBSession
-from src.model.models import Subscription, Transaction
+from src.model.models import Subscription
+from src.util.merchant import canonical_merchant_key, normalize_merchant_key
 from dateutil.relativedelta import relativedelta
 
 
@@ -19,38 +18,8 @@ MAX_INTERVAL_DAYS = 40
 INTERVAL_MATCH_RATIO = 0.6
 AMOUNT_STABILITY_RATIO = 0.7
 MAX_AMOUNT_VARIANCE_RATIO = 0.2
-LOOKBACK_DAYS = 400
 EXCLUDED_TYPES = {"income", "transfer", "refund", "payment", "adjustment", "unknown"}
 
-_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
-_IGNORED_TOKENS = {
-    "inc",
-    "llc",
-    "co",
-    "corp",
-    "payment",
-    "purchase",
-    "pos",
-    "debit",
-    "credit",
-    "visa",
-    "card",
-    "online",
-    "store",
-}
-_NOISY_SUFFIX_TOKENS = {
-    "com",
-    "www",
-    "us",
-    "usa",
-    "billing",
-    "bill",
-    "subscription",
-    "subscriptions",
-    "services",
-    "service",
-}
-
 
 @dataclass(frozen=True)
 class CandidateTxn:
@@ -67,24 +36,6 @@ class CandidateSummary:
     transactions: int
 
 
-def normalize_merchant_key(title: str) -> str:
-    normalized = _NON_ALNUM_RE.sub(" ", (title or "").lower())
-    tokens = [t for t in normalized.split() if t and t not in _IGNORED_TOKENS and not t.isdigit()]
-    return " ".join(tokens[:4]).strip()
-
-
-def canonical_merchant_key(title: str) -> str:
-    key = normalize_merchant_key(title)
-    if not key:
-        return ""
-
-    tokens = key.split()
-    while tokens and tokens[-1] in _NOISY_SUFFIX_TOKENS:
-        tokens.pop()
-
-    return " ".join(tokens[:3]).strip()
-
-
 def infer_frequency(dates: list[datetime]) -> str:
     if len(dates) < 2:
         return "unknown"
@@ -96,7 +47,12 @@ def infer_frequency(dates: list[datetime]) -> str:
     if not intervals:
         return "unknown"
 
-    typical_days = median(intervals)
+    return frequency_for_interval(median(intervals))
+
+
+def frequency_for_interval(typical_days: float | None) -> str:
+    if typical_days is None:
+        return "unknown"
     if typical_days <= 10:
         return "weekly"
     if typical_days <= 20:
@@ -112,6 +68,10 @@ def infer_frequency(dates: list[datetime]) -> str:
 def calculate_next_billing_date(current_billing_date: datetime, billing_cycle: str) -> datetime:
     """
     Calculate next billing date from the most recent billing date.
+
+    The number of elapsed cycles is computed directly instead of stepping one
+    cycle at a time, and every date is anchored on ``current_billing_date`` so
+    month-end days do not drift (Jan 31 -> Feb 28 -> Mar 31).
     
     Args:
         current_billing_date: The last/current billing date
@@ -120,26 +80,32 @@ def calculate_next_billing_date(current_billing_date: datetime, billing_cycle: s
     Returns:
         Next future billing date
     """
-    today = datetime.now()
-    next_date = current_billing_date
-    
-    # Define cycle increments
-    cycle_map = {
-        'weekly': relativedelta(weeks=1),
-        'monthly': relativedelta(months=1),
-        'quarterly': relativedelta(months=3),
-        'yearly': relativedelta(years=1),
+    months_per_cycle = {
+        'monthly': 1,
+        'quarterly': 3,
+        'yearly': 12,
     }
-    
-    if billing_cycle not in cycle_map:
+    if billing_cycle != 'weekly' and billing_cycle not in months_per_cycle:
         raise ValueError(f"Unknown billing cycle: {billing_cycle}")
-    
-    increment = cycle_map[billing_cycle]
-    
-    # Keep adding billing cycles until we find the next future date
-    while next_date <= today:
-        next_date += increment
-    
+
+    today = datetime.now(current_billing_date.tzinfo)
+    if current_billing_date > today:
+        return current_billing_date
+
+    if billing_cycle == 'weekly':
+        elapsed = (today - current_billing_date) // timedelta(weeks=1)
+        return current_billing_date + timedelta(weeks=elapsed + 1)
+
+    step = months_per_cycle[billing_cycle]
+    elapsed_months = (
+        (today.year - current_billing_date.year) * 12
+        + today.month
+        - current_billing_date.month
+    )
+    cycles = elapsed_months // step
+    next_date = current_billing_date + relativedelta(months=cycles * step)
+    if next_date <= today:
+        next_date = current_billing_date + relativedelta(months=(cycles + 1) * step)
     return next_date
 
 
@@ -200,6 +166,12 @@ def group_looks_recurring(transactions: list[CandidateTxn]) -> bool:
         (ordered[i].date.date() - ordered[i - 1].date.date()).days
         for i in range(1, len(ordered))
     ]
+    amounts = [abs(tx.amount) for tx in ordered if tx.amount is not None]
+    return intervals_look_recurring(intervals, amounts)
+
+
+def intervals_look_recurring(intervals: list[int], amounts: list[int]) -> bool:
+    """Interval and amount-stability rules shared with ``recurring_series``."""
     if not intervals:
         return False
 
@@ -207,7 +179,6 @@ def group_looks_recurring(transactions: list[CandidateTxn]) -> bool:
     if (interval_hits / len(intervals)) < INTERVAL_MATCH_RATIO:
         return False
 
-    amounts = [abs(tx.amount) for tx in ordered if tx.amount is not None]
     if not amounts:
         return False
 
@@ -220,129 +191,3 @@ def group_looks_recurring(transactions: list[CandidateTxn]) -> bool:
         for amount in amounts
     )
     return (stable_count / len(amounts)) >= AMOUNT_STABILITY_RATIO
-
-async def transaction_is_subscription_candidate(
-    db: DBSession,
-    user_id: UUID,
-    title: str,
-    amount: int,
-    date: datetime,
-    extra_transactions: list[Transaction] | None = None
-) -> bool:
-    cutoff = date - timedelta(days=400)
-    min_amount = int(abs(amount) * 0.8)
-    max_amount = int(abs(amount) * 1.2)
-
-    rows = (await db.execute(
-        select(Transaction.date)
-        .where(
-            Transaction.user_id == user_id,
-            Transaction.title == title,
-            Transaction.date >= cutoff,
-            Transaction.amount.between(min_amount, max_amount),
-        )
-    )).all()
-    # include the new transaction
-    dates = [tx_date for (tx_date,) in rows]
-   
-    if extra_transactions:
-        for tx in extra_transactions:
-            if (
-                tx.title == title
-                and abs(tx.amount - amount) <= abs(amount) * 0.2
-            ):
-                dates.append(tx.date)
-
-    dates.append(date)
-    # need at least 3 to form a pattern
-    if len(dates) < 3:
-        return False
-
-    ordered = sorted(dates)
-
-    # check monthly-ish spacing
-    intervals = [
-        (ordered[i].date() - ordered[i - 1].date()).days
-        for i in range(1, len(ordered))
-    ]
-
-    monthly_hits = sum(24 <= days <= 40 for days in intervals)
-    if monthly_hits / len(intervals) < 0.6:
-        return False
-
-    # check day-of-month consistency (±3 days)
-    doms = [d.day for d in ordered]
-    center = int(median(doms))
-
-    dom_hits = sum(abs(d - center) <= 3 for d in doms)
-    if dom_hits / len(doms) < 0.7:
-        return False
-
-    return True
-
-
-async def mark_subscription_candidates(
-    db: DBSession,
-    user_id: UUID,
-    account_id: UUID | None = None,
-    lookback_days: int = LOOKBACK_DAYS,
-) -> int:
-    cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
-    subscription_name_keys = await get_subscription_name_keys(db=db, user_id=user_id)
-
-    stmt = select(
-        Transaction.uuid,
-        Transaction.title,
-        Transaction.amount,
-        Transaction.date,
-        Transaction.type,
-    ).where(
-        Transaction.user_id == user_id,
-        Transaction.date >= cutoff,
-    )
-    if account_id is not None:
-        stmt = stmt.where(Transaction.account_id == account_id)
-
-    rows = (await db.execute(stmt)).all()
-
-    grouped: dict[str, list[CandidateTxn]] = defaultdict(list)
-    for tx_uuid, title, amount, date, tx_type in rows:
-        if (tx_type or "").lower() in EXCLUDED_TYPES:
-            continue
-        if date is None:
-            continue
-        key = canonical_merchant_key(title or "")
-        if not key:
-            continue
-        if key in subscription_name_keys:
-            continue
-        grouped[key].append(CandidateTxn(uuid=tx_uuid, date=date, amount=amount))
-
-    candidate_ids = {
-        tx.uuid
-        for txns in grouped.values()
-        if group_looks_recurring(txns)
-        for tx in txns
-    }
-
-    scope_filters = [
-        Transaction.user_id == user_id,
-        Transaction.date >= cutoff,
-    ]
-    if account_id is not None:
-        scope_filters.append(Transaction.account_id == account_id)
-
-    await db.execute(
-        update(Transaction)
-        .where(*scope_filters)
-        .values(subscription_candidate=False)
-    )
-
-    if candidate_ids:
-        await db.execute(
-            update(Transaction)
-            .where(Transaction.uuid.in_(candidate_ids))
-            .values(subscription_candidate=True)
-        )
-
-    return len(candidate_ids)
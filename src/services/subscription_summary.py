@@ -0,0 +1,54 @@
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import func
+
+from src.database.connect import DBSession
+from src.model.models import Subscription
+from src.schemas.subscription import SubscriptionSummaryResponse
+from src.services.query_service import QueryService
+from src.util.types import UserPool
+
+def summarize_subscription_groups(
+    groups: Iterable[tuple[str | None, str | None, int, int]],
+) -> SubscriptionSummaryResponse:
+    """Fold ``(billing_frequency, status, amount_sum, count)`` groups into the summary."""
+    amount_by_frequency: dict[str | None, int] = defaultdict(int)
+    count_by_status: dict[str | None, int] = defaultdict(int)
+    for billing_frequency, status, amount_sum, count in groups:
+        amount_by_frequency[billing_frequency] += int(amount_sum or 0)
+        count_by_status[status] += count
+
+    total_monthly_cost_cents = (
+        amount_by_frequency["monthly"]
+        + amount_by_frequency["yearly"] / 12
+        + amount_by_frequency["weekly"] * 4.33
+        + amount_by_frequency["quarterly"] / 3
+    )
+    return SubscriptionSummaryResponse(
+        total_monthly_cost_cents=round(total_monthly_cost_cents),
+        total_subscriptions_count=sum(count_by_status.values()),
+        total_active_subscriptions_count=count_by_status["active"],
+        total_inactive_subscriptions_count=count_by_status["inactive"],
+        total_paused_subscriptions_count=count_by_status["paused"],
+    )
+
+
+async def build_subscription_summary(
+    db: DBSession,
+    current_user: UserPool,
+    query_service: QueryService,
+) -> SubscriptionSummaryResponse:
+    """Monthly-normalized cost and status counts from one grouped query."""
+    stmt = (
+        query_service.org_filtered_query(model=Subscription, current_user=current_user)
+        .with_only_columns(
+            Subscription.billing_frequency,
+            Subscription.status,
+            func.coalesce(func.sum(Subscription.amount), 0),
+            func.count(),
+        )
+        .group_by(Subscription.billing_frequency, Subscription.status)
+    )
+    result = await db.execute(stmt)
+    return summarize_subscription_groups(result.all())
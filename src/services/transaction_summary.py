@@ -1,15 +1,15 @@
 from datetime import datetime, time, timedelta, timezone
 
 from fastapi import HTTPException
-from sqlalchemy import case, func
+from sqlalchemy import case, func, select
 
 from src.database.connect import DBSession
-from src.model.models import Account, Transaction
+from src.model.models import Account, DailyRollup, Transaction
 from src.schemas.transaction import (
     TransactionSummaryRequest,
     TransactionSummaryResponse,
 )
-from src.services.cash_flow_history import get_effective_timezone
+from src.services.cash_flow_history import get_timezones
 from src.services.query_service import QueryService
 from src.util.types import UserPool
 
@@ -33,46 +33,61 @@ async def build_transaction_summary(
     if not current_user.organization_id:
         raise HTTPException(403, "User does not belong to an organization")
 
-    zone, _ = await get_effective_timezone(db, current_user)
-    local_start = datetime.combine(request.from_date, time.min, tzinfo=zone)
-    local_end = datetime.combine(
-        request.to_date + timedelta(days=1), time.min, tzinfo=zone
-    )
-    start_utc = local_start.astimezone(timezone.utc)
-    end_utc = local_end.astimezone(timezone.utc)
-
-    amount = func.abs(Transaction.amount)
-    base = (
-        query_service.org_filtered_query(
-            model=Transaction,
-            current_user=current_user,
+    zone, timezone_name, rollup_timezone = await get_timezones(db, current_user)
+    if timezone_name == rollup_timezone:
+        # local days match the rollup's, so aggregate per-day rows instead
+        source = DailyRollup
+        amount = DailyRollup.abs_amount_sum
+        count = DailyRollup.transaction_count
+        base = (
+            select(DailyRollup)
+            .join(Account, DailyRollup.account_id == Account.uuid)
+            .where(
+                DailyRollup.organization_id == current_user.organization_id,
+                DailyRollup.local_date.between(request.from_date, request.to_date),
+            )
+        )
+    else:
+        local_start = datetime.combine(request.from_date, time.min, tzinfo=zone)
+        local_end = datetime.combine(
+            request.to_date + timedelta(days=1), time.min, tzinfo=zone
         )
-        .join(Account, Transaction.account_id == Account.uuid)
-        .where(
-            Transaction.date >= start_utc,
-            Transaction.date < end_utc,
-            Transaction.type.in_(("income", "expense", "refund")),
-            Account.account_type.in_(request.account_types),
+        source = Transaction
+        amount = func.abs(Transaction.amount)
+        count = 1
+        base = (
+            query_service.org_filtered_query(
+                model=Transaction,
+                current_user=current_user,
+            )
+            .join(Account, Transaction.account_id == Account.uuid)
+            .where(
+                Transaction.date >= local_start.astimezone(timezone.utc),
+                Transaction.date < local_end.astimezone(timezone.utc),
+            )
         )
+    base = base.where(
+        source.type.in_(("income", "expense", "refund")),
+        Account.account_type.in_(request.account_types),
     )
     statement = base.with_only_columns(
         func.coalesce(
-            func.sum(case((Transaction.type == "expense", amount), else_=0)), 0
+            func.sum(case((source.type == "expense", amount), else_=0)), 0
         ).label("gross_expense"),
         func.coalesce(
-            func.sum(case((Transaction.type == "refund", amount), else_=0)), 0
+            func.sum(case((source.type == "refund", amount), else_=0)), 0
         ).label("refunds"),
         func.coalesce(
-            func.sum(case((Transaction.type == "income", amount), else_=0)), 0
+            func.sum(case((source.type == "income", amount), else_=0)), 0
         ).label("income"),
         func.coalesce(
-            func.sum(case((Transaction.type == "expense", 1), else_=0)), 0
+            func.sum(case((source.type == "expense", count), else_=0)), 0
         ).label("expense_transaction_count"),
         func.coalesce(
-            func.sum(case((Transaction.type == "refund", 1), else_=0)), 0
+            func.sum(case((source.type == "refund", count), else_=0)), 0
         ).label("refund_transaction_count"),
         func.coalesce(
-            func.sum(case((Transaction.type == "income", 1), else_=0)), 0
+            func.sum(case((source.type == "income", count), else_=0)), 0
         ).label("income_transaction_count"),
     )
 
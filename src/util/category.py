@@ -1,8 +1,10 @@
+from typing import Iterable
+from uuid import UUID
 from fastapi import HTTPException
 from src.database.connect import DBSession
-from sqlalchemy import select, or_
+from sqlalchemy import String, column, func, select, or_, values
 from sqlalchemy.orm import selectinload
-from src.model.models import Category, Transaction
+from src.model.models import Category, Transaction, User
 
 
 async def get_category_id_from_row(
@@ -108,4 +110,119 @@ async def get_category_id_from_row(
                 status_code=500, detail=f"Failed to create new category: {e}"
             )
 
-    return found_category.uuid if found_category else None
\ No newline at end of file
+    return found_category.uuid if found_category else None
+
+async def get_uncategorized_category_id(db: DBSession):
+    """Return the global 'UNCATEGORIZED' category, creating it on first use."""
+    result = await db.execute(select(Category).where(Category.type == "UNCATEGORIZED"))
+    uncategorized_category = result.scalar_one_or_none()
+    if uncategorized_category:
+        return uncategorized_category.uuid
+
+    new_uncategorized = Category(
+        type="UNCATEGORIZED",
+        title="Uncategorized",
+        description="Default uncategorized category",
+    )
+    db.add(new_uncategorized)
+    await db.flush()
+    return new_uncategorized.uuid
+
+
+async def resolve_category_ids(
+    keys: Iterable[tuple[str, str | None, str | None]],
+    organization_id: str,
+    db: DBSession,
+) -> dict[tuple[str, str | None, str | None], UUID]:
+    """
+    Batched variant of ``get_category_id_from_row`` for a whole import.
+
+    Applies the same precedence (previous transaction with a similar title,
+    then uncategorized, then the named organization category, created when
+    missing) but resolves every distinct ``(title, category, type)`` key with
+    a fixed number of queries instead of several per row. New categories are
+    flushed, not committed, so they land in the same commit as the import.
+
+    Args:
+        keys (Iterable[tuple]): ``(title, category_name, internal_type)`` keys.
+        organization_id (str): The ID of the user's organization.
+        db (DBSession): The database session.
+
+    Returns:
+        dict: Category UUID for every requested key.
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+
+    # 1. Category of an earlier transaction whose title contains the new title
+    titles = sorted({title for title, _, _ in keys if title})
+    category_by_title: dict[str, UUID] = {}
+    if titles:
+        wanted = values(column("title", String), name="wanted").data(
+            [(title,) for title in titles]
+        )
+        rows = await db.execute(
+            select(wanted.c.title, Transaction.category_id)
+            .select_from(wanted)
+            .join(Transaction, Transaction.title.ilike("%" + wanted.c.title + "%"))
+            .join(User, Transaction.user_id == User.uuid)
+            .where(User.organization_id == organization_id)
+            .distinct(wanted.c.title)
+            .order_by(wanted.c.title)
+        )
+        category_by_title = {title: category_id for title, category_id in rows.all()}
+
+    resolved: dict[tuple[str, str | None, str | None], UUID] = {}
+    pending: list[tuple[str, str | None, str | None]] = []
+    for key in keys:
+        if key[0] in category_by_title:
+            resolved[key] = category_by_title[key[0]]
+        else:
+            pending.append(key)
+
+    # 2. Uncategorized rows share one lookup
+    uncategorized_id = None
+    named: dict[str, list[tuple[str, str | None, str | None]]] = {}
+    for key in pending:
+        category = (key[1] or "").strip()
+        if not category:
+            if uncategorized_id is None:
+                uncategorized_id = await get_uncategorized_category_id(db)
+            resolved[key] = uncategorized_id
+        else:
+            named.setdefault(category.lower(), []).append(key)
+
+    # 3. Organization categories by name, creating the missing ones
+    if named:
+        found = await db.execute(
+            select(func.lower(Category.title), Category.uuid).where(
+                func.lower(Category.title).in_(list(named)),
+                Category.organization_id == organization_id,
+            )
+        )
+        category_by_name = dict(found.all())
+
+        new_categories: dict[str, Category] = {}
+        for name, name_keys in named.items():
+            if name in category_by_name:
+                continue
+            _, category, type_ = name_keys[0]
+            new_categories[name] = Category(
+                title=category.strip(),
+                organization_id=organization_id,
+                slug=category.strip().lower().replace(" ", "-"),
+                type=type_ or "CUSTOM",
+            )
+        if new_categories:
+            db.add_all(new_categories.values())
+            await db.flush()
+            category_by_name.update(
+                {name: category.uuid for name, category in new_categories.items()}
+            )
+
+        for name, name_keys in named.items():
+            for key in name_keys:
+                resolved[key] = category_by_name[name]
+
+    return resolved
@@ -0,0 +1,56 @@
+"""Conditional GET support keyed on the organization data version.
+
+``etag_precondition`` is a route dependency: it derives a strong ETag from the
+path, the caller, the organization data version (see ``analytics_cache``) and
+the sorted query parameters, and answers a matching ``If-None-Match`` with
+``304`` before the route body runs any query.
+"""
+
+import hashlib
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from src.database.connect import DBReadSession
+from src.schemas.user import Perm
+from src.services.analytics_cache import data_version_key
+from src.util.metrics import CacheStats
+from src.util.types import UserPool
+from src.util.user import get_current_user, has_permission
+
+etag_stats = CacheStats("etag")
+
+
+def make_etag(path: str, user_id, version_key: str, query_items) -> str:
+    query = "&".join(f"{key}={value}" for key, value in sorted(query_items))
+    digest = hashlib.sha256(f"{path}|{user_id}|{version_key}|{query}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+async def etag_precondition(
+    request: Request,
+    response: Response,
+    db: DBReadSession,
+    current_user: UserPool = Depends(get_current_user),
+) -> None:
+    # the route reports the permission error itself
+    if not has_permission(current_user, Perm.READ):
+        return
+    version_key = await data_version_key(db, current_user)
+    if version_key is None:
+        return
+    etag = make_etag(
+        request.url.path, current_user.sub, version_key, request.query_params.multi_items()
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        etag_stats.hit()
+        raise HTTPException(status_code=304, headers=headers)
+    etag_stats.miss()
+    response.headers.update(headers)
@@ -0,0 +1,48 @@
+"""Single-pass keyword matching for transaction descriptions.
+
+All keywords are compiled into one case-insensitive regex of the form
+``(?=(kw1)|(kw2)|...)``. The lookahead lets every position report its
+highest-priority keyword, so a scan over the description finds the same winner
+as checking each keyword in order with ``in`` – without re-lowercasing the
+description per keyword or looping over the rules in Python. The alternation
+is still tried at every position, so matching cost grows with the number of
+keywords; the regex engine only makes each extra keyword cheaper.
+"""
+
+import re
+from typing import Generic, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+class KeywordMatcher(Generic[T]):
+    """Maps the first matching keyword (in rule order) to its value."""
+
+    def __init__(self, rules: Iterable[tuple[str, T]]):
+        self.values: list[T] = []
+        alternatives = []
+        for keyword, value in rules:
+            if not keyword:
+                continue
+            alternatives.append(f"({re.escape(keyword)})")
+            self.values.append(value)
+        self._pattern = (
+            re.compile(f"(?=(?:{'|'.join(alternatives)}))", re.IGNORECASE)
+            if alternatives
+            else None
+        )
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None
+
+    def match(self, text: str | None) -> T | None:
+        if self._pattern is None or not text:
+            return None
+        best = None
+        for match in self._pattern.finditer(text):
+            index = match.lastindex - 1
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return None if best is None else self.values[best]
@@ -0,0 +1,64 @@
+"""Startup warmup and graceful shutdown of the API process.
+
+On startup the connection pools open ``DB_WARMUP_CONNECTIONS`` connections
+each and the Cognito signing keys are fetched, so the first requests after a
+deploy or scale-up skip connection setup and the JWKS download. Keyword and
+merchant regexes are compiled when their modules are imported with the app.
+
+Uvicorn stops accepting connections on shutdown and lets running requests
+finish (``--timeout-graceful-shutdown``, set from ``SHUTDOWN_DRAIN_SECONDS``
+in docker-entrypoint.sh) before the lifespan exits; then the shared Redis
+client is closed, a pending slow-query plan is written and the engines are
+disposed.
+Warmup is bounded by ``WARMUP_TIMEOUT_SECONDS``; failures are logged and
+never prevent startup.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+
+from fastapi import FastAPI
+
+from src.database.connect import sessionmanager
+from src.middleware.auth import preload_jwks
+from src.services.analytics_cache import analytics_cache
+from src.util.slow_queries import plan_capture
+
+WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", "5"))
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "10"))
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up() -> None:
+    started = time.perf_counter()
+    connections, keys = await asyncio.gather(
+        asyncio.wait_for(sessionmanager.warmup(WARMUP_CONNECTIONS), WARMUP_TIMEOUT_SECONDS),
+        asyncio.wait_for(asyncio.to_thread(preload_jwks), WARMUP_TIMEOUT_SECONDS),
+        return_exceptions=True,
+    )
+    for name, result in (("database", connections), ("JWKS", keys)):
+        if isinstance(result, Exception):
+            logger.warning(f"{name} warmup failed: {result!r}")
+    logger.info(
+        f"Warmup finished in {time.perf_counter() - started:.3f}s: "
+        f"{connections if isinstance(connections, int) else 0} connections, "
+        f"{keys if isinstance(keys, int) else 0} signing keys"
+    )
+
+
+async def shut_down() -> None:
+    await analytics_cache.close()
+    await plan_capture.wait()
+    plan_capture.close()
+    await sessionmanager.close()
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up()
+    yield
+    await shut_down()
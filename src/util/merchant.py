@@ -0,0 +1,83 @@
+"""Merchant name normalization shared by importers and subscription detection.
+
+Bank descriptions repeat heavily (the same merchant appears every month), so
+every function here is memoized with a bounded LRU cache keyed by its input
+string, and all patterns are compiled once at import time.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+MERCHANT_CACHE_SIZE = int(os.getenv("MERCHANT_CACHE_SIZE", "8192"))
+
+_PPD_ID_RE = re.compile(r"PPD ID: \d+")
+_ID_RE = re.compile(r"ID: \d+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+_IGNORED_TOKENS = frozenset(
+    {
+        "inc",
+        "llc",
+        "co",
+        "corp",
+        "payment",
+        "purchase",
+        "pos",
+        "debit",
+        "credit",
+        "visa",
+        "card",
+        "online",
+        "store",
+    }
+)
+_NOISY_SUFFIX_TOKENS = frozenset(
+    {
+        "com",
+        "www",
+        "us",
+        "usa",
+        "billing",
+        "bill",
+        "subscription",
+        "subscriptions",
+        "services",
+        "service",
+    }
+)
+
+
+@lru_cache(maxsize=MERCHANT_CACHE_SIZE)
+def clean_description(description: str) -> str:
+    """Turn a raw bank description into a transaction title.
+
+    Drops ACH ``PPD ID``/``ID`` suffixes, collapses whitespace, keeps the first
+    five words and title-cases the result.
+    """
+    cleaned = _ID_RE.sub("", _PPD_ID_RE.sub("", description))
+    return " ".join(cleaned.split()[:5]).title()
+
+
+@lru_cache(maxsize=MERCHANT_CACHE_SIZE)
+def normalize_merchant_key(title: str) -> str:
+    normalized = _NON_ALNUM_RE.sub(" ", (title or "").lower())
+    tokens = [t for t in normalized.split() if t and t not in _IGNORED_TOKENS and not t.isdigit()]
+    return " ".join(tokens[:4]).strip()
+
+
+@lru_cache(maxsize=MERCHANT_CACHE_SIZE)
+def canonical_merchant_key(title: str) -> str:
+    key = normalize_merchant_key(title)
+    if not key:
+        return ""
+
+    tokens = key.split()
+    while tokens and tokens[-1] in _NOISY_SUFFIX_TOKENS:
+        tokens.pop()
+
+    return " ".join(tokens[:3]).strip()
+
+
+def merchant_key(title: str | None) -> str | None:
+    """Value stored in ``transactions.merchant_key``; ``None`` when nothing is left."""
+    return canonical_merchant_key(title or "") or None
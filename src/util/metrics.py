@@ -0,0 +1,69 @@
+"""Process metrics exported with ``prometheus_client``.
+
+Counters, gauges and histograms live in this worker's memory, in
+``registry``, and are read by ``GET /health/metrics``; nothing is pushed
+anywhere. Values that already exist elsewhere (pool state, cache hit ratios)
+are produced at scrape time by custom collectors registered with
+``registry.register``.
+"""
+
+from collections import defaultdict
+from typing import Iterable
+
+from prometheus_client import CollectorRegistry, Counter, disable_created_metrics
+from prometheus_client.core import GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+# no *_created series next to every counter and histogram
+disable_created_metrics()
+registry = CollectorRegistry()
+
+
+class CacheStats:
+    """Hit and miss counts of one cache, exported with its hit ratio."""
+
+    requests = Counter(
+        "cache_requests",
+        "Cache lookups by cache and result (hit or miss).",
+        ["cache", "result"],
+        registry=registry,
+    )
+    names: dict[str, None] = {}
+
+    def __init__(self, name: str):
+        self.name = name
+        CacheStats.names[name] = None
+
+    def hit(self) -> None:
+        self.requests.labels(cache=self.name, result="hit").inc()
+
+    def miss(self) -> None:
+        self.requests.labels(cache=self.name, result="miss").inc()
+
+
+def sample_value(name: str, labels: dict[str, str] | None = None) -> float:
+    """Current value of one sample in ``registry``, 0 when it was never set."""
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+class CacheHitRatioCollector(Collector):
+    def collect(self) -> Iterable[Metric]:
+        ratio = GaugeMetricFamily(
+            "cache_hit_ratio", "Share of cache lookups served from cache since start.", labels=["cache"]
+        )
+        # cache -> result -> lookups, read from the counter itself: querying
+        # the registry from here would collect this collector again
+        lookups: dict[str, dict[str, float]] = defaultdict(dict)
+        for metric in CacheStats.requests.collect():
+            for sample in metric.samples:
+                if sample.name == "cache_requests_total":
+                    lookups[sample.labels["cache"]][sample.labels["result"]] = sample.value
+        for name in CacheStats.names:
+            hits = lookups[name].get("hit", 0.0)
+            total = hits + lookups[name].get("miss", 0.0)
+            if total:
+                ratio.add_metric([name], hits / total)
+        yield ratio
+
+
+registry.register(CacheHitRatioCollector())
@@ -1,6 +1,8 @@
+from typing import Iterable
+from uuid import UUID
 from src.database.connect import DBSession
-from sqlalchemy import select, or_
-from src.model.models import Project
+from sqlalchemy import String, column, select, or_, values
+from src.model.models import Project, User
 
 
 async def get_project_id_from_row(
@@ -17,3 +19,26 @@ async def get_project_id_from_row(
     
     project = result.scalar_one_or_none()
     return project.uuid if project else None
+
+
+async def resolve_project_ids(
+    titles: Iterable[str], organization_id: str, db: DBSession
+) -> dict[str, UUID]:
+    """Batched ``get_project_id_from_row``: one query for every distinct title."""
+    titles = sorted({title for title in titles if title})
+    if not titles:
+        return {}
+
+    wanted = values(column("title", String), name="wanted").data(
+        [(title,) for title in titles]
+    )
+    rows = await db.execute(
+        select(wanted.c.title, Project.uuid)
+        .select_from(wanted)
+        .join(Project, Project.project_name.ilike("%" + wanted.c.title + "%"))
+        .join(User, Project.user_id == User.uuid)
+        .where(User.organization_id == organization_id)
+        .distinct(wanted.c.title)
+        .order_by(wanted.c.title)
+    )
+    return {title: project_id for title, project_id in rows.all()}
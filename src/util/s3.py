@@ -1,5 +1,4 @@
-import boto3
-from botocore.exceptions import ClientError
+import functools
 import os
 from dotenv import load_dotenv
 
@@ -11,7 +10,7 @@ class S3Client:
     """
     S3Client provides utility methods to interact with an AWS S3 bucket.
     Attributes:
-        s3_client (boto3.client): The boto3 S3 client instance.
+        s3_client (boto3.client): The boto3 S3 client instance, created on first use.
         bucket_name (str): The name of the S3 bucket to interact with.
     Methods:
         __init__(bucket_name):
@@ -33,11 +32,26 @@ class S3Client:
             Raises:
                 FileNotFoundError: If the specified file does not exist in the bucket.
                 Exception: For other errors encountered during retrieval.
+        get_s3_stream(key):
+            Opens a file in S3 without downloading it, so callers can read it incrementally.
+            Args:
+                key (str): The S3 object key (file path in the bucket).
+            Returns:
+                botocore.response.StreamingBody: The unread body of the object.
+            Raises:
+                FileNotFoundError: If the specified file does not exist in the bucket.
+                Exception: For other errors encountered during retrieval.
     """
     def __init__(self, bucket_name):
-        self.s3_client = boto3.client('s3')
         self.bucket_name = bucket_name
-        
+
+    @functools.cached_property
+    def s3_client(self):
+        # boto3 is slow to import and only import jobs use S3
+        import boto3
+
+        return boto3.client('s3')
+
     
     def generate_presigned_url(self, key, content_type, expiration=3600):
         return self.s3_client.generate_presigned_url(
@@ -51,9 +65,14 @@ class S3Client:
         )
         
     def get_s3_file(self, key):
+        return self.get_s3_stream(key).read().decode('utf-8')
+
+    def get_s3_stream(self, key):
+        from botocore.exceptions import ClientError
+
         try:
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
-            return response['Body'].read().decode('utf-8')
+            return response['Body']
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == 'NoSuchKey':
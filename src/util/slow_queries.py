@@ -0,0 +1,163 @@
+"""Slow-query log with optional query plans.
+
+Every statement that takes longer than ``SLOW_QUERY_MS`` is logged with its
+SQL, the shape of its bound parameters (types, never values) and the route
+of the request that ran it; the timings come from the cursor events of
+``src.middleware.perf``. With ``SLOW_QUERY_PLAN_FILE`` set, slow ``SELECT``
+statements without a row-locking clause (``FOR UPDATE``/``FOR SHARE``) are
+also re-run under ``EXPLAIN (ANALYZE, BUFFERS)`` in a background task on their
+own pooled connection, inside a transaction that is rolled back, and the plan
+is appended to that file (rotated at ``SLOW_QUERY_PLAN_FILE_BYTES``). Each statement shape is explained at most
+once per ``SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS``, one plan at a time, so an
+endpoint that is slow for one organization yields its plan without doubling
+the load.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from logging.handlers import RotatingFileHandler
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.middleware.perf import current_metrics, statement_shape
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+SLOW_QUERY_PLAN_FILE = os.getenv("SLOW_QUERY_PLAN_FILE")
+SLOW_QUERY_PLAN_FILE_BYTES = int(os.getenv("SLOW_QUERY_PLAN_FILE_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_PLAN_FILE_BACKUPS = 5
+SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS = float(
+    os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS", "3600")
+)
+EXPLAINED_SHAPES_MAX = 1024
+# EXPLAIN ANALYZE runs the statement, so only reads are explained
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+# EXPLAIN ANALYZE would take these row locks too
+LOCKING_CLAUSE_RE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.I)
+
+logger = logging.getLogger(__name__)
+# set inside plan captures, whose own EXPLAIN statements are not logged
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar("explaining", default=False)
+
+
+def parameter_shape(parameters: Any) -> str:
+    """Types of ``parameters``; lists show their length instead of their items."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {parameter_shape(v)}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, tuple):
+        return "(" + ", ".join(parameter_shape(value) for value in parameters) + ")"
+    if isinstance(parameters, list):
+        return f"list[{len(parameters)}]"
+    return type(parameters).__name__
+
+
+class PlanCapture:
+    """Schedules and writes ``EXPLAIN`` output for slow statements."""
+
+    def __init__(
+        self,
+        path: str | None = SLOW_QUERY_PLAN_FILE,
+        interval_seconds: float = SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+    ):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self._explained: "OrderedDict[str, float]" = OrderedDict()
+        self._running: asyncio.Task | None = None
+        self._file: RotatingFileHandler | None = None
+
+    def write(self, message: str) -> None:
+        if self._file is None:
+            self._file = RotatingFileHandler(
+                self.path,
+                maxBytes=SLOW_QUERY_PLAN_FILE_BYTES,
+                backupCount=SLOW_QUERY_PLAN_FILE_BACKUPS,
+            )
+            self._file.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self._file.handle(logging.makeLogRecord({"msg": message, "levelno": logging.INFO}))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _due(self, shape: str) -> bool:
+        explained = self._explained.get(shape)
+        return explained is None or time.monotonic() - explained >= self.interval_seconds
+
+    def schedule(self, engine: Engine, statement: str, parameters: Any, header: str) -> None:
+        prefix = EXPLAIN_PREFIXES.get(engine.dialect.name)
+        if (
+            not self.path
+            or prefix is None
+            or not statement.lstrip().upper().startswith("SELECT")
+            or LOCKING_CLAUSE_RE.search(statement)
+            or (self._running is not None and not self._running.done())
+        ):
+            return
+        shape = statement_shape(statement)
+        if not self._due(shape):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # synchronous engine, e.g. in scripts
+            return
+        self._explained[shape] = time.monotonic()
+        self._explained.move_to_end(shape)
+        while len(self._explained) > EXPLAINED_SHAPES_MAX:
+            self._explained.popitem(last=False)
+        # a fresh context, so the plan's statements count towards no request
+        self._running = loop.create_task(
+            self.explain(AsyncEngine(engine), prefix + statement, parameters, header),
+            context=contextvars.Context(),
+        )
+
+    async def explain(
+        self, engine: AsyncEngine, statement: str, parameters: Any, header: str
+    ) -> None:
+        _explaining.set(True)
+        try:
+            async with engine.connect() as connection:
+                async with connection.begin() as transaction:
+                    rows = (await connection.exec_driver_sql(statement, parameters)).all()
+                    await transaction.rollback()
+        except Exception:
+            logger.warning(f"Could not capture plan for slow query: {header}", exc_info=True)
+            return
+        plan = "\n".join(" | ".join(str(value) for value in row) for row in rows)
+        self.write(f"{header}\n{statement}\n{plan}\n")
+
+    async def wait(self) -> None:
+        if self._running is not None:
+            await asyncio.gather(self._running, return_exceptions=True)
+
+
+plan_capture = PlanCapture()
+
+
+def log_slow_query(conn, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+    """``perf.statement_observers`` hook; registered in src/database/connect.py."""
+    elapsed_ms = seconds * 1000
+    if SLOW_QUERY_MS <= 0 or elapsed_ms < SLOW_QUERY_MS or _explaining.get():
+        return
+    metrics = current_metrics.get()
+    route = metrics.route if metrics is not None and metrics.route else "-"
+    if executemany and parameters:
+        shape = f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    else:
+        shape = parameter_shape(parameters)
+    header = f"route={route} duration_ms={elapsed_ms:.1f} parameters={shape}"
+    logger.warning(
+        f"Slow query {header}\n{statement}",
+        extra={"route": route, "duration_ms": round(elapsed_ms, 1), "parameters": shape},
+    )
+    if not executemany:
+        plan_capture.schedule(conn.engine, statement, parameters, header)
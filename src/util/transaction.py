@@ -8,11 +8,15 @@ from src.model.models import (
     Transaction,
     User,
 )
-from sqlalchemy import select
+from sqlalchemy import String, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from src.schemas.transaction import TransactionCreate, TransactionResponse
 import hashlib
 from src.database.connect import DBSession
-import re
+from src.util.keyword_matcher import KeywordMatcher
+from src.util.merchant import clean_description, merchant_key
+from src.services.analytics_cache import bump_user_data_version
+from src.services.recurring_series import update_recurring_series
 from typing import Iterable, Mapping
 from uuid import UUID
 
@@ -62,6 +66,7 @@ async def create_transaction_in_db(
             currency=transaction_data.currency or "USD",
             date=date,
             title=title,
+            merchant_key=merchant_key(title),
             type=transaction_data.type or "expense",
             description=transaction_data.description,
             fingerprint=generate_fingerprint(
@@ -76,13 +81,19 @@ async def create_transaction_in_db(
             ),
         )
 
+        # read before the commit expires them
+        account_name = account.account_name if account else None
+        category_title = category.title
+
         db.add(transaction)
+        await update_recurring_series(db, user.organization_id, [transaction])
+        await bump_user_data_version(db, user_id)
         await db.commit()
         await db.refresh(transaction)
         return TransactionResponse(
             account_id=transaction.account_id,
-            account_name=account.account_name if account else None,
-            category=category.title,
+            account_name=account_name,
+            category=category_title,
             category_id=transaction.category_id,
             project_id=transaction.project_id,
             uuid=transaction.uuid,
@@ -194,6 +205,62 @@ async def _get_subscription_or_404(
     return subscription
 
 
+
+async def link_transactions_to_subscriptions(
+    db: DBSession,
+    organization_id: UUID,
+    links: list[tuple[str, UUID]],
+) -> dict[tuple[str, UUID], int]:
+    """Link every transaction titled ``name`` to ``subscription_id`` for each pair.
+
+    Runs as one statement: the pairs are a ``VALUES`` list, subscriptions
+    outside the organization are dropped, and a data-modifying CTE runs
+    ``UPDATE ... FROM`` and returns the matched titles so each pair gets its
+    own count. Transaction names must be unique within ``links``.
+
+    Returns:
+        Updated row count for each ``(transaction_name, subscription_id)`` pair.
+    """
+    if not links:
+        return {}
+    org_user_ids = select(User.uuid).where(User.organization_id == organization_id)
+    pairs = (
+        values(
+            column("transaction_name", String),
+            column("subscription_id", PG_UUID(as_uuid=True)),
+            name="pairs",
+        )
+        .data(links)
+        .cte("pairs")
+    )
+    valid = (
+        select(pairs.c.transaction_name, pairs.c.subscription_id)
+        .join(Subscription, Subscription.uuid == pairs.c.subscription_id)
+        .where(Subscription.user_id.in_(org_user_ids))
+        .cte("valid")
+    )
+    updated = (
+        update(Transaction)
+        .where(
+            Transaction.title == valid.c.transaction_name,
+            Transaction.user_id.in_(org_user_ids),
+        )
+        .values(subscription_id=valid.c.subscription_id, subscription_candidate=False)
+        .returning(Transaction.title)
+        .cte("updated")
+    )
+    stmt = (
+        select(
+            pairs.c.transaction_name,
+            pairs.c.subscription_id,
+            func.count(updated.c.title),
+        )
+        .outerjoin(updated, updated.c.title == pairs.c.transaction_name)
+        .group_by(pairs.c.transaction_name, pairs.c.subscription_id)
+    )
+    result = await db.execute(stmt)
+    return {(name, subscription_id): count for name, subscription_id, count in result.all()}
+
 internal_transaction_types = {
     "DEBIT": "expense",
     "CREDIT": "income",
@@ -215,6 +282,9 @@ internal_transaction_types = {
     # Credit card Types
 }
 
+# Every key doubles as a description keyword, checked in dict order.
+description_type_matcher = KeywordMatcher(internal_transaction_types.items())
+
 
 def get_internal_type(type, description):
     """
@@ -230,11 +300,7 @@ def get_internal_type(type, description):
     if type in internal_transaction_types:
         return internal_transaction_types[type]
 
-    for keyword, internal_type in internal_transaction_types.items():
-       if keyword.lower() in description.lower():
-           return internal_type
-
-    return "unknown"
+    return description_type_matcher.match(description) or "unknown"
 
 credit_card_internal_types = {
     "Sale": "expense",
@@ -306,13 +372,3 @@ def generate_fingerprint(date, title, amount_cents):
     if isinstance(date, datetime):
         date = date.isoformat()
     return hashlib.sha256(f"{date}{title}{amount_cents}".encode()).hexdigest()[:32]
-
-
-def clean_description(description: str) -> str:
-    cleaned = re.sub(r"PPD ID: \d+", "", description)
-    cleaned = re.sub(r"ID: \d+", "", cleaned)
-    cleaned = re.sub(r"\s{2,}", " ", cleaned)
-    cleaned = cleaned.strip()
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = " ".join(cleaned.split()[:5])
-    return cleaned.title()
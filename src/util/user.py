@@ -1,13 +1,82 @@
+import os
+import time
+from collections import OrderedDict
+
 from fastapi import Request, HTTPException
-from sqlalchemy import select
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
 
 from src.schemas.user import ROLE_PERMISSIONS, Perm
-from src.database.connect import DBSession
+from src.database.connect import sessionmanager
 from src.model.models import User, UserRole
+from src.util.metrics import CacheStats
 from .types import UserPool
 
+# role and organization changes made by other workers show up after this long
+CURRENT_USER_CACHE_TTL_SECONDS = float(os.getenv("CURRENT_USER_CACHE_TTL_SECONDS", "5"))
+CURRENT_USER_CACHE_SIZE = 10000
+# users written by the session's transaction, dropped from the cache on commit
+CHANGED_USERS_INFO = "current_user_changed"
+
+# sub -> (expires at, user); only registered users are cached
+_current_users: "OrderedDict[str, tuple[float, UserPool]]" = OrderedDict()
+current_user_stats = CacheStats("current_user")
+
+
+def invalidate_current_user(sub=None) -> None:
+    """Drop one cached user, or all of them when ``sub`` is None."""
+    if sub is None:
+        _current_users.clear()
+    else:
+        _current_users.pop(str(sub), None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = [
+        user.uuid
+        for user in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(user, User)
+    ]
+    if changed:
+        session.info.setdefault(CHANGED_USERS_INFO, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_changed_users(session: Session) -> None:
+    for sub in session.info.pop(CHANGED_USERS_INFO, ()):
+        invalidate_current_user(sub)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_changed_users(session: Session) -> None:
+    session.info.pop(CHANGED_USERS_INFO, None)
+
+
+def _cached_user(sub: str) -> UserPool | None:
+    entry = _current_users.get(sub)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _current_users[sub]
+        return None
+    _current_users.move_to_end(sub)
+    return entry[1]
+
+
+def _remember_user(sub: str, user: UserPool) -> None:
+    if CURRENT_USER_CACHE_TTL_SECONDS <= 0:
+        return
+    _current_users[sub] = (time.monotonic() + CURRENT_USER_CACHE_TTL_SECONDS, user)
+    _current_users.move_to_end(sub)
+    while len(_current_users) > CURRENT_USER_CACHE_SIZE:
+        _current_users.popitem(last=False)
+
+
 """ current authenticated user from user pool """
-async def get_current_user(request: Request, db: DBSession) -> UserPool:
+async def get_current_user(request: Request) -> UserPool:
+    # Looked up in a short session of its own, not the request's, and cached:
+    # requests answered from a cache or with a 304 never check out a connection.
     u = request.state.user
     if not u:
         raise HTTPException(status_code=401, detail="Not authenticated")
@@ -19,15 +88,24 @@ async def get_current_user(request: Request, db: DBSession) -> UserPool:
     if not email or not sub:
         raise HTTPException(status_code=400, detail="Invalid user data")
     
+    cached = _cached_user(sub)
+    if cached is not None:
+        current_user_stats.hit()
+        return cached
+    current_user_stats.miss()
+
     stmt = (
         select(User)
         .where(User.uuid == sub)
     )
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    async with sessionmanager.session() as db:
+        result = await db.execute(stmt)
+        user = result.scalar_one_or_none()
 
-    if user:
-        return UserPool(email=user.email, sub=user.uuid, organization_id=user.organization_id, role=user.role.name)
+        if user:
+            current_user = UserPool(email=user.email, sub=user.uuid, organization_id=user.organization_id, role=user.role.name)
+            _remember_user(sub, current_user)
+            return current_user
 
     return UserPool(email=email, sub=sub, organization_id=None, role="User_Viewer")
 
@@ -0,0 +1,12 @@
+import pytest
+
+from src.middleware.query_budget import collect_violations
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets():
+    """Fail any test during which a route ran more statements than its ``@query_budget``."""
+    with collect_violations() as violations:
+        yield
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(violations))
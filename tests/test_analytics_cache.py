@@ -0,0 +1,174 @@
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from src.model.models import AccountTypeEnum, UserRole
+from src.routers.account import create_account
+from src.schemas.account import AccountCreate
+from src.schemas.category import CategorySpendingResponse
+from src.services.analytics_cache import (
+    BUMPED_INFO,
+    AnalyticsCache,
+    _forget_bumped_versions,
+    bump_data_version,
+    normalize_params,
+    version_keys,
+)
+from src.services.daily_rollup import rebuild_daily_rollup
+from src.services.recurring_series import refresh_subscription_candidates_task
+from src.util.types import UserPool
+
+
+def version_row(organization_id, version):
+    return SimpleNamespace(first=lambda: (organization_id, version, "America/New_York", None))
+
+
+class NormalizeParamsTests(TestCase):
+    def test_id_lists_are_order_insensitive(self):
+        self.assertEqual(
+            normalize_params({"account_ids": ["b", "a"], "granularity": "day"}),
+            normalize_params({"granularity": "day", "account_ids": ["a", "b"]}),
+        )
+        self.assertNotEqual(
+            normalize_params({"granularities": ["day", "month"]}),
+            normalize_params({"granularities": ["month", "day"]}),
+        )
+
+
+class AnalyticsCacheTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.organization_id = uuid4()
+        self.current_user = UserPool(
+            sub=uuid4(), email="cache@example.com", organization_id=self.organization_id
+        )
+        self.db = AsyncMock()
+        self.db.info = {}
+        version_keys.clear()
+        self.result = [CategorySpendingResponse(category_id=uuid4(), category="Food", expense=-500)]
+        self.compute = AsyncMock(return_value=self.result)
+
+    async def get(self, cache, params):
+        return await cache.get_or_compute(
+            self.db,
+            self.current_user,
+            endpoint="category-spending",
+            params=params,
+            response_type=list[CategorySpendingResponse],
+            compute=self.compute,
+        )
+
+    async def test_same_version_and_params_reuse_the_result(self):
+        cache = AnalyticsCache(max_size=8)
+        self.db.execute.return_value = version_row(self.organization_id, 3)
+
+        first = await self.get(cache, {"from_date": None})
+        second = await self.get(cache, {"from_date": None})
+
+        self.assertIs(first, second)
+        self.assertEqual(self.compute.await_count, 1)
+        # version looked up once per session
+        self.assertEqual(self.db.execute.await_count, 1)
+
+    async def test_bumped_version_recomputes(self):
+        cache = AnalyticsCache(max_size=8)
+        self.db.execute.return_value = version_row(self.organization_id, 3)
+        await self.get(cache, {})
+        # a write commits the bump, the next request has a new session
+        writer = SimpleNamespace(info={}, execute=AsyncMock())
+        await bump_data_version(writer, self.organization_id)
+        _forget_bumped_versions(writer)
+        self.db.info = {}
+        self.db.execute.return_value = version_row(self.organization_id, 4)
+        await self.get(cache, {})
+
+        self.assertEqual(self.compute.await_count, 2)
+
+    async def test_lru_is_bounded(self):
+        cache = AnalyticsCache(max_size=2)
+        self.db.execute.return_value = version_row(self.organization_id, 1)
+        for page in range(3):
+            await self.get(cache, {"page": page})
+
+        self.assertEqual(len(cache._entries), 2)
+
+    async def test_users_without_organization_are_not_cached(self):
+        cache = AnalyticsCache(max_size=8)
+        self.db.execute.return_value = SimpleNamespace(first=lambda: None)
+        await self.get(cache, {})
+        await self.get(cache, {})
+
+        self.assertEqual(self.compute.await_count, 2)
+        self.assertEqual(len(cache._entries), 0)
+
+    async def test_version_key_is_reused_across_sessions(self):
+        cache = AnalyticsCache(max_size=8)
+        self.db.execute.return_value = version_row(self.organization_id, 3)
+        await self.get(cache, {})
+        self.db.info = {}
+        await self.get(cache, {})
+
+        self.assertEqual(self.db.execute.await_count, 1)
+        self.assertEqual(self.compute.await_count, 1)
+
+    async def test_rolled_back_bump_keeps_version_keys(self):
+        cache = AnalyticsCache(max_size=8)
+        self.db.execute.return_value = version_row(self.organization_id, 3)
+        await self.get(cache, {})
+        writer = SimpleNamespace(info={}, execute=AsyncMock())
+        await bump_data_version(writer, self.organization_id)
+
+        self.assertEqual(writer.info[BUMPED_INFO], {self.organization_id})
+        self.assertIsNotNone(version_keys.get(self.current_user.sub))
+
+
+class WriteBumpTests(IsolatedAsyncioTestCase):
+    """Writes outside the routers' usual commit paths must bump the version too."""
+
+    def setUp(self):
+        self.organization_id = uuid4()
+        self.db = AsyncMock()
+        self.db.info = {}
+
+    async def test_account_creation_bumps(self):
+        current_user = UserPool(
+            sub=uuid4(),
+            email="owner@example.com",
+            organization_id=self.organization_id,
+            role=UserRole.Admin,
+        )
+        account = AccountCreate(
+            account_name="Checking",
+            account_type=AccountTypeEnum.CHECKING,
+            institution="Chase",
+            last_four="1234",
+        )
+        self.db.add = MagicMock()
+        with patch("src.routers.account.bump_data_version") as bump:
+            await create_account(account_data=account, db=self.db, current_user=current_user)
+
+        bump.assert_awaited_once_with(self.db, self.organization_id)
+
+    async def test_rollup_rebuild_bumps(self):
+        self.db.scalar.return_value = None
+        self.db.execute.return_value = SimpleNamespace(all=lambda: [])
+        with patch("src.services.daily_rollup.bump_data_version") as bump:
+            await rebuild_daily_rollup(self.db, self.organization_id)
+
+        bump.assert_awaited_once_with(self.db, self.organization_id)
+
+    async def test_candidate_refresh_bumps_only_when_flags_change(self):
+        for updated, bumps in ((2, 1), (0, 0)):
+            session = MagicMock()
+            session.return_value.__aenter__.return_value = self.db
+            with (
+                patch("src.services.recurring_series.sessionmanager.session", session),
+                patch(
+                    "src.services.recurring_series.refresh_subscription_candidates",
+                    AsyncMock(return_value=updated),
+                ),
+                patch("src.services.recurring_series.bump_data_version") as bump,
+            ):
+                await refresh_subscription_candidates_task(self.organization_id, uuid4(), {"netflix"})
+
+            self.assertEqual(bump.await_count, bumps)
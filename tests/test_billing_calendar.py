@@ -0,0 +1,67 @@
+from datetime import date, datetime, timedelta, timezone
+from unittest import TestCase
+
+from dateutil.relativedelta import relativedelta
+
+from src.services.billing_calendar import project_billing_dates
+from src.services.subscription_candidate_service import calculate_next_billing_date
+
+
+def projected(anchor, frequency, start, end, until=None):
+    index, dates = project_billing_dates(
+        [anchor], [frequency], start, end, ends=[until] if until else None
+    )
+    return [value.item() for value in dates]
+
+
+class ProjectBillingDatesTests(TestCase):
+    def test_monthly_dates_are_anchored_and_clamped_to_month_end(self):
+        self.assertEqual(
+            projected(date(2025, 1, 31), "monthly", date(2026, 1, 1), date(2026, 4, 30)),
+            [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30)],
+        )
+
+    def test_weekly_dates_skip_elapsed_periods(self):
+        self.assertEqual(
+            projected(date(2000, 1, 3), "weekly", date(2026, 10, 19), date(2026, 11, 2)),
+            [date(2026, 10, 19), date(2026, 10, 26), date(2026, 11, 2)],
+        )
+
+    def test_window_respects_anchor_and_end_date(self):
+        self.assertEqual(
+            projected(date(2026, 3, 15), "quarterly", date(2026, 1, 1), date(2027, 12, 31), until=date(2026, 12, 1)),
+            [date(2026, 3, 15), date(2026, 6, 15), date(2026, 9, 15)],
+        )
+        self.assertEqual(projected(date(2026, 3, 15), "yearly", date(2026, 3, 16), date(2027, 3, 14)), [])
+
+    def test_many_subscriptions_are_ordered_by_subscription(self):
+        index, dates = project_billing_dates(
+            [date(2026, 1, 5), date(2026, 1, 1)],
+            ["monthly", "weekly"],
+            date(2026, 1, 1),
+            date(2026, 1, 15),
+        )
+
+        self.assertEqual(index.tolist(), [0, 1, 1, 1])
+        self.assertEqual(
+            [value.item() for value in dates],
+            [date(2026, 1, 5), date(2026, 1, 1), date(2026, 1, 8), date(2026, 1, 15)],
+        )
+
+
+class CalculateNextBillingDateTests(TestCase):
+    def test_matches_stepping_for_old_weekly_subscriptions(self):
+        start = datetime.now(timezone.utc) - timedelta(days=7 * 3000 + 2)
+        next_date = calculate_next_billing_date(start, "weekly")
+
+        self.assertGreater(next_date, datetime.now(timezone.utc))
+        self.assertLessEqual(next_date - datetime.now(timezone.utc), timedelta(weeks=1))
+        self.assertEqual((next_date - start) % timedelta(weeks=1), timedelta(0))
+
+    def test_monthly_stays_on_anchor_day(self):
+        start = datetime(2020, 1, 31, tzinfo=timezone.utc)
+        next_date = calculate_next_billing_date(start, "monthly")
+
+        self.assertGreater(next_date, datetime.now(timezone.utc))
+        self.assertLessEqual(next_date - relativedelta(months=1), datetime.now(timezone.utc))
+        self.assertEqual(next_date.day, min(31, (next_date + relativedelta(day=31)).day))
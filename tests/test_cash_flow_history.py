@@ -0,0 +1,67 @@
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.dialects import postgresql
+
+from src.schemas.transaction import CashFlowHistoryRequest
+from src.services.cash_flow_history import _bucket_starts, get_cash_flow_history
+from src.services.query_service import QueryService
+from src.util.types import UserPool
+
+
+class BucketStartsTests(TestCase):
+    def test_weeks_start_on_monday_and_months_on_the_first(self):
+        self.assertEqual(
+            _bucket_starts(date(2026, 1, 7), date(2026, 1, 20), "week"),
+            [date(2026, 1, 5), date(2026, 1, 12), date(2026, 1, 19)],
+        )
+        self.assertEqual(
+            _bucket_starts(date(2025, 11, 30), date(2026, 1, 1), "month"),
+            [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)],
+        )
+
+    def test_days_are_inclusive(self):
+        self.assertEqual(len(_bucket_starts(date(2026, 2, 1), date(2026, 2, 28), "day")), 28)
+
+
+class CashFlowHistoryTests(IsolatedAsyncioTestCase):
+    async def test_several_granularities_come_from_one_grouping_sets_query(self):
+        rows = [
+            SimpleNamespace(day_start=datetime(2026, 1, 2), month_start=None,
+                            income=0, expense=500, refunds=0, transaction_count=2),
+            SimpleNamespace(day_start=None, month_start=datetime(2026, 1, 1),
+                            income=1000, expense=500, refunds=100, transaction_count=4),
+        ]
+        db = AsyncMock()
+        db.execute.return_value = SimpleNamespace(all=lambda: rows)
+        current_user = UserPool(sub=uuid4(), email="cash@example.com", organization_id=uuid4())
+        request = CashFlowHistoryRequest(
+            from_date=date(2026, 1, 1),
+            to_date=date(2026, 1, 3),
+            granularities=["day", "month", "day"],
+        )
+
+        with patch(
+            "src.services.cash_flow_history.get_timezones",
+            new=AsyncMock(return_value=(ZoneInfo("UTC"), "UTC", "UTC")),
+        ):
+            response = await get_cash_flow_history(db, current_user, QueryService(), request)
+
+        self.assertEqual(db.execute.await_count, 1)
+        sql = str(
+            db.execute.await_args.args[0].compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        self.assertIn("GROUP BY GROUPING SETS(date_trunc('day'", sql)
+        self.assertEqual([series.granularity for series in response.series], ["day", "month"])
+        self.assertEqual(response.periods, response.series[0].periods)
+        self.assertEqual(
+            [period.expense for period in response.series[0].periods], [0, 500, 0]
+        )
+        self.assertEqual(response.series[1].periods[0].net, 600)
+        self.assertEqual(response.series[1].periods[0].transaction_count, 4)
@@ -0,0 +1,102 @@
+import contextlib
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.connect import DatabaseSessionManager
+from src.model.models import User, UserRole
+from src.util.user import (
+    _collect_changed_users,
+    _forget_changed_users,
+    get_current_user,
+    invalidate_current_user,
+)
+
+
+def request_for(sub):
+    return SimpleNamespace(state=SimpleNamespace(user={"sub": sub, "email": "me@example.com"}))
+
+
+class CurrentUserCacheTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        invalidate_current_user()
+        self.sub = str(uuid4())
+        self.db = AsyncMock(spec=AsyncSession)
+        self.sessionmanager = SimpleNamespace(
+            session=lambda: contextlib.nullcontext(self.db)
+        )
+
+    def returns(self, user):
+        self.db.execute.return_value = SimpleNamespace(scalar_one_or_none=lambda: user)
+
+    async def test_registered_user_is_looked_up_once(self):
+        organization_id = uuid4()
+        self.returns(
+            SimpleNamespace(
+                email="me@example.com",
+                uuid=self.sub,
+                organization_id=organization_id,
+                role=UserRole.User_Admin,
+            )
+        )
+        with patch("src.util.user.sessionmanager", self.sessionmanager):
+            first = await get_current_user(request_for(self.sub))
+            second = await get_current_user(request_for(self.sub))
+
+        self.assertIs(first, second)
+        self.assertEqual(first.organization_id, organization_id)
+        self.assertEqual(self.db.execute.await_count, 1)
+
+    async def test_unregistered_user_is_not_cached(self):
+        self.returns(None)
+        with patch("src.util.user.sessionmanager", self.sessionmanager):
+            first = await get_current_user(request_for(self.sub))
+            await get_current_user(request_for(self.sub))
+
+        self.assertIsNone(first.organization_id)
+        self.assertEqual(first.role, "User_Viewer")
+        self.assertEqual(self.db.execute.await_count, 2)
+
+    async def test_invalidate_forces_a_new_lookup(self):
+        self.returns(
+            SimpleNamespace(
+                email="me@example.com", uuid=self.sub, organization_id=None, role=UserRole.User_Viewer
+            )
+        )
+        with patch("src.util.user.sessionmanager", self.sessionmanager):
+            await get_current_user(request_for(self.sub))
+            invalidate_current_user(self.sub)
+            await get_current_user(request_for(self.sub))
+
+        self.assertEqual(self.db.execute.await_count, 2)
+
+    async def test_committed_user_change_forces_a_new_lookup(self):
+        self.returns(
+            SimpleNamespace(
+                email="me@example.com", uuid=self.sub, organization_id=None, role=UserRole.User_Viewer
+            )
+        )
+        session = SimpleNamespace(
+            new=[], dirty=[User(uuid=self.sub, role=UserRole.Admin)], deleted=[], info={}
+        )
+        with patch("src.util.user.sessionmanager", self.sessionmanager):
+            await get_current_user(request_for(self.sub))
+            _collect_changed_users(session, None)
+            await get_current_user(request_for(self.sub))
+            _forget_changed_users(session)
+            await get_current_user(request_for(self.sub))
+
+        self.assertEqual(self.db.execute.await_count, 2)
+
+
+class LazyCheckoutTests(IsolatedAsyncioTestCase):
+    async def test_session_without_statements_never_checks_out(self):
+        manager = DatabaseSessionManager("postgresql+asyncpg://u:p@localhost/db")
+        async with manager.session() as session:
+            session.info["client_key"] = "someone"
+
+        self.assertEqual(manager._engine.pool.checkedout(), 0)
+        await manager.close()
@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta, timezone
+from unittest import TestCase
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from src.database import connect
+
+from src.services.daily_rollup import (
+    RollupEntry,
+    aggregate_deltas,
+    upsert_rollup_statement,
+    whole_local_days,
+)
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def entry(user_id, amount, date_, **overrides):
+    values = dict(
+        user_id=user_id,
+        date=date_,
+        amount=amount,
+        account_id=None,
+        category_id=None,
+        project_id=None,
+        type="expense",
+    )
+    values.update(overrides)
+    return RollupEntry(**values)
+
+
+class AggregateDeltasTests(TestCase):
+    def setUp(self):
+        self.user_id = uuid4()
+        self.organization_id = uuid4()
+        self.organizations = {self.user_id: (self.organization_id, NEW_YORK)}
+
+    def test_buckets_by_organization_local_day(self):
+        late_evening = datetime(2026, 3, 2, 3, 30, tzinfo=timezone.utc)
+        deltas = aggregate_deltas(
+            [
+                (entry(self.user_id, -1200, late_evening), 1),
+                (entry(self.user_id, -800, late_evening + timedelta(hours=1)), 1),
+            ],
+            self.organizations,
+        )
+
+        self.assertEqual(
+            deltas,
+            {
+                (self.organization_id, date(2026, 3, 1), None, None, None, "expense"): [-2000, 2000, 2],
+            },
+        )
+
+    def test_update_moves_amount_between_keys_and_drops_net_zero(self):
+        category_id = uuid4()
+        when = datetime(2026, 3, 5, 12, tzinfo=timezone.utc)
+        old = entry(self.user_id, -500, when)
+        new = entry(self.user_id, -500, when, category_id=category_id)
+        unchanged = entry(self.user_id, -100, when)
+
+        deltas = aggregate_deltas(
+            [(old, -1), (new, 1), (unchanged, -1), (unchanged, 1)], self.organizations
+        )
+
+        self.assertEqual(
+            deltas,
+            {
+                (self.organization_id, date(2026, 3, 5), None, None, None, "expense"): [500, -500, -1],
+                (self.organization_id, date(2026, 3, 5), None, category_id, None, "expense"): [-500, 500, 1],
+            },
+        )
+
+    def test_users_without_organization_are_skipped(self):
+        when = datetime(2026, 3, 5, tzinfo=timezone.utc)
+
+        self.assertEqual(aggregate_deltas([(entry(uuid4(), 100, when), 1)], self.organizations), {})
+
+    def test_upsert_adds_to_existing_sums(self):
+        deltas = {(self.organization_id, date(2026, 3, 5), None, None, None, "expense"): [-5, 5, 1]}
+
+        sql = str(upsert_rollup_statement(deltas).compile(dialect=postgresql.dialect()))
+
+        self.assertIn(
+            "ON CONFLICT (organization_id, local_date, account_id, category_id, project_id, type)",
+            sql,
+        )
+        self.assertIn("amount_sum = (daily_rollup.amount_sum + excluded.amount_sum)", sql)
+
+
+class WholeLocalDaysTests(TestCase):
+    def test_local_midnight_bounds_cover_every_day(self):
+        first, last = whole_local_days(
+            datetime(2026, 6, 1, tzinfo=NEW_YORK),
+            datetime(2026, 6, 30, 23, 59, 59, 999999, tzinfo=NEW_YORK),
+            NEW_YORK,
+        )
+
+        self.assertEqual((first, last), (date(2026, 6, 1), date(2026, 6, 30)))
+
+    def test_partial_edge_days_are_excluded(self):
+        first, last = whole_local_days(
+            datetime(2026, 6, 1, 4, tzinfo=timezone.utc),
+            datetime(2026, 6, 30, tzinfo=timezone.utc),
+            NEW_YORK,
+        )
+
+        self.assertEqual((first, last), (date(2026, 6, 1), date(2026, 6, 28)))
+
+    def test_open_bounds(self):
+        self.assertEqual(whole_local_days(None, None, NEW_YORK), (None, None))
+
+
+class RegistrationTests(TestCase):
+    def test_flush_hook_registered_with_the_session(self):
+        self.assertTrue(event.contains(Session, "after_flush", connect._maintain_daily_rollup))
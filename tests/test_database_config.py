@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+from src.database.config import EngineSettings
+from src.database.pool import InstrumentedAsyncQueuePool
+
+
+class EngineSettingsTests(TestCase):
+    def test_defaults_disable_echo_and_enable_pre_ping(self):
+        kwargs = EngineSettings.from_env({}).engine_kwargs()
+
+        self.assertFalse(kwargs["echo"])
+        self.assertTrue(kwargs["pool_pre_ping"])
+        self.assertIs(kwargs["poolclass"], InstrumentedAsyncQueuePool)
+        self.assertEqual(
+            kwargs["connect_args"]["server_settings"],
+            {"application_name": "wealth-wing-data"},
+        )
+        self.assertNotIn("command_timeout", kwargs["connect_args"])
+
+    def test_reads_environment(self):
+        settings = EngineSettings.from_env(
+            {
+                "DB_ECHO": "true",
+                "DB_POOL_SIZE": "20",
+                "DB_MAX_OVERFLOW": "0",
+                "DB_STATEMENT_CACHE_SIZE": "0",
+                "DB_COMMAND_TIMEOUT": "15",
+                "DB_STATEMENT_TIMEOUT_MS": "5000",
+                "DB_APPLICATION_NAME": "ww-worker",
+            }
+        )
+        kwargs = settings.engine_kwargs()
+
+        self.assertTrue(kwargs["echo"])
+        self.assertEqual((kwargs["pool_size"], kwargs["max_overflow"]), (20, 0))
+        self.assertEqual(
+            kwargs["connect_args"],
+            {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "server_settings": {
+                    "application_name": "ww-worker",
+                    "statement_timeout": "5000",
+                },
+                "command_timeout": 15.0,
+            },
+        )
@@ -0,0 +1,123 @@
+import csv
+import io
+from datetime import datetime, timezone
+from unittest import TestCase
+
+from src.model.models import AccountTypeEnum
+from src.services.bank_importers.declarative import (
+    BankSpec,
+    CompiledBankSpec,
+    load_spec_importers,
+)
+from src.services.import_manager import select_importer
+
+SIGNED_SPEC = {
+    "name": "example_checking",
+    "account_types": ["CHECKING"],
+    "header": ["Date", "Payee", "Amount", "Kind", "Notes"],
+    "columns": {
+        "date": ["Date"],
+        "description": ["Payee"],
+        "amount": ["Amount"],
+        "type": ["Kind"],
+        "memo": ["Notes"],
+    },
+    "date_formats": ["%d.%m.%Y"],
+    "type_mapping": {"CARD": "expense"},
+    "type_fallback": "keywords",
+}
+
+
+class BankSpecTests(TestCase):
+    def test_rejects_split_spec_without_debit_and_credit_columns(self):
+        data = dict(SIGNED_SPEC, sign_convention="split")
+
+        with self.assertRaises(ValueError):
+            BankSpec.from_dict(data)
+
+    def test_rejects_unknown_sign_convention(self):
+        with self.assertRaises(ValueError):
+            BankSpec.from_dict(dict(SIGNED_SPEC, sign_convention="backwards"))
+
+
+class CompiledBankSpecTests(TestCase):
+    def test_normalizes_rows_using_header_positions(self):
+        compiled = CompiledBankSpec(BankSpec.from_dict(SIGNED_SPEC))
+        normalize = compiled.bind(["Notes", "Kind", "Amount", "Payee", "Date"])
+
+        row = normalize(["lunch", "CARD", "-12.50", "CAFE  PPD ID: 99", "03.02.2026"])
+
+        self.assertEqual(row.date, datetime(2026, 2, 3, tzinfo=timezone.utc))
+        self.assertEqual(row.title, "Cafe")
+        self.assertEqual(row.amount_cents, -1250)
+        self.assertEqual(row.internal_type, "expense")
+        self.assertEqual(row.memo, "lunch")
+        self.assertIsNone(row.category)
+
+    def test_keyword_fallback_and_inverted_sign(self):
+        spec = BankSpec.from_dict(dict(SIGNED_SPEC, sign_convention="inverted"))
+        normalize = CompiledBankSpec(spec).bind(SIGNED_SPEC["header"])
+
+        row = normalize(["01.01.2026", "Online Transfer to SAV", "20.00", "", ""])
+
+        self.assertEqual(row.amount_cents, -2000)
+        self.assertEqual(row.internal_type, "transfer")
+
+    def test_missing_required_column_fails_before_parsing_rows(self):
+        normalize_for = CompiledBankSpec(BankSpec.from_dict(SIGNED_SPEC)).bind
+
+        with self.assertRaises(ValueError):
+            normalize_for(["Payee", "Amount"])
+
+
+class ShippedSpecTests(TestCase):
+    def test_shipped_specs_load_and_are_selected_by_header(self):
+        importers = {cls.spec.spec.name: cls for cls in load_spec_importers()}
+        capital_one = importers["capital_one_credit"]
+
+        selected = select_importer(
+            file_name="export.csv",
+            file_type="text/csv",
+            account_type=AccountTypeEnum.CREDIT_CARD,
+            header_line="Transaction Date,Posted Date,Card No.,Description,Category,Debit,Credit",
+        )
+        self.assertEqual(selected.spec.spec.name, capital_one.spec.spec.name)
+
+        normalize = capital_one.spec.bind(list(capital_one.spec.spec.header))
+        charge = normalize(["2026-01-03", "2026-01-04", "1234", "NETFLIX.COM", "Entertainment", "15.49", ""])
+        payment = normalize(["2026-01-05", "2026-01-05", "1234", "AUTOPAY", "Payment/Credit", "", "500.00"])
+
+        self.assertEqual((charge.amount_cents, charge.internal_type), (-1549, "expense"))
+        self.assertEqual((payment.amount_cents, payment.internal_type), (50000, "payment"))
+
+    def test_bom_prefixed_lower_case_header_binds_the_detected_columns(self):
+        capital_one = {cls.spec.spec.name: cls for cls in load_spec_importers()}["capital_one_credit"]
+        content = (
+            "\ufefftransaction date,posted date,card no.,description,category,debit,credit\n"
+            "2026-01-03,2026-01-04,1234,NETFLIX.COM,Entertainment,15.49,\n"
+        )
+        header, row = csv.reader(io.StringIO(content))
+
+        selected = select_importer(
+            file_name="export.csv",
+            file_type="text/csv",
+            account_type=AccountTypeEnum.CREDIT_CARD,
+            header_line=content.splitlines()[0],
+        )
+        charge = selected.spec.bind(header)(row)
+
+        self.assertEqual(selected.spec.spec.name, capital_one.spec.spec.name)
+        # the transaction date, not the posted-date alias behind it
+        self.assertEqual(charge.date, datetime(2026, 1, 3, tzinfo=timezone.utc))
+        self.assertEqual(charge.amount_cents, -1549)
+
+    def test_spec_header_is_rejected_for_other_account_types(self):
+        with self.assertRaises(ValueError) as raised:
+            select_importer(
+                file_name="export.csv",
+                file_type="text/csv",
+                account_type=AccountTypeEnum.CHECKING,
+                header_line="Transaction Date,Posted Date,Card No.,Description,Category,Debit,Credit",
+            )
+
+        self.assertIn("CREDIT_CARD accounts", str(raised.exception))
@@ -0,0 +1,29 @@
+from unittest import TestCase
+from uuid import uuid4
+
+from src.util.etag import etag_matches, make_etag
+
+
+class EtagTests(TestCase):
+    def test_query_parameter_order_does_not_change_the_etag(self):
+        user_id = uuid4()
+        first = make_etag("/transaction/all", user_id, "org:3::", [("page", "2"), ("page_size", "50")])
+        second = make_etag("/transaction/all", user_id, "org:3::", [("page_size", "50"), ("page", "2")])
+
+        self.assertEqual(first, second)
+        self.assertTrue(first.startswith('"') and first.endswith('"'))
+
+    def test_version_and_user_are_part_of_the_etag(self):
+        user_id = uuid4()
+        etag = make_etag("/account/all", user_id, "org:3::", [])
+
+        self.assertNotEqual(etag, make_etag("/account/all", user_id, "org:4::", []))
+        self.assertNotEqual(etag, make_etag("/account/all", uuid4(), "org:3::", []))
+
+    def test_if_none_match_lists_and_weak_validators(self):
+        etag = '"abc"'
+
+        self.assertTrue(etag_matches('"xyz", W/"abc"', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"xyz"', etag))
+        self.assertFalse(etag_matches(None, etag))
@@ -0,0 +1,79 @@
+import io
+from unittest import TestCase
+
+from src.model.models import AccountTypeEnum
+from src.services.bank_importers.base import (
+    BaseBankImporter,
+    header_signature_from_line,
+)
+from src.services.bank_importers.chase_credit import ChaseCreditImporter
+from src.services.bank_importers.chase_debit import ChaseDebitImporter
+from src.services.import_manager import (
+    build_signature_index,
+    select_importer,
+    sniff_header,
+)
+
+
+class HeaderSignatureTests(TestCase):
+    def test_normalizes_case_whitespace_bom_and_trailing_delimiters(self):
+        self.assertEqual(
+            header_signature_from_line('\ufeffPost Date, "Amount",DESCRIPTION,'),
+            frozenset({"post date", "amount", "description"}),
+        )
+
+    def test_duplicate_signatures_are_rejected(self):
+        class Duplicate(BaseBankImporter):
+            header_signature = ChaseDebitImporter.header_signature
+
+        with self.assertRaises(ValueError):
+            build_signature_index([ChaseDebitImporter, Duplicate])
+
+
+class SelectImporterTests(TestCase):
+    def test_header_wins_over_account_type(self):
+        importer_cls = select_importer(
+            file_name="activity.csv",
+            file_type="text/csv",
+            account_type=AccountTypeEnum.CHECKING,
+            header_line="Transaction Date,Post Date,Description,Category,Type,Amount,Memo",
+        )
+
+        self.assertIs(importer_cls, ChaseCreditImporter)
+
+    def test_unknown_header_falls_back_to_account_type(self):
+        importer_cls = select_importer(
+            file_name="activity.csv",
+            file_type="csv",
+            account_type=AccountTypeEnum.CHECKING,
+            header_line="Some,Other,Columns",
+        )
+
+        self.assertIs(importer_cls, ChaseDebitImporter)
+
+    def test_raises_when_nothing_matches(self):
+        with self.assertRaises(ValueError):
+            select_importer(
+                file_name="activity.pdf",
+                file_type="application/pdf",
+                account_type=AccountTypeEnum.SAVINGS,
+                header_line="Some,Other,Columns",
+            )
+
+
+class SniffHeaderTests(TestCase):
+    def test_reads_only_until_first_line_and_keeps_consumed_bytes(self):
+        body = (
+            b"Details,Posting Date,Description,Amount,Type,Balance,Check or Slip #\r\n"
+            + b"DEBIT,01/02/2026,COFFEE,-4.50,DEBIT_CARD,100.00,,\n" * 1000
+        )
+        stream = io.BytesIO(body)
+
+        header_line, head = sniff_header(stream, chunk_size=64)
+
+        self.assertEqual(
+            header_line,
+            "Details,Posting Date,Description,Amount,Type,Balance,Check or Slip #",
+        )
+        self.assertLess(len(head), len(body))
+        self.assertEqual(head + stream.read(), body)
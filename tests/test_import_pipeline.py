@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+from src.services.bank_importers.chase_credit import ChaseCreditImporter
+from src.services.bank_importers.chase_debit import ChaseDebitImporter
+from src.util.types import UserPool
+
+CHASE_DEBIT_CSV = (
+    "Details,Posting Date,Description,Amount,Type,Balance,Check or Slip #,Category\n"
+    "DEBIT,03/02/2026,CORNER CAFE,-4.50,DEBIT_CARD,995.50,,Coffee\n"
+)
+CHASE_CREDIT_CSV = (
+    "Transaction Date,Post Date,Description,Category,Type,Amount,Memo\n"
+    "03/02/2026,03/03/2026,CORNER CAFE,Coffee,Sale,-4.50,\n"
+)
+
+
+class CategoryTypeTests(IsolatedAsyncioTestCase):
+    """Categories created during an import keep the type each importer gave them."""
+
+    async def import_category_keys(self, importer_cls, content):
+        db = AsyncMock()
+        # no stored fingerprints: every row is new
+        db.execute.return_value = SimpleNamespace(
+            scalars=lambda: SimpleNamespace(all=lambda: [])
+        )
+        current_user = UserPool(
+            sub=uuid4(), email="import@example.com", organization_id=uuid4(), role="Admin"
+        )
+        requested = []
+
+        async def resolve_category_ids(keys, organization_id, db):
+            resolved = {key: uuid4() for key in keys}
+            requested.extend(resolved)
+            return resolved
+
+        module = "src.services.bank_importers.pipeline"
+        with (
+            patch(f"{module}.get_rule_matcher", AsyncMock(return_value=None)),
+            patch(f"{module}.resolve_category_ids", resolve_category_ids),
+            patch(f"{module}.resolve_project_ids", AsyncMock(return_value={})),
+            patch(f"{module}.get_existing_subscription_ids", AsyncMock(return_value={})),
+            patch(f"{module}.flag_subscription_candidates", AsyncMock()),
+        ):
+            importer = importer_cls(content, db, None, current_user)
+            transactions = await importer.parse_csv_transactions(
+                SimpleNamespace(uuid=uuid4(), account_id=uuid4())
+            )
+
+        self.assertEqual(len(transactions), 1)
+        return requested
+
+    async def test_debit_imports_create_untyped_categories(self):
+        keys = await self.import_category_keys(ChaseDebitImporter, CHASE_DEBIT_CSV)
+
+        self.assertEqual(keys, [("Corner Cafe", "Coffee", None)])
+
+    async def test_credit_imports_create_categories_of_the_row_type(self):
+        keys = await self.import_category_keys(ChaseCreditImporter, CHASE_CREDIT_CSV)
+
+        self.assertEqual(keys, [("Corner Cafe", "Coffee", "expense")])
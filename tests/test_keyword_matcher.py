@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from src.services.categorization_rules import RuleOutcome, compile_rules
+from src.util.keyword_matcher import KeywordMatcher
+from src.util.transaction import get_internal_type, internal_transaction_types
+
+
+def first_keyword_in_order(description: str):
+    for keyword, internal_type in internal_transaction_types.items():
+        if keyword.lower() in description.lower():
+            return internal_type
+    return "unknown"
+
+
+class KeywordMatcherTests(TestCase):
+    def test_rule_order_wins_over_position_in_text(self):
+        matcher = KeywordMatcher([("transfer to", "transfer"), ("online", "expense")])
+
+        self.assertEqual(matcher.match("ONLINE TRANSFER TO SAV"), "transfer")
+        self.assertEqual(matcher.match("Online purchase"), "expense")
+        self.assertIsNone(matcher.match("Grocery"))
+
+    def test_keywords_are_literal_and_case_insensitive(self):
+        matcher = KeywordMatcher([("a.b (c)", 1)])
+
+        self.assertEqual(matcher.match("x A.B (C) y"), 1)
+        self.assertIsNone(matcher.match("axb (c)"))
+
+    def test_empty_matcher_is_falsy(self):
+        self.assertFalse(KeywordMatcher([]))
+        self.assertIsNone(KeywordMatcher([]).match("anything"))
+
+    def test_get_internal_type_matches_the_keyword_loop(self):
+        descriptions = [
+            "Online Transfer to SAV ...1234",
+            "Payment to Chase card ending in 1234",
+            "ACME PAYROLL PPD ID: 123",
+            "Zelle deposit from friend",
+            "Online Payment 9876 To Utility",
+            "Coffee shop",
+        ]
+        for description in descriptions:
+            self.assertEqual(
+                get_internal_type("Unknown", description),
+                first_keyword_in_order(description),
+                description,
+            )
+
+
+class CategorizationRuleTests(TestCase):
+    def test_compiled_rules_return_type_and_category(self):
+        matcher = compile_rules((("netflix", "expense", None), ("payroll", "income", None)))
+
+        self.assertEqual(
+            matcher.match("Acme Payroll"),
+            RuleOutcome(internal_type="income", category_id=None),
+        )
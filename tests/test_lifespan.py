@@ -0,0 +1,26 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+from src.database.connect import DatabaseSessionManager
+from src.middleware.auth import get_jwks_client, preload_jwks
+from src.util.lifespan import warm_up
+
+
+class WarmupTests(IsolatedAsyncioTestCase):
+    async def test_failures_do_not_prevent_startup(self):
+        with patch(
+            "src.util.lifespan.sessionmanager.warmup",
+            AsyncMock(side_effect=OSError("connection refused")),
+        ), patch("src.util.lifespan.preload_jwks", side_effect=OSError("offline")):
+            await warm_up()
+
+    async def test_no_connections_requested(self):
+        manager = DatabaseSessionManager("postgresql+asyncpg://u:p@localhost/db")
+        self.assertEqual(await manager.warmup(0), 0)
+        await manager.close()
+
+    def test_jwks_client_is_shared(self):
+        url = "https://cognito.example.com/.well-known/jwks.json"
+        self.assertIs(get_jwks_client(url), get_jwks_client(url))
+        with patch.dict("os.environ", {"COGNITO_JWKS_URL": ""}):
+            self.assertEqual(preload_jwks(), 0)
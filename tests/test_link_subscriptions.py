@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from src.model.models import UserRole
+from src.routers.transaction import update_transaction_subscriptions
+from src.schemas.transaction import TransactionBulkUpdateSubscriptionRequest
+from src.util.transaction import link_transactions_to_subscriptions
+from src.util.types import UserPool
+
+
+def compiled(statement) -> str:
+    return " ".join(
+        str(
+            statement.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+        .upper()
+        .split()
+    )
+
+
+class LinkTransactionsToSubscriptionsTests(IsolatedAsyncioTestCase):
+    async def test_transactions_and_subscriptions_are_scoped_to_the_organization(self):
+        organization_id = uuid4()
+        subscription_id = uuid4()
+        db = AsyncMock()
+        db.execute.return_value = SimpleNamespace(all=lambda: [("Netflix", subscription_id, 3)])
+
+        counts = await link_transactions_to_subscriptions(
+            db=db, organization_id=organization_id, links=[("Netflix", subscription_id)]
+        )
+
+        self.assertEqual(counts, {("Netflix", subscription_id): 3})
+        sql = compiled(db.execute.await_args.args[0])
+        org_users = (
+            "IN (SELECT USER_TABLE.UUID FROM USER_TABLE "
+            f"WHERE USER_TABLE.ORGANIZATION_ID = '{str(organization_id).upper()}')"
+        )
+        self.assertIn(f"WHERE SUBSCRIPTIONS.USER_ID {org_users}", sql)
+        self.assertIn(f"TRANSACTIONS.USER_ID {org_users}", sql)
+        self.assertIn("UPDATE TRANSACTIONS SET SUBSCRIPTION_ID=VALID.SUBSCRIPTION_ID", sql)
+        self.assertEqual(db.execute.await_count, 1)
+
+    async def test_no_links_runs_no_statement(self):
+        db = AsyncMock()
+
+        self.assertEqual(
+            await link_transactions_to_subscriptions(db=db, organization_id=uuid4(), links=[]),
+            {},
+        )
+        db.execute.assert_not_awaited()
+
+
+class UpdateTransactionSubscriptionsTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.own_subscription = uuid4()
+        self.foreign_subscription = uuid4()
+        self.request = TransactionBulkUpdateSubscriptionRequest(
+            links=[
+                {"transaction_name": " Netflix ", "subscription_id": self.own_subscription},
+                {"transaction_name": "Gym", "subscription_id": self.foreign_subscription},
+            ]
+        )
+
+    def user(self, organization_id=None, role=UserRole.User_Editor.value):
+        return UserPool(
+            sub=uuid4(), email="link@example.com", organization_id=organization_id, role=role
+        )
+
+    async def test_pairs_outside_the_organization_report_zero(self):
+        organization_id = uuid4()
+        db = AsyncMock()
+        db.info = {}
+        # only pairs whose subscription belongs to the organization come back counted
+        db.execute.return_value = SimpleNamespace(
+            all=lambda: [
+                ("Netflix", self.own_subscription, 2),
+                ("Gym", self.foreign_subscription, 0),
+            ]
+        )
+
+        response = await update_transaction_subscriptions(
+            request=self.request, db=db, current_user=self.user(organization_id)
+        )
+
+        self.assertEqual(response.updated_count, 2)
+        self.assertEqual(
+            [(result.transaction_name, result.updated_count) for result in response.results],
+            [("Netflix", 2), ("Gym", 0)],
+        )
+        link_sql = compiled(db.execute.await_args_list[0].args[0])
+        self.assertIn(str(organization_id).upper(), link_sql)
+        db.commit.assert_awaited_once()
+
+    async def test_users_without_organization_or_write_permission_are_rejected(self):
+        viewer = self.user(uuid4(), UserRole.User_Viewer.value)
+        for user in (self.user(organization_id=None), viewer):
+            db = AsyncMock()
+            with self.assertRaises(HTTPException) as raised:
+                await update_transaction_subscriptions(
+                    request=self.request, db=db, current_user=user
+                )
+            self.assertEqual(raised.exception.status_code, 403)
+            db.execute.assert_not_awaited()
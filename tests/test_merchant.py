@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from src.util.merchant import (
+    canonical_merchant_key,
+    clean_description,
+    merchant_key,
+)
+
+
+class MerchantTests(TestCase):
+    def test_clean_description_drops_ach_ids_and_keeps_five_words(self):
+        self.assertEqual(
+            clean_description("ACME CORP PAYROLL PPD ID: 123456 DIRECT DEP EXTRA WORDS"),
+            "Acme Corp Payroll Direct Dep",
+        )
+
+    def test_canonical_key_drops_noise_tokens(self):
+        self.assertEqual(canonical_merchant_key("Netflix.Com Subscription"), "netflix")
+        self.assertEqual(canonical_merchant_key("POS DEBIT Spotify USA 1234"), "spotify")
+
+    def test_merchant_key_is_none_when_nothing_remains(self):
+        self.assertIsNone(merchant_key("Online Payment 42"))
+        self.assertIsNone(merchant_key(None))
+
+    def test_results_are_memoized(self):
+        clean_description.cache_clear()
+        clean_description("Coffee Shop 42")
+        clean_description("Coffee Shop 42")
+
+        self.assertEqual(clean_description.cache_info().hits, 1)
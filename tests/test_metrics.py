@@ -0,0 +1,59 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from prometheus_client import generate_latest
+
+from src.routers.health_check import PoolCollector
+from src.services.bank_importers.pipeline import ImportRun
+from src.util.metrics import CacheStats, registry, sample_value
+
+
+class CacheStatsTests(TestCase):
+    def test_cache_hit_ratio(self):
+        stats = CacheStats("test_ratio")
+        stats.hit()
+        stats.hit()
+        stats.hit()
+        stats.miss()
+
+        self.assertEqual(sample_value("cache_hit_ratio", {"cache": "test_ratio"}), 0.75)
+
+
+class PoolCollectorTests(TestCase):
+    def test_primary_and_replica_pools_are_labelled(self):
+        status = {
+            "size": 5,
+            "checked_out": 2,
+            "checkouts": 40,
+            "replicas": [{"size": 3, "checked_out": 1, "checkouts": 7}],
+        }
+        with patch("src.routers.health_check.sessionmanager.pool_status", return_value=status):
+            text = generate_latest(registry).decode()
+            checked_out = sample_value("db_pool_checked_out", {"pool": "replica_0"})
+
+        self.assertEqual(checked_out, 1)
+        self.assertIn("# TYPE db_pool_checkouts_total counter", text)
+        self.assertIn('db_pool_checkouts_total{pool="primary"} 40.0', text)
+        self.assertNotIn("db_pool_timeouts_total{", text)
+
+    def test_no_pool_no_samples(self):
+        with patch("src.routers.health_check.sessionmanager.pool_status", return_value={}):
+            self.assertEqual(list(PoolCollector().collect()), [])
+
+
+class ImportRunTests(TestCase):
+    def test_stages_are_exported_per_importer(self):
+        run = ImportRun()
+        run.rows = 40
+        for stage in ("parse", "dedupe", "resolve", "insert"):
+            run.mark(stage)
+        run.record("TestImporter")
+
+        self.assertEqual(set(run.stages), {"parse", "dedupe", "resolve", "insert"})
+        self.assertEqual(
+            sample_value(
+                "import_stage_seconds_count", {"importer": "TestImporter", "stage": "insert"}
+            ),
+            1,
+        )
+        self.assertEqual(sample_value("import_rows_total", {"importer": "TestImporter"}), 40)
@@ -0,0 +1,163 @@
+from datetime import datetime, timezone
+import io
+from unittest import TestCase
+
+from src.model.models import AccountTypeEnum
+from src.services.bank_importers.ofx import (
+    OfxImporter,
+    batched,
+    fitid_fingerprint,
+    iter_ofx_transactions,
+    iter_text_chunks,
+    normalize_ofx_transactions,
+)
+from src.services.import_manager import select_importer
+
+SGML_OFX = """OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+ENCODING:USASCII
+CHARSET:1252
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKTRANLIST>
+<DTSTART>20260101
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20260105120000[-5:EST]
+<TRNAMT>-15.49
+<FITID>2026010501
+<NAME>NETFLIX.COM
+<MEMO>Streaming
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DIRECTDEP
+<DTPOSTED>20260115
+<TRNAMT>2500.00
+<FITID>2026011502
+<NAME>ACME PAYROLL
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DIRECTDEP
+<DTPOSTED>20260115
+<TRNAMT>2500.00
+<FITID>2026011502
+<NAME>ACME PAYROLL
+</STMTTRN>
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+XML_OFX = """<?xml version="1.0" encoding="UTF-8" standalone="no"?>
+<?OFX OFXHEADER="200" VERSION="220" SECURITY="NONE" OLDFILEUID="NONE" NEWFILEUID="NONE"?>
+<OFX>
+  <CREDITCARDMSGSRSV1><CCSTMTTRNRS><CCSTMTRS>
+    <BANKTRANLIST>
+      <STMTTRN>
+        <TRNTYPE>DEBIT</TRNTYPE>
+        <DTPOSTED>20260203000000.000</DTPOSTED>
+        <TRNAMT>-42.10</TRNAMT>
+        <FITID>A1</FITID>
+        <NAME>CORNER MARKET</NAME>
+      </STMTTRN>
+      <STMTTRN>
+        <TRNTYPE>CREDIT</TRNTYPE>
+        <DTPOSTED>20260210</DTPOSTED>
+        <TRNAMT>300.00</TRNAMT>
+        <FITID>A2</FITID>
+        <NAME>AUTOMATIC PAYMENT - THANK YOU</NAME>
+      </STMTTRN>
+    </BANKTRANLIST>
+  </CCSTMTRS></CCSTMTTRNRS></CREDITCARDMSGSRSV1>
+</OFX>
+"""
+
+
+def chunked(text: str, size: int):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class OfxParsingTests(TestCase):
+    def test_sgml_rows_are_parsed_across_chunk_boundaries(self):
+        state = {}
+        rows = list(
+            normalize_ofx_transactions(
+                iter_ofx_transactions(chunked(SGML_OFX, 7), state), state
+            )
+        )
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0].date, datetime(2026, 1, 5, tzinfo=timezone.utc))
+        self.assertEqual(rows[0].title, "Netflix.Com")
+        self.assertEqual(rows[0].amount_cents, -1549)
+        self.assertEqual(rows[0].internal_type, "expense")
+        self.assertEqual(rows[0].memo, "Streaming")
+        self.assertEqual(rows[0].fingerprint, "fitid:2026010501")
+        self.assertEqual(rows[1].internal_type, "income")
+
+    def test_xml_credit_card_statement(self):
+        state = {}
+        rows = list(
+            normalize_ofx_transactions(
+                iter_ofx_transactions(chunked(XML_OFX, 50), state), state
+            )
+        )
+
+        self.assertTrue(state["credit_card"])
+        self.assertEqual(
+            [(row.amount_cents, row.internal_type) for row in rows],
+            [(-4210, "expense"), (30000, "payment")],
+        )
+
+    def test_long_fitids_are_hashed_to_fit_the_fingerprint_column(self):
+        fingerprint = fitid_fingerprint("X" * 200)
+
+        self.assertEqual(len(fingerprint), 64)
+        self.assertTrue(fingerprint.startswith("fitid:"))
+
+    def test_text_chunks_decode_multibyte_characters_split_between_reads(self):
+        data = "<NAME>CAFÉ\n".encode("utf-8")
+
+        text = "".join(iter_text_chunks(data[:9], io.BytesIO(data[9:]), chunk_size=1))
+
+        self.assertEqual(text, "<NAME>CAFÉ\n")
+
+
+class OfxSelectionTests(TestCase):
+    def test_selected_from_sgml_header_or_extension(self):
+        self.assertIs(
+            select_importer(
+                file_name="statement.txt",
+                file_type="text/plain",
+                account_type=AccountTypeEnum.CHECKING,
+                header_line="OFXHEADER:100",
+            ),
+            OfxImporter,
+        )
+        self.assertIs(
+            select_importer(
+                file_name="Statement.QFX",
+                file_type="application/octet-stream",
+                account_type=AccountTypeEnum.CREDIT_CARD,
+                header_line='<?xml version="1.0"?>',
+            ),
+            OfxImporter,
+        )
+
+
+class BatchedTests(TestCase):
+    def test_pulls_one_batch_at_a_time(self):
+        pulled = []
+
+        def rows():
+            for index in range(5):
+                pulled.append(index)
+                yield index
+
+        batches = batched(rows(), 2)
+
+        self.assertEqual(next(batches), [0, 1])
+        self.assertEqual(pulled, [0, 1])
+        self.assertEqual(list(batches), [[2, 3], [4]])
@@ -0,0 +1,110 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import create_engine, text
+
+from src.middleware.perf import (
+    PerfMiddleware,
+    RequestMetrics,
+    TimedRoute,
+    current_metrics,
+)
+from src.util.metrics import sample_value
+
+
+async def call(app, path):
+    """Run one GET through ``app``; returns the response start message and body."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start, body
+
+
+class PerfMiddlewareTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        router = APIRouter(route_class=TimedRoute)
+
+        @router.get("/items/{item_id}")
+        async def get_item(item_id: int):
+            return {"item_id": item_id, "tags": ["a"] * 100}
+
+        app = FastAPI()
+        app.include_router(router, prefix="/shop")
+        self.app = PerfMiddleware(app)
+
+    async def test_server_timing_header_and_route_template_log(self):
+        with self.assertLogs("src.middleware.perf", level="INFO") as logs:
+            start, body = await call(self.app, "/shop/items/7")
+
+        self.assertEqual(start["status"], 200)
+        self.assertIn(b'"item_id":7', body)
+        headers = dict(start["headers"])
+        timing = headers[b"server-timing"].decode()
+        self.assertRegex(
+            timing,
+            r'^total;dur=[\d.]+, db;dur=0\.0;desc="0 statements, 0 rows", serialize;dur=[\d.]+$',
+        )
+
+        record = logs.records[0]
+        self.assertEqual(record.route, "/shop/items/{item_id}")
+        self.assertEqual((record.method, record.status, record.statements), ("GET", 200, 0))
+        self.assertEqual(
+            sample_value(
+                "http_request_duration_seconds_count",
+                {"method": "GET", "route": "/shop/items/{item_id}", "status": "200"},
+            ),
+            1,
+        )
+
+    async def test_unmatched_path_is_logged_as_the_raw_path(self):
+        with self.assertLogs("src.middleware.perf", level="INFO") as logs:
+            start, _ = await call(self.app, "/missing")
+
+        self.assertEqual(start["status"], 404)
+        self.assertEqual(logs.records[0].route, "/missing")
+        self.assertEqual(
+            sample_value(
+                "http_request_duration_seconds_count",
+                {"method": "GET", "route": "unmatched", "status": "404"},
+            ),
+            1,
+        )
+
+
+class QueryAccountingTests(TestCase):
+    def test_statements_are_counted_only_inside_a_request(self):
+        engine = create_engine("sqlite://")
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            metrics = RequestMetrics()
+            token = current_metrics.set(metrics)
+            try:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+            finally:
+                current_metrics.reset(token)
+
+        self.assertEqual(metrics.statements, 2)
+        self.assertGreater(metrics.db_seconds, 0)
@@ -0,0 +1,99 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import create_engine, text
+
+from src.middleware.perf import PerfMiddleware, TimedRoute, statement_shape
+from src.middleware.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    assert_max_queries,
+    collect_violations,
+    query_budget,
+    repeated_shapes,
+)
+from tests.test_perf_middleware import call
+
+
+class StatementShapeTests(TestCase):
+    def test_parameters_and_parameter_lists_collapse(self):
+        self.assertEqual(
+            statement_shape("SELECT a FROM t WHERE id IN ($1::UUID, $2::UUID) AND b = $3"),
+            "SELECT a FROM t WHERE id IN (?) AND b = ?",
+        )
+        self.assertEqual(
+            statement_shape("SELECT a FROM t WHERE id IN (?, ?, ?)"),
+            statement_shape("SELECT a FROM t WHERE id IN (?)"),
+        )
+
+
+class AssertMaxQueriesTests(TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+
+    def test_within_budget(self):
+        with self.engine.connect() as connection:
+            with assert_max_queries(2) as metrics:
+                connection.execute(text("SELECT 1"))
+                connection.execute(text("SELECT 2"))
+        self.assertEqual(metrics.statements, 2)
+
+    def test_over_budget_names_the_repeated_statement(self):
+        with self.engine.connect() as connection:
+            with self.assertRaises(QueryBudgetExceeded) as raised:
+                with assert_max_queries(3):
+                    for value in range(5):
+                        connection.execute(text("SELECT :value"), {"value": value})
+        self.assertIn("ran 5 SQL statements, budget 3", str(raised.exception))
+        self.assertIn("5x SELECT ?", str(raised.exception))
+
+    def test_nested_blocks_count_towards_the_outer_budget(self):
+        with self.engine.connect() as connection:
+            with assert_max_queries(10) as outer:
+                connection.execute(text("SELECT 1"))
+                with assert_max_queries(1) as inner:
+                    connection.execute(text("SELECT 2"))
+        self.assertEqual((outer.statements, inner.statements), (2, 1))
+
+    def test_repeated_shapes(self):
+        with self.engine.connect() as connection:
+            with assert_max_queries(10) as metrics:
+                for value in range(3):
+                    connection.execute(text("SELECT :value"), {"value": value})
+                connection.execute(text("SELECT 1"))
+        self.assertEqual(repeated_shapes(metrics, threshold=3), [("SELECT ?", 3)])
+        self.assertEqual(repeated_shapes(metrics, threshold=0), [])
+
+
+class QueryBudgetMiddlewareTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        router = APIRouter(route_class=TimedRoute)
+
+        @router.get("/lookups/{count}")
+        @query_budget(2)
+        async def lookups(count: int):
+            with engine.connect() as connection:
+                for value in range(count):
+                    connection.execute(text("SELECT :value"), {"value": value})
+            return {"count": count}
+
+        app = FastAPI()
+        app.include_router(router)
+        self.app = PerfMiddleware(QueryBudgetMiddleware(app))
+
+    async def test_within_budget_records_nothing(self):
+        with collect_violations() as violations:
+            start, _ = await call(self.app, "/lookups/2")
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(violations, [])
+
+    async def test_over_budget_is_logged_and_collected(self):
+        with collect_violations() as violations:
+            with self.assertLogs("src.middleware.query_budget", level="WARNING") as logs:
+                start, _ = await call(self.app, "/lookups/5")
+
+        self.assertEqual(start["status"], 200)
+        self.assertEqual(len(violations), 1)
+        self.assertIn("GET /lookups/{count} ran 5 SQL statements, budget 2", violations[0])
+        self.assertIn("ran the same statement 5 times (N+1?): SELECT ?", logs.output[-1])
@@ -0,0 +1,47 @@
+from unittest import IsolatedAsyncioTestCase
+
+from src.database.config import ReplicaSettings
+from src.database.connect import DatabaseSessionManager
+
+
+class ReadReplicaRoutingTests(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.manager = DatabaseSessionManager(
+            "postgresql+asyncpg://u:p@primary/db",
+            replica_settings=ReplicaSettings(
+                urls=(
+                    "postgresql+asyncpg://u:p@replica-a/db",
+                    "postgres://u:p@replica-b/db",
+                ),
+                read_your_writes_seconds=60,
+            ),
+        )
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+
+    async def read_host(self, client_key=None):
+        async with self.manager.read_session(client_key) as session:
+            return session.bind.url.host
+
+    async def test_reads_rotate_over_replicas(self):
+        hosts = [await self.read_host() for _ in range(3)]
+
+        self.assertEqual(hosts, ["replica-a", "replica-b", "replica-a"])
+
+    async def test_client_reads_primary_after_a_write(self):
+        self.manager.mark_write("user-1")
+
+        self.assertEqual(await self.read_host("user-1"), "primary")
+        self.assertEqual(await self.read_host("user-2"), "replica-a")
+
+    async def test_unavailable_replicas_are_skipped(self):
+        self.manager.mark_replica_down(0)
+        self.assertEqual(await self.read_host(), "replica-b")
+
+        self.manager.mark_replica_down(1)
+        self.assertEqual(await self.read_host(), "primary")
+
+    async def test_writes_always_use_the_primary(self):
+        async with self.manager.session() as session:
+            self.assertEqual(session.bind.url.host, "primary")
@@ -0,0 +1,66 @@
+import random
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from uuid import uuid4
+
+from src.services.recurrence_engine import analyze_recurrence, day_numbers
+from src.services.subscription_candidate_service import (
+    CandidateTxn,
+    group_looks_recurring,
+    infer_frequency,
+)
+
+START = datetime(2025, 1, 1, 8, 30, tzinfo=timezone.utc)
+
+
+def random_history(rng: random.Random, groups: int):
+    rows = []
+    for index in range(groups):
+        key = f"merchant {index}"
+        step = rng.choice([7, 14, 30, 31, 90, 365, rng.randint(1, 60)])
+        base = rng.choice([999, 1549, 5000, rng.randint(1, 20000)])
+        for occurrence in range(rng.randint(1, 8)):
+            jitter = rng.randint(-3, 3)
+            amount = base if rng.random() < 0.8 else rng.randint(1, 30000)
+            rows.append(
+                (
+                    key,
+                    START + timedelta(days=step * occurrence + jitter, hours=rng.randint(0, 15)),
+                    -amount if rng.random() < 0.9 else amount,
+                )
+            )
+    rng.shuffle(rows)
+    return rows
+
+
+class AnalyzeRecurrenceTests(TestCase):
+    def test_matches_group_functions(self):
+        rows = random_history(random.Random(7), groups=300)
+        keys, dates, amounts = zip(*rows)
+
+        results = analyze_recurrence(keys, day_numbers(dates), amounts).as_dict()
+
+        for key in set(keys):
+            group = [(date, amount) for k, date, amount in rows if k == key]
+            txns = [CandidateTxn(uuid=uuid4(), date=date, amount=amount) for date, amount in group]
+            self.assertEqual(
+                results[key],
+                (group_looks_recurring(txns), infer_frequency([date for date, _ in group])),
+                key,
+            )
+
+    def test_rows_map_back_to_their_group(self):
+        scan = analyze_recurrence(
+            ["gym", "gym", "gym", "cafe"],
+            [0, 30, 61, 3],
+            [-4000, -4000, -4000, -350],
+        )
+
+        self.assertEqual(scan.recurring_rows().tolist(), [True, True, True, False])
+        self.assertEqual(scan.keys.tolist(), ["gym", "cafe"])
+        self.assertEqual(scan.counts.tolist(), [3, 1])
+
+    def test_empty_input(self):
+        scan = analyze_recurrence([], [], [])
+
+        self.assertEqual(scan.recurring_rows().tolist(), [])
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+from statistics import variance
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from src.model.models import Transaction
+from src.services.recurring_series import (
+    add_occurrence,
+    new_series,
+    replay_series,
+    update_recurring_series,
+)
+from src.services.subscription_candidate_service import (
+    CandidateTxn,
+    group_looks_recurring,
+    infer_frequency,
+)
+
+START = datetime(2025, 11, 3, tzinfo=timezone.utc)
+ORG_ID = uuid4()
+
+
+def occurrences(days: list[int], amounts: list[int]):
+    return [(START + timedelta(days=day), amount) for day, amount in zip(days, amounts)]
+
+
+class RecurringSeriesTests(TestCase):
+    def assert_matches_history(self, history):
+        series = new_series(ORG_ID, "netflix", history[0][0])
+        for date, amount in history:
+            add_occurrence(series, date, amount)
+
+        txns = [CandidateTxn(uuid=uuid4(), date=date, amount=amount) for date, amount in history]
+        self.assertEqual(series.is_recurring, group_looks_recurring(txns))
+        self.assertEqual(series.frequency, infer_frequency([date for date, _ in history]))
+        self.assertEqual(series.occurrence_count, len(history))
+        self.assertAlmostEqual(
+            series.amount_variance, variance([abs(amount) for _, amount in history])
+        )
+        return series
+
+    def test_monthly_charge_matches_history_scan(self):
+        series = self.assert_matches_history(
+            occurrences([0, 31, 61, 92], [-1549, -1549, -1599, -1549])
+        )
+
+        self.assertTrue(series.is_recurring)
+        self.assertEqual(series.frequency, "monthly")
+        self.assertEqual(series.last_date, START + timedelta(days=92))
+
+    def test_irregular_amounts_are_not_recurring(self):
+        series = self.assert_matches_history(
+            occurrences([0, 30, 60, 90], [-500, -4000, -1200, -9000])
+        )
+
+        self.assertFalse(series.is_recurring)
+
+    def test_replay_sorts_out_of_order_rows(self):
+        history = occurrences([0, 31, 61, 92], [-999] * 4)
+        in_order = replay_series(new_series(ORG_ID, "gym", START), history)
+        shuffled = replay_series(new_series(ORG_ID, "gym", START), history[::-1])
+
+        self.assertEqual(shuffled.recent_intervals, in_order.recent_intervals)
+        self.assertEqual(shuffled.first_date, START)
+        self.assertTrue(shuffled.is_recurring)
+
+
+class UpdateRecurringSeriesTests(IsolatedAsyncioTestCase):
+    async def test_missing_rows_are_inserted_on_conflict_then_locked(self):
+        placeholder = new_series(ORG_ID, "netflix", START)
+        locked = SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: [placeholder]))
+        db = AsyncMock()
+        db.execute.side_effect = [None, locked]
+        transaction = Transaction(merchant_key="netflix", date=START, amount=-1549, type="expense")
+
+        series_by_key = await update_recurring_series(db, ORG_ID, [transaction])
+
+        insert, select = (
+            str(call.args[0].compile(dialect=postgresql.dialect())).upper()
+            for call in db.execute.await_args_list
+        )
+        self.assertIn("ON CONFLICT (ORGANIZATION_ID, MERCHANT_KEY) DO NOTHING", insert)
+        self.assertIn("FOR UPDATE", select)
+        self.assertIs(series_by_key["netflix"], placeholder)
+        self.assertEqual(placeholder.occurrence_count, 1)
+        db.add.assert_not_called()
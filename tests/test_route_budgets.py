@@ -0,0 +1,213 @@
+"""The ``@query_budget`` of every budgeted route, checked against a real database.
+
+The routes run behind ``PerfMiddleware`` and ``QueryBudgetMiddleware`` as in
+main.py, on an organization filled by ``seed_demo_data``. The tests need an
+empty PostgreSQL database in ``TEST_DB_URL`` (e.g. the docker-compose postgres
+service) and are skipped without one; the schema is created and dropped
+around every test.
+"""
+
+import io
+import json
+import os
+from unittest import IsolatedAsyncioTestCase, skipUnless
+from unittest.mock import patch
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from fastapi import FastAPI
+
+from src.database.connect import Base, DatabaseSessionManager, get_db, get_read_db
+from src.middleware.perf import PerfMiddleware
+from src.middleware.query_budget import QueryBudgetMiddleware, collect_violations
+from src.model.models import ImportJob, ImportJobStatus, Organization, User, UserRole
+from src.routers.account import account_router
+from src.routers.import_file import import_router
+from src.routers.transaction import transaction_router
+from src.services.analytics_cache import analytics_cache, version_keys
+from src.services.seed_data import seed_demo_data
+from src.util.s3 import get_s3_client
+from src.util.types import UserPool
+from src.util.user import get_current_user
+
+TEST_DB_URL = os.getenv("TEST_DB_URL")
+
+CHASE_DEBIT_CSV = (
+    "Details,Posting Date,Description,Amount,Type,Balance,Check or Slip #\n"
+    + "".join(
+        f"DEBIT,03/{day:02d}/2026,MERCHANT {day % 7},-{day}.25,DEBIT_CARD,1000.00,\n"
+        for day in range(1, 29)
+    )
+)
+
+
+async def request(app, method, path, query=None, body=None):
+    """Run one request through ``app``; returns the status and the decoded JSON body."""
+    messages = []
+    payload = json.dumps(body).encode() if body is not None else b""
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(query or {}, doseq=True).encode(),
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    content = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return start["status"], json.loads(content)
+
+
+class FileStorage:
+    """Serves one uploaded file in place of S3."""
+
+    def __init__(self, content: str):
+        self.content = content.encode()
+
+    def get_s3_stream(self, key):
+        return io.BytesIO(self.content)
+
+
+@skipUnless(TEST_DB_URL, "TEST_DB_URL is not set")
+class RouteBudgetTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = DatabaseSessionManager(TEST_DB_URL)
+        async with self.manager._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+
+        organization_id, user_id = uuid4(), uuid4()
+        async with self.manager.session() as db:
+            db.add(Organization(uuid=organization_id, name="Budget Household"))
+            db.add(
+                User(
+                    uuid=user_id,
+                    organization_id=organization_id,
+                    email="budget@example.com",
+                    role=UserRole.Admin,
+                )
+            )
+            await db.commit()
+            self.seed = await seed_demo_data(db, organization_id, user_id, months=3)
+
+        self.current_user = UserPool(
+            sub=user_id,
+            email="budget@example.com",
+            organization_id=organization_id,
+            role=UserRole.Admin.name,
+        )
+        self.app = self.build_app()
+        analytics_cache.clear()
+        version_keys.clear()
+        # the import's background refresh opens its own session
+        patcher = patch("src.services.recurring_series.sessionmanager", self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        async with self.manager._engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await self.manager.close()
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI()
+        app.include_router(transaction_router, prefix="/transaction")
+        app.include_router(account_router, prefix="/account")
+        app.include_router(import_router, prefix="/import")
+        app.add_middleware(QueryBudgetMiddleware)
+        app.add_middleware(PerfMiddleware)
+
+        async def session():
+            async with self.manager.session() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = session
+        app.dependency_overrides[get_read_db] = session
+        app.dependency_overrides[get_current_user] = lambda: self.current_user
+        app.dependency_overrides[get_s3_client] = lambda: FileStorage(CHASE_DEBIT_CSV)
+        return app
+
+    async def assert_within_budget(self, method, path, query=None, body=None):
+        with collect_violations() as violations:
+            status, content = await request(self.app, method, path, query, body)
+        self.assertEqual(status, 200, content)
+        self.assertEqual(violations, [])
+        return content
+
+    async def test_transaction_list(self):
+        content = await self.assert_within_budget(
+            "GET", "/transaction/all", {"page": 1, "page_size": 50}
+        )
+        self.assertEqual(len(content["transactions"]), 50)
+
+    async def test_transaction_summary(self):
+        await self.assert_within_budget(
+            "GET", "/transaction/summary", {"from_date": "2020-01-01", "to_date": "2030-12-31"}
+        )
+
+    async def test_cash_flow_history(self):
+        content = await self.assert_within_budget(
+            "GET",
+            "/transaction/cash-flow-history",
+            {
+                "from_date": "2020-01-01",
+                "to_date": "2030-12-31",
+                "granularities": ["day", "week", "month"],
+            },
+        )
+        self.assertTrue(content["periods"])
+
+    async def test_transaction_create(self):
+        status, listing = await request(self.app, "GET", "/transaction/all", {"page_size": 1})
+        category_id = listing["transactions"][0]["category_id"]
+        await self.assert_within_budget(
+            "POST",
+            "/transaction/create",
+            body={
+                "category_id": category_id,
+                "account_id": str(self.seed.checking_account_id),
+                "title": "Coffee Shop",
+                "amount": -450,
+                "date": "2026-03-02T09:00:00+00:00",
+            },
+        )
+
+    async def test_account_list(self):
+        content = await self.assert_within_budget("GET", "/account/all")
+        self.assertEqual(len(content), 2)
+
+    async def test_import_complete(self):
+        job_id = uuid4()
+        async with self.manager.session() as db:
+            db.add(
+                ImportJob(
+                    uuid=job_id,
+                    user_id=self.current_user.sub,
+                    account_id=self.seed.checking_account_id,
+                    file_name="activity.csv",
+                    file_key="uploads/activity.csv",
+                    file_type="text/csv",
+                    file_size=len(CHASE_DEBIT_CSV),
+                    status=ImportJobStatus.PENDING,
+                )
+            )
+            await db.commit()
+
+        content = await self.assert_within_budget(
+            "POST", "/import/complete", body={"import_job_id": str(job_id)}
+        )
+        self.assertEqual(content["status"], ImportJobStatus.COMPLETED.value)
@@ -0,0 +1,90 @@
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.database import connect
+from src.middleware.perf import RequestMetrics, current_metrics
+from src.util import slow_queries
+from src.util.slow_queries import PlanCapture, log_slow_query, parameter_shape
+
+
+class ParameterShapeTests(TestCase):
+    def test_types_not_values(self):
+        self.assertEqual(
+            parameter_shape(("secret", 3, None, [1, 2])), "(str, int, NoneType, list[2])"
+        )
+        self.assertEqual(parameter_shape({"name": "secret"}), "{name: str}")
+
+    def test_log_is_fed_by_the_perf_timings(self):
+        self.assertEqual(connect.statement_observers.count(log_slow_query), 1)
+
+
+class SlowQueryLogTests(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.plan_file = os.path.join(tempfile.mkdtemp(), "plans.log")
+        self.capture = PlanCapture(path=self.plan_file, interval_seconds=3600)
+        self.addCleanup(self.capture.close)
+        patches = [
+            mock.patch.object(slow_queries, "SLOW_QUERY_MS", 0.000001),
+            mock.patch.object(slow_queries, "plan_capture", self.capture),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    async def test_slow_select_is_logged_with_route_and_plan(self):
+        token = current_metrics.set(RequestMetrics(route="/transaction/all"))
+        try:
+            with self.assertLogs("src.util.slow_queries", level="WARNING") as logs:
+                async with self.engine.connect() as connection:
+                    await connection.execute(text("SELECT :name AS name"), {"name": "secret"})
+        finally:
+            current_metrics.reset(token)
+        await self.capture.wait()
+
+        record = logs.records[0]
+        self.assertEqual(record.route, "/transaction/all")
+        self.assertEqual(record.parameters, "(str)")
+        self.assertNotIn("secret", logs.output[0])
+        with open(self.plan_file) as plans:
+            written = plans.read()
+        self.assertIn("route=/transaction/all", written)
+        self.assertIn("EXPLAIN QUERY PLAN SELECT ? AS name", written)
+
+    async def test_each_shape_is_explained_once_per_interval(self):
+        with self.assertLogs("src.util.slow_queries", level="WARNING"):
+            async with self.engine.connect() as connection:
+                await connection.execute(text("SELECT :value"), {"value": 1})
+                await self.capture.wait()
+                await connection.execute(text("SELECT :value"), {"value": 2})
+                await self.capture.wait()
+                await connection.execute(text("CREATE TABLE t (a INTEGER)"))
+                await self.capture.wait()
+
+        with open(self.plan_file) as plans:
+            self.assertEqual(plans.read().count("EXPLAIN QUERY PLAN"), 1)
+
+    async def test_locking_reads_are_not_explained(self):
+        with self.assertLogs("src.util.slow_queries", level="WARNING") as logs:
+            async with self.engine.connect() as connection:
+                self.capture.schedule(
+                    connection.sync_engine,
+                    "SELECT a FROM t WHERE id = ? FOR NO KEY UPDATE",
+                    (1,),
+                    "route=-",
+                )
+                await connection.execute(text("SELECT 1"))
+                await self.capture.wait()
+
+        self.assertEqual(len(logs.records), 1)
+        with open(self.plan_file) as plans:
+            written = plans.read()
+        self.assertNotIn("FOR NO KEY UPDATE", written)
+        self.assertIn("EXPLAIN QUERY PLAN SELECT 1", written)
@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+from unittest import TestCase
+
+from scripts.import_time_audit import DEFERRED_MODULES, audit, parse_importtime
+
+# Cold import budget for main; override on slower CI runners.
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+
+
+class ParseImportTimeTests(TestCase):
+    def test_rows_keep_names_and_timings(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      3000 |      45000 | main\n"
+        )
+        self.assertEqual(parse_importtime(stderr), [("_io", 120, 120), ("main", 3000, 45000)])
+
+
+class StartupTimeTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.report = audit(runs=3)
+        # IMPORTTIME_REPORT=path keeps the audit as a CI artifact
+        if output := os.getenv("IMPORTTIME_REPORT"):
+            Path(output).write_text(cls.report.format() + "\n")
+
+    def test_rare_path_modules_are_deferred(self):
+        self.assertEqual(
+            [name for name in DEFERRED_MODULES if name in self.report.loaded], []
+        )
+
+    def test_cold_import_stays_within_budget(self):
+        self.assertLessEqual(
+            self.report.total_us / 1e6, STARTUP_BUDGET_SECONDS, self.report.format(15)
+        )
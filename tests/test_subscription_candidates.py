@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from src.routers.transaction import get_subscription_candidates
+from src.services.query_service import QueryService
+from src.services.recurring_series import (
+    CandidateFlagRow,
+    changed_candidate_flags,
+    refresh_subscription_candidates,
+)
+from src.util.types import UserPool
+
+START = datetime(2026, 1, 3, tzinfo=timezone.utc)
+
+
+def monthly_rows(
+    key: str,
+    count: int = 4,
+    type_: str = "expense",
+    flagged: bool = False,
+    subscription_id=None,
+):
+    return [
+        CandidateFlagRow(
+            uuid=uuid4(),
+            merchant_key=key,
+            date=START + timedelta(days=30 * i),
+            type=type_,
+            subscription_id=subscription_id,
+            subscription_candidate=flagged,
+        )
+        for i in range(count)
+    ]
+
+
+class ChangedCandidateFlagsTests(TestCase):
+    def test_rows_of_recurring_series_are_set_and_others_cleared(self):
+        netflix = monthly_rows("netflix")
+        coffee = monthly_rows("coffee", count=2, flagged=True)
+
+        to_set, to_clear = changed_candidate_flags(netflix + coffee, recurring_keys={"netflix"})
+
+        self.assertEqual(set(to_set), {row.uuid for row in netflix})
+        self.assertEqual(set(to_clear), {row.uuid for row in coffee})
+
+    def test_linked_and_excluded_types_are_not_candidates(self):
+        linked = monthly_rows("netflix", subscription_id=uuid4(), flagged=True)
+        payroll = monthly_rows("acme payroll", type_="Income")
+
+        to_set, to_clear = changed_candidate_flags(
+            linked + payroll, recurring_keys={"netflix", "acme payroll"}
+        )
+
+        self.assertEqual(to_set, [])
+        self.assertEqual(set(to_clear), {row.uuid for row in linked})
+
+    def test_rows_already_in_line_are_left_alone(self):
+        netflix = monthly_rows("netflix", flagged=True)
+
+        self.assertEqual(changed_candidate_flags(netflix, {"netflix"}), ([], []))
+
+    def test_merchants_tracked_as_subscriptions_are_not_candidates(self):
+        netflix = monthly_rows("netflix", flagged=True)
+        spotify = monthly_rows("spotify")
+
+        to_set, to_clear = changed_candidate_flags(
+            netflix + spotify, {"netflix", "spotify"}, excluded_keys={"netflix"}
+        )
+
+        self.assertEqual(set(to_set), {row.uuid for row in spotify})
+        self.assertEqual(set(to_clear), {row.uuid for row in netflix})
+
+
+class RefreshSubscriptionCandidatesTests(IsolatedAsyncioTestCase):
+    async def test_subscription_named_like_the_merchant_is_excluded(self):
+        rows = monthly_rows("netflix")
+        db = AsyncMock()
+        db.execute.side_effect = [
+            SimpleNamespace(scalars=lambda: ["netflix"]),
+            SimpleNamespace(all=lambda: [
+                (r.uuid, r.merchant_key, r.date, r.type, r.subscription_id, r.subscription_candidate)
+                for r in rows
+            ]),
+            SimpleNamespace(all=lambda: [("NETFLIX.COM",)]),
+        ]
+
+        updated = await refresh_subscription_candidates(
+            db=db, organization_id=uuid4(), user_id=uuid4(), merchant_keys={"netflix"}
+        )
+
+        self.assertEqual(updated, 0)
+        self.assertEqual(db.execute.await_count, 3)
+
+class SubscriptionCandidatesQueryTests(IsolatedAsyncioTestCase):
+    async def compiled_sql(self, **params) -> str:
+        db = AsyncMock()
+        db.execute.return_value = SimpleNamespace(all=lambda: [])
+        current_user = UserPool(
+            sub=uuid4(), email="candidates@example.com", organization_id=uuid4()
+        )
+
+        response = await get_subscription_candidates(
+            db=db, current_user=current_user, query_service=QueryService(), **params
+        )
+
+        self.assertEqual(response, [])
+        statement = db.execute.await_args.args[0]
+        return str(
+            statement.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        ).upper()
+
+    async def test_one_row_per_title_and_limit_after_deduplication(self):
+        sql = await self.compiled_sql(account_type=None, limit=25)
+
+        inner_start = sql.index("DISTINCT ON (TRANSACTIONS.TITLE)")
+        inner_end = sql.index(") AS ANON_1")
+        inner = sql[inner_start:inner_end]
+        self.assertIn("TRANSACTIONS.SUBSCRIPTION_CANDIDATE IS TRUE", inner)
+        self.assertIn("ORDER BY TRANSACTIONS.TITLE, TRANSACTIONS.DATE DESC", inner)
+        self.assertNotIn("LIMIT", inner)
+        self.assertTrue(sql[inner_end:].rstrip().endswith("LIMIT 25"))
+        self.assertEqual(sql.count("LIMIT"), 1)
+
+    async def test_frequency_comes_from_the_organization_series(self):
+        sql = await self.compiled_sql(account_type=None, limit=5000)
+
+        self.assertIn("LEFT OUTER JOIN RECURRING_SERIES ON", sql)
+        self.assertIn("RECURRING_SERIES.MERCHANT_KEY = TRANSACTIONS.MERCHANT_KEY", sql)
+        self.assertTrue(sql.rstrip().endswith("LIMIT 500"))
@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from src.services.subscription_summary import summarize_subscription_groups
+
+
+class SummarizeSubscriptionGroupsTests(TestCase):
+    def test_normalizes_amounts_to_monthly_and_counts_statuses(self):
+        summary = summarize_subscription_groups(
+            [
+                ("monthly", "active", 1500, 2),
+                ("monthly", "paused", 500, 1),
+                ("yearly", "active", 12000, 1),
+                ("weekly", "inactive", 1000, 1),
+                ("quarterly", "active", 3000, 1),
+                (None, None, 999, 1),
+            ]
+        )
+
+        self.assertEqual(summary.total_monthly_cost_cents, round(2000 + 1000 + 4330 + 1000))
+        self.assertEqual(summary.total_subscriptions_count, 7)
+        self.assertEqual(summary.total_active_subscriptions_count, 4)
+        self.assertEqual(summary.total_inactive_subscriptions_count, 1)
+        self.assertEqual(summary.total_paused_subscriptions_count, 1)
+
+    def test_empty_organization(self):
+        summary = summarize_subscription_groups([])
+
+        self.assertEqual(summary.total_monthly_cost_cents, 0)
+        self.assertEqual(summary.total_subscriptions_count, 0)
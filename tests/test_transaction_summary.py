@@ -71,9 +71,10 @@ class BuildTransactionSummaryTests(IsolatedAsyncioTestCase):
             to_date=date(2026, 6, 30),
         )
 
+        # user timezone differs from the rollup's, so transactions are scanned
         with patch(
-            "src.services.transaction_summary.get_effective_timezone",
-            new=AsyncMock(return_value=(ZoneInfo("UTC"), "UTC")),
+            "src.services.transaction_summary.get_timezones",
+            new=AsyncMock(return_value=(ZoneInfo("UTC"), "UTC", "America/New_York")),
         ):
             response = await build_transaction_summary(
                 db=db,
@@ -117,6 +118,53 @@ class BuildTransactionSummaryTests(IsolatedAsyncioTestCase):
         self.assertNotIn(" LIMIT ", sql)
         self.assertNotIn(" OFFSET ", sql)
 
+    async def test_reads_daily_rollup_when_timezones_match(self):
+        result = SimpleNamespace(
+            one=lambda: SimpleNamespace(
+                gross_expense=1000,
+                refunds=0,
+                income=0,
+                expense_transaction_count=4,
+                refund_transaction_count=0,
+                income_transaction_count=0,
+            )
+        )
+        db = AsyncMock()
+        db.execute.return_value = result
+        current_user = UserPool(
+            sub=uuid4(),
+            email="summary@example.com",
+            organization_id=uuid4(),
+        )
+        request = TransactionSummaryRequest(
+            from_date=date(2026, 6, 1),
+            to_date=date(2026, 6, 30),
+        )
+
+        with patch(
+            "src.services.transaction_summary.get_timezones",
+            new=AsyncMock(return_value=(ZoneInfo("UTC"), "UTC", "UTC")),
+        ):
+            response = await build_transaction_summary(
+                db=db,
+                current_user=current_user,
+                query_service=QueryService(),
+                request=request,
+            )
+
+        self.assertEqual(response.average_expense, 250.0)
+        statement = db.execute.await_args.args[0]
+        sql = str(
+            statement.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        ).upper()
+        self.assertIn("DAILY_ROLLUP.ABS_AMOUNT_SUM", sql)
+        self.assertIn("DAILY_ROLLUP.LOCAL_DATE BETWEEN '2026-06-01' AND '2026-06-30'", sql)
+        self.assertIn("DAILY_ROLLUP.TRANSACTION_COUNT", sql)
+        self.assertNotIn("TRANSACTIONS", sql)
+
     async def test_rejects_user_without_an_organization(self):
         current_user = UserPool(
             sub=uuid4(),